@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+WSM BENCHMARK - Catálogos y flotas sintéticos para medir workspace-manager.py
+===============================================================================
+
+Genera un catálogo de N skills (publicado en un repo git bare local, para que
+`wsm sync` no necesite red) y una flota de W workspaces con `enabled_skills`
+realistas (popularidad tipo Zipf, algunas referencias rotas y ficheros de
+proyecto para `reco-skills`). Después cronometra cada comando como lo ejecuta
+un usuario: un proceso nuevo por repetición.
+
+Uso:
+  python benchmark.py                               # matriz pequeña (100/1000 × 10/200)
+  python benchmark.py --skills 10000 --workspaces 2000 -r 3
+  python benchmark.py -o antes.json ; ...cambios... ; python benchmark.py -o despues.json
+  python benchmark.py --compare antes.json despues.json
+
+Los resultados (JSON) incluyen el commit, así que se pueden comparar entre commits.
+===============================================================================
+"""
+
+import os
+import sys
+import json
+import random
+import shutil
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Dict, Optional
+import argparse
+
+HERE = Path(__file__).resolve().parent
+WSM = HERE / "workspace-manager.py"
+
+PREFIXES = ['python', 'react', 'typescript', 'go', 'rust', 'docker', 'kubernetes', 'api',
+            'testing', 'security', 'database', 'flutter', 'aws', 'nextjs', 'django',
+            'fastapi', 'postgres', 'redis', 'graphql', 'terraform', 'frontend', 'backend',
+            'mobile', 'data', 'ml', 'devops', 'architecture', 'clean', 'git', 'node']
+SUFFIXES = ['patterns', 'expert', 'pro', 'best-practices', 'architect', 'testing',
+            'performance', 'security', 'migration', 'debugging', 'design', 'review']
+
+# (extensión, manifiesto, contenido del manifiesto) por tipo de proyecto
+PROJECT_KINDS = [
+    ('.py', 'requirements.txt', "fastapi\nsqlalchemy\npsycopg2\npytest\n"),
+    ('.ts', 'package.json', json.dumps({'dependencies': {'react': '^18', 'next': '^14', 'prisma': '^5'}})),
+    ('.go', 'go.mod', "module example.com/svc\n\nrequire github.com/go-redis/redis/v9 v9.0.0\n"),
+    ('.dart', 'pubspec.yaml', "dependencies:\n  flutter:\n    sdk: flutter\n  supabase_flutter: ^2.0.0\n"),
+    ('.rs', 'Cargo.toml', "[dependencies]\ntokio = \"1\"\naxum = \"0.7\"\n"),
+]
+
+LOREM = ("Use this skill when designing, reviewing or refactoring code in this area. "
+         "It covers conventions, trade-offs, common pitfalls and checklists. ")
+
+FIX_BROKEN_SNIPPET = """
+import contextlib, io, sys, time
+sys.path.insert(0, sys.argv[1])
+from wsm.core import WorkspaceManager
+m = WorkspaceManager()
+with contextlib.redirect_stdout(io.StringIO()):
+    start = time.perf_counter()
+    m._fix_broken()
+    elapsed = time.perf_counter() - start
+print(elapsed)
+"""
+
+def git(*args, cwd=None):
+    subprocess.run(["git", "-c", "user.name=bench", "-c", "user.email=bench@localhost", *args],
+                   cwd=cwd, check=True, capture_output=True)
+
+def skill_names(n: int) -> List[str]:
+    base = [f"{p}-{s}" for p in PREFIXES for s in SUFFIXES]
+    return [base[i] if i < len(base) else f"{base[i % len(base)]}-{i // len(base)}" for i in range(n)]
+
+def write_skill(path: Path, name: str, rng: random.Random):
+    path.mkdir(parents=True, exist_ok=True)
+    # Tamaños log-normales: la mayoría de skills son pequeños, unos pocos muy grandes
+    size = int(min(rng.lognormvariate(8.2, 0.8), 200_000))
+    body = (LOREM * (size // len(LOREM) + 1))[:size]
+    with open(path / "SKILL.md", 'w') as f:
+        f.write(f"---\nname: {name}\ndescription: Synthetic skill {name} for benchmarks\n"
+                f"risk: low\nsource: bench\n---\n\n# {name}\n\n## Use this skill when\n\n{body}\n")
+    if rng.random() < 0.2:
+        (path / "references").mkdir(exist_ok=True)
+        for i in range(rng.randint(1, 4)):
+            with open(path / "references" / f"ref-{i}.md", 'w') as f:
+                f.write(LOREM * rng.randint(5, 60))
+
+class Fixture:
+    """Raíz wsm sintética: upstream git bare + flota de workspaces"""
+    
+    def __init__(self, base: Path, skills: int, workspaces: int, seed: int = 42):
+        self.base = base
+        self.n_skills = skills
+        self.n_workspaces = workspaces
+        self.rng = random.Random(seed)
+        self.root = base / "root"
+        self.work = base / "upstream-work"
+        self.bare = base / "upstream.git"
+        self.names = skill_names(skills)
+        self.pristine = {}
+    
+    @property
+    def env(self) -> Dict[str, str]:
+        return {**os.environ, 'WSM_SKILLS_REPO': str(self.bare), 'TERM': 'dumb'}
+    
+    def build(self):
+        for name in self.names:
+            write_skill(self.work / "skills" / name, name, self.rng)
+        git("init", "-q", str(self.work))
+        git("add", "-A", cwd=self.work)
+        git("commit", "-q", "-m", "catalog", cwd=self.work)
+        git("clone", "-q", "--bare", str(self.work), str(self.bare))
+        
+        for cat in ('public', 'private', 'user'):
+            (self.root / ".agent" / "skills" / cat).mkdir(parents=True)
+        self._build_fleet()
+        # Primera sincronización (no cronometrada): deja el catálogo publicado
+        self.wsm("sync")
+    
+    def _build_fleet(self):
+        weights = [1 / (rank + 1) ** 0.8 for rank in range(len(self.names))]
+        cum = []
+        total = 0.0
+        for w in weights:
+            total += w
+            cum.append(total)
+        
+        for i in range(self.n_workspaces):
+            name = f"ws-{i:05d}"
+            path = self.root / "workspaces" / name
+            (path / ".agents" / "skills").mkdir(parents=True)
+            enabled = list(dict.fromkeys(self.rng.choices(self.names, cum_weights=cum, k=self.rng.randint(3, 15))))
+            if self.rng.random() < 0.05:
+                enabled.append(f"removed-skill-{i}")
+            config = {
+                "name": name,
+                "description": f"Synthetic workspace {i}",
+                "enabled_skills": enabled,
+                "disabled_skills": [],
+                "skill_priority": {},
+                "max_context_tokens": None,
+            }
+            text = json.dumps(config, indent=2)
+            with open(path / "skill-config.json", 'w') as f:
+                f.write(text)
+            self.pristine[path / "skill-config.json"] = text
+            
+            ext, manifest, content = PROJECT_KINDS[i % len(PROJECT_KINDS)]
+            (path / "src").mkdir()
+            with open(path / manifest, 'w') as f:
+                f.write(content)
+            for j in range(self.rng.randint(3, 20)):
+                with open(path / "src" / f"module_{j}{ext}", 'w') as f:
+                    f.write("// synthetic\n" * self.rng.randint(10, 200))
+    
+    def restore_configs(self):
+        for path, text in self.pristine.items():
+            with open(path, 'w') as f:
+                f.write(text)
+    
+    def push_update(self, fraction: float = 0.01):
+        """Modifica un % de skills en el upstream (lo que vería un `wsm sync` diario)"""
+        for name in self.rng.sample(self.names, max(1, int(len(self.names) * fraction))):
+            with open(self.work / "skills" / name / "SKILL.md", 'a') as f:
+                f.write(f"\n<!-- update {time.time_ns()} -->\n")
+        git("commit", "-q", "-am", "update", cwd=self.work)
+        git("push", "-q", str(self.bare), "HEAD", cwd=self.work)
+    
+    def drop_mirror(self):
+        shutil.rmtree(self.root / ".agent" / "sources", ignore_errors=True)
+    
+    def wsm(self, *args, stdin: str = "") -> float:
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, str(WSM), *args], cwd=self.root, env=self.env,
+                              input=stdin, text=True, capture_output=True)
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            raise RuntimeError(f"wsm {' '.join(args)} falló ({proc.returncode}):\n{proc.stderr[-2000:]}")
+        return elapsed
+    
+    def fix_broken(self) -> float:
+        proc = subprocess.run([sys.executable, "-c", FIX_BROKEN_SNIPPET, str(HERE)], cwd=self.root,
+                              env=self.env, text=True, capture_output=True, check=True)
+        return float(proc.stdout.strip().splitlines()[-1])
+
+def cases(fx: Fixture) -> List[tuple]:
+    """(nombre, función cronometrada, preparación por repetición, warmup)"""
+    ws = "ws-00000"
+    skill = fx.names[0]
+    return [
+        ('list', lambda: fx.wsm("list"), None, True),
+        ('list-skills', lambda: fx.wsm("list-skills"), None, True),
+        ('list-skills-ws', lambda: fx.wsm("list-skills", ws), None, True),
+        ('show', lambda: fx.wsm("show", skill), None, True),
+        ('reco-skills', lambda: fx.wsm("reco-skills", ws, stdin="\n"), None, True),
+        ('sync-skills', lambda: fx.wsm("sync-skills"), None, True),
+        ('fix-broken', fx.fix_broken, fx.restore_configs, False),
+        ('sync', lambda: fx.wsm("sync"), None, True),
+        ('sync-update', lambda: fx.wsm("sync"), fx.push_update, False),
+        ('sync-cold', lambda: fx.wsm("sync"), fx.drop_mirror, False),
+    ]
+
+def run_matrix(skill_sizes: List[int], fleet_sizes: List[int], repeat: int,
+               only: Optional[List[str]], seed: int) -> List[dict]:
+    results = []
+    for n_skills in skill_sizes:
+        for n_ws in fleet_sizes:
+            with tempfile.TemporaryDirectory(prefix="wsm-bench-") as tmp:
+                fx = Fixture(Path(tmp), n_skills, n_ws, seed)
+                start = time.perf_counter()
+                fx.build()
+                print(f"\n📦 {n_skills} skills × {n_ws} workspaces "
+                      f"(fixture {time.perf_counter() - start:.1f}s)")
+                for name, fn, setup, warmup in cases(fx):
+                    if only and name not in only:
+                        continue
+                    if warmup:
+                        fn()
+                    runs = []
+                    for _ in range(repeat):
+                        if setup:
+                            setup()
+                        runs.append(fn())
+                    result = {
+                        'case': name, 'skills': n_skills, 'workspaces': n_ws,
+                        'runs': [round(r, 6) for r in runs],
+                        'min': round(min(runs), 6),
+                        'median': round(statistics.median(runs), 6),
+                        'mean': round(statistics.fmean(runs), 6),
+                        'stdev': round(statistics.stdev(runs), 6) if len(runs) > 1 else 0.0,
+                    }
+                    results.append(result)
+                    print(f"  {name:16} median {result['median'] * 1000:9.1f} ms   "
+                          f"min {result['min'] * 1000:9.1f} ms")
+    return results
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "-C", str(HERE), "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "-C", str(HERE), "status", "--porcelain", "--", WSM.name],
+                               capture_output=True, text=True).stdout.strip()
+        return out + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(old_path: str, new_path: str):
+    """Tabla de medianas de dos ficheros de resultados (ratio < 1 = más rápido)"""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    key = lambda r: (r['case'], r['skills'], r['workspaces'])
+    before = {key(r): r for r in old['results']}
+    print(f"\n{old['meta'].get('commit')} → {new['meta'].get('commit')}\n")
+    print(f"  {'caso':16} {'skills':>7} {'ws':>6} {'antes':>11} {'después':>11} {'ratio':>7}")
+    for r in new['results']:
+        prev = before.get(key(r))
+        if not prev:
+            continue
+        ratio = r['median'] / prev['median'] if prev['median'] else float('inf')
+        print(f"  {r['case']:16} {r['skills']:>7} {r['workspaces']:>6} "
+              f"{prev['median'] * 1000:>9.1f}ms {r['median'] * 1000:>9.1f}ms {ratio:>6.2f}x")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de workspace-manager.py")
+    parser.add_argument('--skills', default='100,1000', help='Tamaños de catálogo (coma), p. ej. 100,1000,10000')
+    parser.add_argument('--workspaces', default='10,200', help='Tamaños de flota (coma), p. ej. 10,200,2000')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('--only', help='Sólo estos casos (coma): list,sync-skills,...')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('-o', '--output', default='bench_output.json')
+    parser.add_argument('--compare', nargs=2, metavar=('ANTES', 'DESPUES'),
+                        help='Compara dos ficheros de resultados en vez de ejecutar')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = run_matrix([int(x) for x in args.skills.split(',')],
+                         [int(x) for x in args.workspaces.split(',')],
+                         args.repeat, args.only.split(',') if args.only else None, args.seed)
+    data = {
+        'meta': {
+            'commit': git_commit(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(data, f, indent=2)
+    print(f"\n✅ {args.output}")
+
+if __name__ == '__main__':
+    main()
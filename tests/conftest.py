@@ -0,0 +1,63 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from wsm.core import WorkspaceManager  # noqa: E402
+
+
+def write_skill(base: Path, name: str, body: str = "body\n", **frontmatter) -> Path:
+    """Crea base/name/SKILL.md con el frontmatter dado (listas como [a, b])"""
+    lines = [f"name: {name}", "description: test"]
+    for key, value in frontmatter.items():
+        lines.append(f"{key}: [{', '.join(value)}]" if isinstance(value, list) else f"{key}: {value}")
+    path = base / name
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "SKILL.md").write_text("---\n" + "\n".join(lines) + "\n---\n" + body, encoding='utf-8')
+    return path
+
+
+def public_skills(m: WorkspaceManager) -> list:
+    return sorted(p.name for p in (m.skills_dir / "public").iterdir() if p.is_dir())
+
+
+def write_config(m: WorkspaceManager, workspace: str, **fields) -> Path:
+    """Escribe a mano el skill-config.json de un workspace (como haría un usuario)"""
+    cfg = m.workspaces_dir / workspace / "skill-config.json"
+    cfg.parent.mkdir(parents=True, exist_ok=True)
+    config = {"name": workspace, "description": "", "enabled_skills": [], "disabled_skills": [],
+              "skill_priority": {}, "max_context_tokens": None, **fields}
+    cfg.write_text(json.dumps(config, indent=2), encoding='utf-8')
+    return cfg
+
+
+@pytest.fixture
+def project(tmp_path) -> Path:
+    """Proyecto vacío (.agent/skills y workspaces/), sin red ni fuentes"""
+    (tmp_path / ".agent" / "skills").mkdir(parents=True)
+    (tmp_path / "workspaces").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def manager(project) -> WorkspaceManager:
+    m = WorkspaceManager(project)
+    m.interactive = False
+    return m
+
+
+@pytest.fixture
+def catalog(project, manager):
+    """Publica un catálogo a partir de skills de prueba → función (nombre, **frontmatter)"""
+    src = project / "src"
+
+    def publish(skills: dict):
+        paths = {name: write_skill(src, name, **fm) for name, fm in skills.items()}
+        manager._publish_generation(paths)
+        manager._catalog_index = None
+        return paths
+
+    return publish
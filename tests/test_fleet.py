@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def fleet_catalog(manager, catalog):
+    catalog({'a': {}, 'b': {'requires': ['c']}, 'c': {}, 'x': {'conflicts': ['a']}})
+    templates = manager.templates_dir
+    templates.mkdir()
+    (templates / "base.json").write_text(json.dumps({'enabled_skills': ['a'], 'skill_priority': {'a': 5}}))
+    (templates / "extra.json").write_text(json.dumps({'extends': 'base', 'enabled_skills': ['b']}))
+    return manager
+
+
+def write_manifest(tmp_path, workspaces, name="fleet.json"):
+    path = tmp_path / name
+    path.write_text(json.dumps({'workspaces': workspaces}))
+    return path
+
+
+FLEET = {
+    'plain': {'skills': ['a']},
+    'deps': {'skills': ['b'], 'description': "con dependencias"},
+    'tpl': {'templates': ['extra'], 'max_context_tokens': 100000},
+}
+
+
+def test_apply_then_plan_is_a_noop(tmp_path, fleet_catalog):
+    m = fleet_catalog
+    manifest = write_manifest(tmp_path, FLEET)
+    result = m.apply_fleet(str(manifest))
+    assert result and result['counts']['create'] == 3
+
+    plan = m.plan_fleet(m._load_fleet_manifest(manifest))
+    assert [(op, name) for op, name, _, _ in plan] == [('noop', 'deps'), ('noop', 'plain'), ('noop', 'tpl')]
+    again = m.apply_fleet(str(manifest))
+    assert again and not again['applied']
+
+
+def test_requires_are_expanded_before_writing(tmp_path, fleet_catalog):
+    m = fleet_catalog
+    assert m.apply_fleet(str(write_manifest(tmp_path, FLEET)))
+    configs = m._workspace_configs()
+    assert configs['deps']['enabled_skills'] == ['c', 'b']
+    assert configs['tpl']['enabled_skills'] == ['a', 'c', 'b']
+    assert configs['tpl']['templates'] == ['extra']
+
+
+def test_changes_show_up_as_updates(tmp_path, fleet_catalog):
+    m = fleet_catalog
+    assert m.apply_fleet(str(write_manifest(tmp_path, FLEET)))
+    changed = {**FLEET, 'plain': {'skills': ['a', 'c']}, 'tpl': {'templates': ['base']}}
+    plan = {name: (op, detail) for op, name, _, detail in m.plan_fleet({'workspaces': changed})}
+    assert plan['plain'][0] == 'update'
+    assert plan['tpl'][0] == 'update' and 'templates' in plan['tpl'][1]
+    assert plan['deps'] == ('noop', '')
+    assert m.apply_fleet(str(write_manifest(tmp_path, changed)))
+    assert all(op == 'noop' for op, *_ in m.plan_fleet({'workspaces': changed}))
+
+
+@pytest.mark.parametrize('spec, reason', [
+    ({'skills': ['a', 'x']}, 'conflicto'),
+    ({'skills': ['b'], 'max_context_tokens': 1}, 'max_context_tokens'),
+])
+def test_invalid_workspace_fails_the_whole_plan(tmp_path, fleet_catalog, spec, reason):
+    m = fleet_catalog
+    manifest = write_manifest(tmp_path, {'good': {'skills': ['a']}, 'bad': spec})
+    result = m.apply_fleet(str(manifest))
+    assert not result and result.error == 'invalid_plan'
+    invalid = [i for i in result.items if i['op'] == 'invalid']
+    assert [i['workspace'] for i in invalid] == ['bad'] and reason in invalid[0]['detail']
+    assert not (m.workspaces_dir / 'good').exists()
+
+
+def test_prune_deletes_undeclared_workspaces(tmp_path, fleet_catalog):
+    m = fleet_catalog
+    assert m.apply_fleet(str(write_manifest(tmp_path, FLEET)))
+    smaller = {'plain': FLEET['plain']}
+    plan = m.plan_fleet({'workspaces': smaller}, prune=True)
+    assert sorted((op, name) for op, name, _, _ in plan) == [('delete', 'deps'), ('delete', 'tpl'), ('noop', 'plain')]
+    assert m.apply_fleet(str(write_manifest(tmp_path, smaller)), prune=True)
+    assert sorted(m._workspace_configs()) == ['plain']
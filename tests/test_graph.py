@@ -0,0 +1,55 @@
+import pytest
+
+from wsm.core import SkillGraph
+
+
+def graph(**skills):
+    return SkillGraph({name: dict(relations) for name, relations in skills.items()})
+
+
+def test_closure_lists_dependencies_first():
+    g = graph(app={'requires': ['api', 'db']}, api={'requires': ['http']}, db={}, http={})
+    assert g.closure('app') == ('http', 'api', 'db', 'app')
+    assert g.closure('db') == ('db',)
+
+
+def test_shared_dependencies_appear_once():
+    g = graph(a={'requires': ['b', 'c']}, b={'requires': ['d']}, c={'requires': ['d']}, d={})
+    assert g.closure('a') == ('d', 'b', 'c', 'a')
+
+
+def test_missing_dependency_is_kept_in_the_closure():
+    g = graph(a={'requires': ['ghost']})
+    assert g.closure('a') == ('ghost', 'a')
+
+
+@pytest.mark.parametrize('skills, start', [
+    ({'a': {'requires': ['a']}}, 'a'),
+    ({'a': {'requires': ['b']}, 'b': {'requires': ['a']}}, 'a'),
+    ({'x': {'requires': ['a']}, 'a': {'requires': ['b']}, 'b': {'requires': ['c']}, 'c': {'requires': ['a']}}, 'x'),
+])
+def test_cycles_raise(skills, start):
+    with pytest.raises(ValueError, match="cíclica"):
+        graph(**skills).closure(start)
+
+
+def test_conflicts_are_symmetric():
+    g = graph(a={'conflicts': ['b']}, b={}, c={'conflicts': ['a']})
+    assert g.conflicts_among(['b', 'a']) == [('a', 'b')]
+    assert g.conflicts_among(['a', 'b', 'c']) == [('a', 'b'), ('a', 'c')]
+    assert g.conflicts_among(['b', 'c']) == []
+
+
+def test_dependents():
+    g = graph(a={'requires': ['c']}, b={'requires': ['c']}, c={})
+    assert g.dependents('c') == {'a', 'b'}
+    assert g.dependents('a') == set()
+
+
+def test_enable_pulls_dependencies_and_refuses_conflicts(manager, catalog):
+    catalog({'a': {'requires': ['b']}, 'b': {}, 'c': {'conflicts': ['b']}, 'd': {'requires': ['ghost']}})
+    assert manager.create_workspace('ws')
+    result = manager.enable_skill('ws', 'a')
+    assert result and result['dependencies'] == ['b']
+    assert manager.enable_skill('ws', 'c').error == 'conflict'
+    assert manager.enable_skill('ws', 'd').error == 'missing_dependency'
@@ -0,0 +1,107 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import public_skills, write_skill
+from wsm import core
+from wsm.core import GENERATIONS_DIR, SYNC_JOURNAL_FILE
+
+
+class Crash(Exception):
+    pass
+
+
+def crash_after(monkeypatch, m, state):
+    """Simula que el proceso muere justo después de anotar `state` en el journal"""
+    original = m._write_sync_journal
+
+    def write(s, **fields):
+        original(s, **fields)
+        if s == state:
+            raise Crash(s)
+
+    monkeypatch.setattr(m, '_write_sync_journal', write)
+
+
+def generations(m):
+    return sorted(d.name for d in (m.skills_dir / GENERATIONS_DIR).iterdir() if d.is_dir())
+
+
+@pytest.fixture
+def published(project, manager, catalog):
+    catalog({'a': {}, 'b': {}})
+    return os.readlink(manager.skills_dir / "public")
+
+
+def test_crash_while_staging_keeps_previous_generation(project, manager, published, monkeypatch):
+    before = generations(manager)
+
+    def copy_then_crash(src, dst):
+        raise Crash(dst)
+
+    # Muere a mitad de copiar la generación nueva (ya existe su directorio)
+    monkeypatch.setattr(core, 'copy_file', copy_then_crash)
+    with pytest.raises(Crash):
+        manager._publish_generation({'c': write_skill(project / "src", 'c')})
+    monkeypatch.undo()
+    assert json.loads((manager.skills_dir / SYNC_JOURNAL_FILE).read_text())['state'] == 'staging'
+    assert len(generations(manager)) == len(before) + 1
+
+    manager._recover_sync()
+
+    assert os.readlink(manager.skills_dir / "public") == published
+    assert public_skills(manager) == ['a', 'b']
+    assert generations(manager) == before
+    assert not (manager.skills_dir / SYNC_JOURNAL_FILE).exists()
+
+
+@pytest.mark.parametrize('state', ['ready', 'published'])
+def test_crash_after_staging_completes_the_publish(project, manager, published, monkeypatch, state):
+    crash_after(monkeypatch, manager, state)
+    with pytest.raises(Crash):
+        manager._publish_generation({'c': write_skill(project / "src", 'c')})
+    monkeypatch.undo()
+
+    manager._recover_sync()
+
+    assert os.readlink(manager.skills_dir / "public") != published
+    assert public_skills(manager) == ['a', 'b', 'c']
+    assert not (manager.skills_dir / SYNC_JOURNAL_FILE).exists()
+    assert 'c' in manager._load_catalog_index()
+
+
+def test_crash_while_migrating_links_the_first_generation(project, manager):
+    # `public` ya renombrado a gen-0 pero sin el symlink
+    pub = manager.skills_dir / "public"
+    write_skill(pub, 'a')
+    gens = manager.skills_dir / GENERATIONS_DIR
+    gens.mkdir()
+    os.rename(pub, gens / "gen-0")
+    manager._write_sync_journal('migrating', stage="gen-0")
+
+    manager._recover_sync()
+
+    assert os.readlink(pub) == os.path.join(GENERATIONS_DIR, "gen-0")
+    assert public_skills(manager) == ['a']
+    assert not (manager.skills_dir / SYNC_JOURNAL_FILE).exists()
+
+
+def test_journal_of_a_live_process_is_left_alone(project, manager, published):
+    stage = manager.skills_dir / GENERATIONS_DIR / "gen-1"
+    stage.mkdir()
+    journal = manager.skills_dir / SYNC_JOURNAL_FILE
+    with subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"]) as proc:
+        try:
+            journal.write_text(json.dumps({'state': 'staging', 'stage': stage.name, 'pid': proc.pid}))
+            manager._recover_sync()
+            assert journal.exists() and stage.is_dir()
+        finally:
+            proc.kill()
+
+    proc.wait()
+    manager._recover_sync()
+    assert not journal.exists() and not stage.exists()
+    assert os.readlink(manager.skills_dir / "public") == published
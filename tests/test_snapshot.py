@@ -0,0 +1,101 @@
+import hashlib
+import json
+
+import pytest
+
+from conftest import public_skills
+from wsm.core import (SNAPSHOT_FORMATS, SNAPSHOT_IMPORT_DIR, SNAPSHOT_MANIFEST, SNAPSHOT_VERSION,
+                      WorkspaceManager, iter_snapshot, write_snapshot)
+
+
+def snapshot(path, skills, members=None, snapshot_id='snap-1', fmt='tar.gz'):
+    """Snapshot a medida: `skills` es {skill: {ruta: bytes}} y va al manifiesto;
+    `members` (por defecto los mismos ficheros) es lo que realmente lleva el archivo."""
+    manifest = {
+        'version': SNAPSHOT_VERSION,
+        'id': snapshot_id,
+        'created': '2026-01-01T00:00:00',
+        'skills': {name: {rel: hashlib.sha256(data).hexdigest() for rel, data in files.items()}
+                   for name, files in skills.items()},
+    }
+    if members is None:
+        members = [(f"skills/{name}/{rel}", data) for name, files in skills.items() for rel, data in files.items()]
+    entries = [(SNAPSHOT_MANIFEST, json.dumps(manifest).encode(), None)]
+    entries += [(arcname, data, None) for arcname, data in members]
+    write_snapshot(path, fmt, iter(entries))
+    return path
+
+
+SKILLS = {
+    'a': {'SKILL.md': b"---\nname: a\n---\nA\n", 'ref/notes.md': b"notas\n"},
+    'b': {'SKILL.md': b"---\nname: b\n---\nB\n"},
+}
+
+
+@pytest.mark.parametrize('fmt', [f for f in SNAPSHOT_FORMATS if f != 'tar.zst'])
+def test_iter_snapshot_streams_members_in_order(tmp_path, fmt):
+    path = snapshot(tmp_path / f"s.{fmt}", SKILLS, fmt=fmt)
+    names = [(name, f.read()) for name, f in iter_snapshot(path)]
+    assert names[0][0] == SNAPSHOT_MANIFEST
+    assert names[1:] == [("skills/a/SKILL.md", SKILLS['a']['SKILL.md']),
+                         ("skills/a/ref/notes.md", b"notas\n"),
+                         ("skills/b/SKILL.md", SKILLS['b']['SKILL.md'])]
+
+
+def test_export_then_import_into_another_project(tmp_path, manager, catalog):
+    catalog({'a': {}, 'b': {}})
+    out = tmp_path / "catalog.tar.gz"
+    assert manager.export_catalog(str(out))
+
+    other = tmp_path / "other"
+    (other / ".agent" / "skills").mkdir(parents=True)
+    m2 = WorkspaceManager(other)
+    result = m2.import_catalog(str(out))
+    assert result and sorted(result['changed']) == ['a', 'b']
+    assert public_skills(m2) == ['a', 'b']
+    assert m2.import_catalog(str(out))['changed'] == []
+
+
+def test_members_escaping_the_skill_are_ignored(tmp_path, manager):
+    members = [("skills/a/SKILL.md", SKILLS['a']['SKILL.md']),
+               ("skills/a/../../../escaped", b"x"),
+               ("skills/../escaped", b"x"),
+               ("skills//a/x", b"x"),
+               ("skills/a/ref/notes.md", b"notas\n")]
+    path = snapshot(tmp_path / "s.tar.gz", {'a': SKILLS['a']}, members)
+    assert manager.import_catalog(str(path))
+    assert not list(tmp_path.rglob("escaped"))
+    assert sorted(p.name for p in (manager.skills_dir / "public" / "a").rglob("*") if p.is_file()) == \
+        ['SKILL.md', 'notes.md']
+
+
+@pytest.mark.parametrize('name, files', [
+    ('../evil', {}),
+    ('a/b', {'SKILL.md': b"x"}),
+    ('.hidden', {}),
+    ('ok', {'../../evil': b"x"}),
+    ('ok', {'/etc/evil': b"x"}),
+])
+def test_manifest_paths_outside_staging_are_rejected(tmp_path, manager, name, files):
+    path = snapshot(tmp_path / "s.tar.gz", {name: files}, members=[])
+    result = manager.import_catalog(str(path))
+    assert not result and result.error == 'import_failed'
+    assert not list(tmp_path.rglob("evil"))
+    assert not (manager.root_dir / ".agent" / "sources" / SNAPSHOT_IMPORT_DIR).exists()
+
+
+def test_interrupted_import_resumes_from_progress(tmp_path, manager):
+    staging = manager.root_dir / ".agent" / "sources" / SNAPSHOT_IMPORT_DIR / 'snap-1'
+    # `b` llega corrupto: `a` queda extraído y anotado en progress.json
+    corrupt = [(f"skills/a/{rel}", data) for rel, data in SKILLS['a'].items()]
+    corrupt.append(("skills/b/SKILL.md", b"otro contenido"))
+    result = manager.import_catalog(str(snapshot(tmp_path / "bad.tar.gz", SKILLS, corrupt)))
+    assert not result and result.error == 'incomplete_snapshot' and result['missing'] == ['b']
+    assert json.loads((staging / "progress.json").read_text())['done'] == ['a']
+
+    # Al repetir, `a` ya no se vuelve a leer: aunque ahora llegue corrupto, no importa
+    retry = [("skills/a/SKILL.md", b"corrupto"), ("skills/b/SKILL.md", SKILLS['b']['SKILL.md'])]
+    result = manager.import_catalog(str(snapshot(tmp_path / "good.tar.gz", SKILLS, retry)))
+    assert result and sorted(result['changed']) == ['a', 'b']
+    assert (manager.skills_dir / "public" / "a" / "SKILL.md").read_bytes() == SKILLS['a']['SKILL.md']
+    assert not staging.exists()
@@ -0,0 +1,64 @@
+import json
+import os
+
+import pytest
+
+from conftest import write_config
+from wsm.core import WorkspaceManager
+
+
+def hand_edit(cfg, **fields):
+    """Edita el JSON como lo haría un usuario, con un mtime distinto del registrado"""
+    config = json.loads(cfg.read_text())
+    config.update(fields)
+    cfg.write_text(json.dumps(config, indent=2))
+    st = cfg.stat()
+    os.utime(cfg, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def stateful(project, manager, catalog):
+    catalog({'a': {}, 'b': {}, 'c': {}})
+    assert manager.create_workspace('ws1')
+    assert manager.enable_skill('ws1', 'a')
+    assert manager.state_import()
+    return WorkspaceManager(project)
+
+
+def test_state_import_copies_every_workspace(stateful):
+    state = stateful._state()
+    assert state is not None
+    assert state.get_workspace('ws1')[0]['enabled_skills'] == ['a']
+    assert stateful.state_check()
+
+
+def test_hand_edit_is_reimported_before_reading(stateful):
+    cfg = stateful.workspaces_dir / 'ws1' / "skill-config.json"
+    hand_edit(cfg, enabled_skills=['a', 'b'], description="editado")
+
+    m = WorkspaceManager(stateful.root_dir)
+    assert m._load_config(cfg)['enabled_skills'] == ['a', 'b']
+    assert m._state().get_workspace('ws1')[0]['description'] == "editado"
+    assert m.state_check()
+
+
+def test_cross_workspace_queries_see_hand_edits_and_new_workspaces(stateful):
+    hand_edit(stateful.workspaces_dir / 'ws1' / "skill-config.json", enabled_skills=['c'])
+    write_config(stateful, 'manual', enabled_skills=['c'])
+
+    m = WorkspaceManager(stateful.root_dir)
+    listed = {w['name']: w['skills'] for w in m.list_workspaces().items}
+    assert listed == {'ws1': 1, 'manual': 1}
+    assert [w['name'] for w in m.who_uses('c').items] == ['manual', 'ws1']
+    assert m.who_uses('a')['count'] == 0
+    assert {e['workspace'] for e in m.state_history().items if e['op'] == 'import'} >= {'ws1', 'manual'}
+
+
+def test_deleted_workspace_disappears_from_listings(stateful):
+    write_config(stateful, 'gone')
+    m = WorkspaceManager(stateful.root_dir)
+    assert 'gone' in {w['name'] for w in m.list_workspaces().items}
+
+    (stateful.workspaces_dir / 'gone' / "skill-config.json").unlink()
+    (stateful.workspaces_dir / 'gone').rmdir()
+    assert {w['name'] for w in m.list_workspaces().items} == {'ws1'}
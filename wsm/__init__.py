@@ -0,0 +1,31 @@
+"""
+API importable de Workspace Manager.
+
+    import wsm
+
+    m = wsm.Manager("/ruta/al/proyecto")
+    m.enable("ytmusic", "api-patterns")
+    for ws in m.workspaces().items:
+        print(ws['name'], ws['skills'])
+
+    async def main():
+        am = wsm.AsyncManager("/ruta/al/proyecto")
+        results = await asyncio.gather(*(am.sync_workspace(n) for n in nombres))
+
+La lógica vive en wsm.core (workspace-manager.py es sólo el lanzador del CLI,
+wsm.cli). La API usa el manager sin flujo de salida (out=None) y con
+interactive=False: nada de salida de terminal, input(), clear ni paginador. Cada
+operación devuelve un `Result` (truthy si tuvo éxito, `error` con un código
+estable y los datos en `result['campo']` o `result.items`).
+"""
+
+from .core import PROFILER, Result, WorkspaceManager
+
+__all__ = ['Manager', 'AsyncManager', 'Result', 'WorkspaceManager', 'PROFILER']
+
+def __getattr__(name):
+    # La API (asyncio, pools) se importa al usarla: el CLI sólo necesita wsm.core
+    if name in ('Manager', 'AsyncManager'):
+        from . import api
+        return getattr(api, name)
+    raise AttributeError(f"module 'wsm' has no attribute {name!r}")
@@ -0,0 +1,5 @@
+"""python -m wsm: el mismo CLI que workspace-manager.py"""
+
+from .cli import run
+
+run()
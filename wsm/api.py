@@ -0,0 +1,242 @@
+"""
+Manager y AsyncManager: la API de `wsm` (ver el docstring del paquete).
+"""
+
+import asyncio
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import List, Optional, Union
+
+from .core import DEDUPE_THRESHOLD, PROFILER, Result, WorkspaceManager
+
+class Manager:
+    """API síncrona sobre un proyecto (el directorio que contiene .agent/ y workspaces/).
+    
+    Sin `root` se detecta igual que en el CLI, a partir del directorio actual.
+    Cubre todos los comandos del CLI salvo `wizard` (interactivo) y `completion`
+    (genera el script de la shell a partir del parser).
+    """
+    
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        self._m = WorkspaceManager(root)
+        self._m.interactive = False
+    
+    @property
+    def root(self) -> Path:
+        return self._m.root_dir
+    
+    # ── Catálogo ──
+    
+    def catalog(self) -> Result:
+        return self._m.list_catalog()
+    
+    def skill(self, name: str, lang: str = 'en') -> Result:
+        return self._m.show_skill_detail(name, lang)
+    
+    def complete(self, prefix: str = '') -> Result:
+        """Nombres de skills que empiezan por `prefix` (en `result.items`)"""
+        return self._m.complete_skill_names(prefix)
+    
+    def init(self, force: bool = False, snapshot: Optional[str] = None, lazy: bool = False) -> Result:
+        return self._m.initialize_project(force, snapshot, lazy)
+    
+    def sources(self) -> Result:
+        return self._m.list_sources()
+    
+    def sync(self, auto_fix: bool = False) -> Result:
+        return self._m.sync_from_github(auto_fix)
+    
+    def verify(self, repair: bool = False) -> Result:
+        return self._m.verify_catalog(repair)
+    
+    def import_catalog(self, archive: str, force: bool = False) -> Result:
+        return self._m.import_catalog(archive, force)
+    
+    def export_catalog(self, output: Optional[str] = None, fmt: Optional[str] = None) -> Result:
+        return self._m.export_catalog(output, fmt)
+    
+    def graph(self, skill: str) -> Result:
+        """`requires` de un skill, quién lo requiere y sus conflictos"""
+        return self._m.show_skill_graph(skill)
+    
+    def dedupe(self, workspace: Optional[str] = None, threshold: float = DEDUPE_THRESHOLD) -> Result:
+        return self._m.dedupe_report(workspace, threshold)
+    
+    # ── Workspaces ──
+    
+    def workspaces(self) -> Result:
+        return self._m.list_workspaces()
+    
+    def create_workspace(self, name: str, templates: Optional[List[str]] = None,
+                         description: str = "") -> Result:
+        return self._m.create_workspace(name, templates, description)
+    
+    def workspace_skills(self, workspace: str) -> Result:
+        return self._m.list_workspace_skills(workspace)
+    
+    def enable(self, workspace: str, skill: str) -> Result:
+        return self._m.enable_skill(workspace, skill)
+    
+    def disable(self, workspace: str, skill: str) -> Result:
+        return self._m.disable_skill(workspace, skill)
+    
+    def who_uses(self, skill: str) -> Result:
+        return self._m.who_uses(skill)
+    
+    def budget(self, workspace: str, max_tokens: Optional[int] = None) -> Result:
+        return self._m.budget_report(workspace, max_tokens)
+    
+    def load_plan(self, workspace: str, max_tokens: Optional[int] = None,
+                  max_bytes: Optional[int] = None, links: bool = False) -> Result:
+        return self._m.write_load_plan(workspace, max_tokens, max_bytes, links)
+    
+    def set_priority(self, workspace: str, skill: str, priority: int) -> Result:
+        return self._m.set_skill_priority(workspace, skill, priority)
+    
+    def lock(self, workspace: Optional[str] = None) -> Result:
+        """skill-lock.json de un workspace (o de todos si se omite)"""
+        if workspace is None:
+            return self._m.lock_all_workspaces()
+        return self._m.lock_workspace(workspace)
+    
+    def status(self, workspace: Optional[str] = None, jobs: int = 8) -> Result:
+        """Qué corregiría sync_workspace (de un workspace o de todos si se omite)"""
+        return self._m.workspace_status(workspace, workspace is None, jobs)
+    
+    def apply_fleet(self, manifest: str, plan_only: bool = False, prune: bool = False) -> Result:
+        return self._m.apply_fleet(manifest, plan_only, prune)
+    
+    # ── Sincronización y recomendaciones ──
+    
+    def sync_workspace(self, workspace: Optional[str] = None, verify: bool = False) -> Result:
+        """Reconstruye los symlinks de un workspace (o de todos si se omite)"""
+        if workspace is None:
+            return self._m.sync_all_workspaces(verify)
+        return self._m.sync_workspace_skills(workspace, verify=verify)
+    
+    def recommend(self, workspace: str, aggregate: bool = True) -> Result:
+        return self._m.recommend_skills(workspace, aggregate)
+    
+    # ── Store de versiones ──
+    
+    def store_ingest(self, skills: Optional[List[str]] = None) -> Result:
+        return self._m.store_ingest(skills)
+    
+    def store_list(self, skill: Optional[str] = None) -> Result:
+        return self._m.store_list(skill)
+    
+    def store_gc(self, dry_run: bool = False) -> Result:
+        return self._m.store_gc(dry_run)
+    
+    def pin(self, workspace: str, skill: str, version: Optional[str] = None) -> Result:
+        return self._m.pin_skill(workspace, skill, version)
+    
+    def unpin(self, workspace: str, skill: str) -> Result:
+        return self._m.pin_skill(workspace, skill, unpin=True)
+    
+    # ── Estado (state.db) ──
+    
+    def db_import(self) -> Result:
+        return self._m.state_import()
+    
+    def db_export(self) -> Result:
+        return self._m.state_export()
+    
+    def db_check(self, repair: bool = False) -> Result:
+        return self._m.state_check(repair)
+    
+    def db_history(self, workspace: Optional[str] = None, limit: int = 20) -> Result:
+        return self._m.state_history(workspace, limit)
+
+class AsyncManager:
+    """Variante asyncio de `Manager`: mismos métodos, como corrutinas.
+    
+    El trabajo de disco y git corre en un pool de hilos, así que un único bucle de
+    eventos puede llevar muchas operaciones a la vez. Las que tocan el mismo
+    workspace se serializan entre sí, y las que reescriben el catálogo (sync,
+    verify, import) se serializan con las demás del catálogo. Cada hilo del pool
+    usa su propio `Manager`, así que las cachés (índice del catálogo, grafo,
+    plantillas) nunca se comparten entre operaciones concurrentes; tras reescribir
+    el catálogo, cada hilo vuelve a crear el suyo antes de su siguiente operación.
+    """
+    
+    _CATALOG_WRITES = {'init', 'sync', 'verify', 'import_catalog', 'store_ingest', 'store_gc'}
+    _WORKSPACE_OPS = {'create_workspace', 'workspace_skills', 'enable', 'disable', 'budget',
+                      'load_plan', 'set_priority', 'lock', 'status', 'sync_workspace', 'recommend',
+                      'pin', 'unpin'}
+    
+    def __init__(self, root: Optional[Union[str, Path]] = None, max_workers: int = 16):
+        self._root = Manager(root).root
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='wsm')
+        self._locks = {}
+        self._local = threading.local()
+        self._catalog_epoch = 0
+    
+    @property
+    def root(self) -> Path:
+        return self._root
+    
+    def _manager(self) -> Manager:
+        """Manager del hilo actual (nuevo si el catálogo cambió desde que se creó)"""
+        local = self._local
+        if getattr(local, 'epoch', None) != self._catalog_epoch:
+            local.manager = Manager(self._root)
+            local.epoch = self._catalog_epoch
+        return local.manager
+    
+    def _lock(self, key: str) -> asyncio.Lock:
+        if key not in self._locks:
+            self._locks[key] = asyncio.Lock()
+        return self._locks[key]
+    
+    async def _run(self, key: Optional[str], fn) -> Result:
+        loop = asyncio.get_running_loop()
+        call = PROFILER.bind(fn)
+        if key is None:
+            return await loop.run_in_executor(self._executor, call)
+        async with self._lock(key):
+            return await loop.run_in_executor(self._executor, call)
+    
+    def __getattr__(self, name: str):
+        fn = getattr(Manager, name, None)
+        if not callable(fn) or name.startswith('_'):
+            raise AttributeError(name)
+        
+        def run(*args, **kwargs):
+            return getattr(self._manager(), name)(*args, **kwargs)
+        
+        async def call(*args, **kwargs):
+            if name in self._CATALOG_WRITES:
+                key = 'catalog'
+            elif name in self._WORKSPACE_OPS:
+                # El workspace puede llegar por posición o por nombre (workspace=..., name=...)
+                bound = inspect.signature(fn).bind(None, *args, **kwargs).arguments
+                workspace = bound.get('workspace', bound.get('name'))
+                key = f"workspace:{workspace}" if workspace else None
+            else:
+                key = None
+            try:
+                return await self._run(key, partial(run, *args, **kwargs))
+            finally:
+                if key == 'catalog':
+                    self._catalog_epoch += 1
+        
+        call.__name__ = name
+        call.__doc__ = fn.__doc__
+        return call
+    
+    async def sync_workspaces(self, workspaces: List[str], verify: bool = False) -> List[Result]:
+        """Sincroniza varios workspaces en paralelo"""
+        return await asyncio.gather(*(self.sync_workspace(ws, verify) for ws in workspaces))
+    
+    def close(self):
+        self._executor.shutdown(wait=True)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        self.close()
@@ -0,0 +1,327 @@
+"""
+CLI de Workspace Manager (`wsm`): argumentos, modos de salida y perfilado.
+
+workspace-manager.py sólo llama a `run()`; también sirve `python -m wsm`.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+from .core import (COMPLETION_SHELLS, DEDUPE_THRESHOLD, PROFILER, SNAPSHOT_FORMATS, Colors,
+                   WorkspaceManager, completion_spec, ndjson_writer, span)
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='wsm',
+        description="Workspace Manager",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos:
+  wsm init
+  wsm wizard
+  wsm list
+  wsm enable ytmusic api-patterns
+  wsm sync --auto-fix
+  wsm --profile sync-skills
+  WSM_TRACE=trace.json wsm list
+  wsm --json list-skills ytmusic
+  wsm --ndjson list | jq -r .name
+
+Funciona desde cualquier ubicación - detecta rutas automáticamente.
+        """
+    )
+    
+    parser.add_argument('--profile', action='store_true',
+                        help='Muestra el árbol de tiempos y los contadores al terminar')
+    parser.add_argument('--cprofile', metavar='FILE', help='Vuelca estadísticas de cProfile en FILE')
+    out = parser.add_mutually_exclusive_group()
+    out.add_argument('--json', action='store_true', help='Salida como un único documento JSON')
+    out.add_argument('--ndjson', action='store_true',
+                     help='Un objeto JSON por línea (los listados salen en streaming)')
+    out.add_argument('-q', '--quiet', action='store_true', help='Sin salida: sólo el código de retorno')
+    
+    sub = parser.add_subparsers(dest='command')
+    
+    ini = sub.add_parser('init')
+    ini.add_argument('--force', action='store_true')
+    ini.add_argument('--snapshot', metavar='FILE', help='Catálogo desde un snapshot (sin red)')
+    ini.add_argument('--lazy', action='store_true', help='Materializa sólo los skills que se usen')
+    sub.add_parser('wizard')
+    
+    c = sub.add_parser('create')
+    c.add_argument('name')
+    c.add_argument('-t', '--template', action='append',
+                   help='Plantilla a aplicar (repetible para componer: -t backend -t security)')
+    c.add_argument('-d', '--description', default='')
+    
+    sub.add_parser('list')
+    
+    ls = sub.add_parser('list-skills')
+    ls.add_argument('workspace', nargs='?')
+    
+    en = sub.add_parser('enable')
+    en.add_argument('workspace')
+    en.add_argument('skill')
+    
+    dis = sub.add_parser('disable')
+    dis.add_argument('workspace')
+    dis.add_argument('skill')
+    
+    sync = sub.add_parser('sync')
+    sync.add_argument('--auto-fix', action='store_true')
+    sync_mode = sync.add_mutually_exclusive_group()
+    sync_mode.add_argument('--lazy', dest='mode', action='store_const', const='lazy',
+                           help='Metadatos de todo el catálogo, ficheros sólo de los skills en uso')
+    sync_mode.add_argument('--full', dest='mode', action='store_const', const='full',
+                           help='Vuelve a materializar el catálogo completo')
+    
+    ss = sub.add_parser('sync-skills')
+    ss.add_argument('workspace', nargs='?', help='Workspace específico (o todos si se omite)')
+    ss.add_argument('--verify', action='store_true', help='Comprueba los hashes de skill-lock.json')
+    
+    stt = sub.add_parser('status')
+    stt.add_argument('workspace', nargs='?', help='Por defecto el workspace del directorio actual')
+    stt.add_argument('--all', action='store_true', help='Todos los workspaces (en paralelo)')
+    stt.add_argument('-j', '--jobs', type=int, default=8)
+    
+    lk = sub.add_parser('lock')
+    lk.add_argument('workspace', nargs='?', help='Workspace específico (o todos si se omite)')
+    
+    bud = sub.add_parser('budget')
+    bud.add_argument('workspace')
+    bud.add_argument('--set', type=int, dest='max_tokens', metavar='N',
+                     help='Fija max_context_tokens en skill-config.json (0 = sin límite)')
+    
+    plan = sub.add_parser('plan')
+    plan.add_argument('workspace')
+    plan.add_argument('--max-tokens', type=int, help='Presupuesto de tokens (por defecto max_context_tokens)')
+    plan.add_argument('--max-bytes', type=int, help='Presupuesto en bytes')
+    plan.add_argument('--links', action='store_true', help='Crea symlinks numerados en .agents/load-plan/')
+    
+    prio = sub.add_parser('priority')
+    prio.add_argument('workspace')
+    prio.add_argument('skill')
+    prio.add_argument('value', type=int, help='Mayor = se carga antes (0 = por defecto)')
+    
+    reco = sub.add_parser('reco-skills')
+    reco.add_argument('workspace')
+    reco.add_argument('--per-project', dest='aggregate', action='store_false',
+                      help='En monorepos, sólo los grupos de cada sub-proyecto')
+    
+    sub.add_parser('sources')
+    
+    ver = sub.add_parser('verify')
+    ver.add_argument('--repair', action='store_true', help='Vuelve a descargar los skills dañados')
+    ver.add_argument('--record', action='store_true', help='Registra el estado actual como manifiesto')
+    ver.add_argument('-j', '--jobs', type=int)
+    
+    exp = sub.add_parser('export-catalog')
+    exp.add_argument('output', nargs='?', help='Fichero de salida (por defecto skills-catalog-AAAAMMDD.tar.gz)')
+    exp.add_argument('--format', choices=SNAPSHOT_FORMATS, help='Por defecto según la extensión, o tar.gz')
+    
+    imp = sub.add_parser('import-catalog')
+    imp.add_argument('archive', help='Snapshot de wsm export-catalog (.tar.zst, .tar.gz o .zip)')
+    imp.add_argument('--force', action='store_true', help='Extrae todos los skills aunque no hayan cambiado')
+    
+    st = sub.add_parser('store')
+    st_sub = st.add_subparsers(dest='store_command')
+    st_in = st_sub.add_parser('ingest')
+    st_in.add_argument('skills', nargs='*', help='Skills a guardar (todos si se omite)')
+    st_ls = st_sub.add_parser('list')
+    st_ls.add_argument('skill', nargs='?')
+    st_gc = st_sub.add_parser('gc')
+    st_gc.add_argument('--dry-run', action='store_true')
+    
+    pin = sub.add_parser('pin')
+    pin.add_argument('workspace')
+    pin.add_argument('skill')
+    pin.add_argument('version', nargs='?', help='Hash de la versión (por defecto la latest actual)')
+    pin.add_argument('--unpin', action='store_true', help='Vuelve a seguir latest')
+    
+    ap = sub.add_parser('apply')
+    ap.add_argument('manifest', help='Manifiesto de flota (.yaml o .json)')
+    ap.add_argument('--plan', action='store_true', help='Sólo muestra el plan, sin aplicar')
+    ap.add_argument('--prune', action='store_true', help='Elimina workspaces que no estén en el manifiesto')
+    ap.add_argument('-j', '--jobs', type=int, default=8)
+    
+    dd = sub.add_parser('dedupe')
+    dd.add_argument('workspace', nargs='?', help='Informe de skills redundantes de un workspace')
+    dd.add_argument('--threshold', type=float, default=DEDUPE_THRESHOLD,
+                    help=f'Similitud mínima estimada (por defecto {DEDUPE_THRESHOLD})')
+    
+    gr = sub.add_parser('graph')
+    gr.add_argument('skill')
+    
+    show = sub.add_parser('show')
+    show.add_argument('skill')
+    show.add_argument('--lang', choices=['en', 'es'], default='en')
+    
+    who = sub.add_parser('who-uses')
+    who.add_argument('skill')
+    
+    db = sub.add_parser('db')
+    db_sub = db.add_subparsers(dest='db_command')
+    db_sub.add_parser('import', help='Crea/actualiza .agent/state.db desde los skill-config.json')
+    db_sub.add_parser('export', help='Reescribe los skill-config.json desde la base de datos')
+    db_chk = db_sub.add_parser('check')
+    db_chk.add_argument('--repair', action='store_true', help='Reimporta lo que difiera (el JSON manda)')
+    db_hist = db_sub.add_parser('history')
+    db_hist.add_argument('workspace', nargs='?')
+    db_hist.add_argument('-n', '--limit', type=int, default=20)
+    
+    comp = sub.add_parser('completion')
+    comp.add_argument('shell', choices=COMPLETION_SHELLS)
+    
+    args = parser.parse_args()
+    if not args.command:
+        parser.print_help()
+        return
+    
+    trace = os.environ.get('WSM_TRACE')
+    if args.profile or trace:
+        PROFILER.enable()
+    cprof = None
+    if args.cprofile:
+        import cProfile
+        cprof = cProfile.Profile()
+        cprof.enable()
+    
+    machine = args.json or args.ndjson or args.quiet
+    if machine:
+        Colors.disable()
+    real_stdout = sys.stdout
+    result = None
+    
+    try:
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(span(f"wsm {args.command}"))
+            if machine:
+                # El manager no escribe (out=None); esto sólo protege stdout de terceros
+                stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+            m = WorkspaceManager(out=None if machine else real_stdout)
+            if machine:
+                m.interactive = False
+            if args.ndjson:
+                m.stream = ndjson_writer(real_stdout)
+            
+            if args.command == 'init':
+                result = m.initialize_project(args.force, args.snapshot, args.lazy)
+            elif args.command == 'wizard':
+                result = m.run_wizard()
+            elif args.command == 'create':
+                result = m.create_workspace(args.name, args.template, args.description)
+            elif args.command == 'list':
+                result = m.list_workspaces()
+            elif args.command == 'list-skills':
+                if args.workspace:
+                    result = m.list_workspace_skills(args.workspace)
+                else:
+                    result = m.list_catalog()
+            elif args.command == 'enable':
+                result = m.enable_skill(args.workspace, args.skill)
+            elif args.command == 'disable':
+                result = m.disable_skill(args.workspace, args.skill)
+            elif args.command == 'sync':
+                result = m.sync_from_github(args.auto_fix, args.mode)
+            elif args.command == 'budget':
+                result = m.budget_report(args.workspace, args.max_tokens)
+            elif args.command == 'plan':
+                result = m.write_load_plan(args.workspace, args.max_tokens, args.max_bytes, args.links)
+            elif args.command == 'priority':
+                result = m.set_skill_priority(args.workspace, args.skill, args.value)
+            elif args.command == 'reco-skills':
+                result = m.recommend_skills(args.workspace, args.aggregate)
+            elif args.command == 'sync-skills':
+                if args.workspace:
+                    result = m.sync_workspace_skills(args.workspace, verify=args.verify)
+                else:
+                    result = m.sync_all_workspaces(args.verify)
+            elif args.command == 'status':
+                result = m.workspace_status(args.workspace, args.all, args.jobs)
+            elif args.command == 'lock':
+                if args.workspace:
+                    result = m.lock_workspace(args.workspace)
+                else:
+                    result = m.lock_all_workspaces()
+            elif args.command == 'sources':
+                result = m.list_sources()
+            elif args.command == 'verify':
+                result = m.verify_catalog(args.repair, args.record, args.jobs)
+            elif args.command == 'export-catalog':
+                result = m.export_catalog(args.output, args.format)
+            elif args.command == 'import-catalog':
+                result = m.import_catalog(args.archive, args.force)
+            elif args.command == 'store':
+                if args.store_command == 'ingest':
+                    result = m.store_ingest(args.skills or None)
+                elif args.store_command == 'list':
+                    result = m.store_list(args.skill)
+                elif args.store_command == 'gc':
+                    result = m.store_gc(args.dry_run)
+                else:
+                    st.print_help(real_stdout)
+            elif args.command == 'pin':
+                result = m.pin_skill(args.workspace, args.skill, args.version, args.unpin)
+            elif args.command == 'apply':
+                result = m.apply_fleet(args.manifest, args.plan, args.prune, args.jobs)
+            elif args.command == 'dedupe':
+                result = m.dedupe_report(args.workspace, args.threshold)
+            elif args.command == 'graph':
+                result = m.show_skill_graph(args.skill)
+            elif args.command == 'show':
+                result = m.show_skill_detail(args.skill, args.lang)
+            elif args.command == 'who-uses':
+                result = m.who_uses(args.skill)
+            elif args.command == 'db':
+                if args.db_command == 'import':
+                    result = m.state_import()
+                elif args.db_command == 'export':
+                    result = m.state_export()
+                elif args.db_command == 'check':
+                    result = m.state_check(args.repair)
+                elif args.db_command == 'history':
+                    result = m.state_history(args.workspace, args.limit)
+                else:
+                    db.print_help(real_stdout)
+            elif args.command == 'completion':
+                result = m.completion_script(args.shell, completion_spec(parser))
+        
+        if result is not None:
+            command = ' '.join(filter(None, (args.command, getattr(args, 'store_command', None),
+                                             getattr(args, 'db_command', None))))
+            if args.json:
+                json.dump({'command': command, **result.to_dict()}, real_stdout,
+                          ensure_ascii=False, indent=2, default=str)
+                real_stdout.write('\n')
+            elif args.ndjson:
+                ndjson_writer(real_stdout)({'type': 'result', 'command': command, **result.to_dict()})
+    finally:
+        if cprof:
+            cprof.disable()
+            cprof.dump_stats(args.cprofile)
+            print(f"{Colors.CYAN}📈 cProfile: {args.cprofile} (python -m pstats {args.cprofile}){Colors.ENDC}",
+                  file=sys.stderr)
+        if args.profile:
+            PROFILER.print_tree()
+        if trace:
+            PROFILER.write_chrome_trace(trace)
+            print(f"{Colors.CYAN}🧭 Traza: {trace} (chrome://tracing o ui.perfetto.dev){Colors.ENDC}", file=sys.stderr)
+    if result is not None and not result:
+        sys.exit(1)
+
+def run():
+    """Punto de entrada del CLI"""
+    try:
+        main()
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}Cancelado{Colors.ENDC}")
+        sys.exit(0)
+    except BrokenPipeError:
+        # `wsm --ndjson list-skills | head`: el lector cerró la tubería
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        os.close(devnull)
+        sys.exit(0)
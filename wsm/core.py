@@ -0,0 +1,5199 @@
+"""
+Núcleo de Workspace Manager: catálogo, workspaces, estado y sincronización.
+
+workspace-manager.py (el CLI, ver wsm.cli) y la API de `wsm` usan este módulo;
+al ser un módulo importable, Python guarda su bytecode en __pycache__ y cada
+llamada al CLI se ahorra compilarlo.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import contextlib
+import re
+import stat
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Set, Optional, TextIO
+import functools
+import bisect
+try:
+    import fcntl
+except ImportError:  # Windows: el lock de publicación sólo serializa dentro del proceso
+    fcntl = None
+
+# ============================================================================
+# COLORES
+# ============================================================================
+
+class Colors:
+    BLUE = '\033[94m'
+    CYAN = '\033[96m'
+    GREEN = '\033[92m'
+    YELLOW = '\033[93m'
+    RED = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+    
+    @classmethod
+    def disable(cls):
+        """Sin secuencias ANSI: salida redirigida, NO_COLOR o modos --json/--ndjson"""
+        for name in ('BLUE', 'CYAN', 'GREEN', 'YELLOW', 'RED', 'ENDC', 'BOLD'):
+            setattr(cls, name, '')
+
+if os.environ.get('NO_COLOR') or not sys.stdout.isatty():
+    Colors.disable()
+
+# ============================================================================
+# RESULTADOS ESTRUCTURADOS (--json, --ndjson, --quiet)
+# ============================================================================
+
+class Result:
+    """Resultado estructurado de una operación de WorkspaceManager.
+    
+    Es truthy si la operación tuvo éxito, así que sirve donde antes se devolvía
+    True/False. `error` es un código estable para automatizaciones (p. ej.
+    'workspace_not_found'), `data` lleva los campos del resultado e `items` los
+    elementos de un listado (vacío si ya salieron en streaming como NDJSON).
+    """
+    __slots__ = ('ok', 'error', 'data', 'items')
+    
+    def __init__(self, ok: bool = True, error: Optional[str] = None,
+                 items: Optional[list] = None, **data):
+        self.ok = ok
+        self.error = error
+        self.items = items
+        self.data = data
+    
+    def __bool__(self):
+        return self.ok
+    
+    def __getitem__(self, key):
+        return self.data[key]
+    
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+    
+    def to_dict(self) -> dict:
+        out = {'ok': self.ok}
+        if self.error:
+            out['error'] = self.error
+        out.update(self.data)
+        if self.items is not None:
+            out['items'] = self.items
+        return out
+    
+    def __repr__(self):
+        return f"Result({self.to_dict()!r})"
+
+def ndjson_writer(stream):
+    """Callable que escribe cada registro como una línea JSON y la vacía al momento"""
+    def write(record: dict):
+        stream.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        stream.flush()
+    return write
+
+# ============================================================================
+# INSTRUMENTACIÓN (--profile, WSM_TRACE)
+# ============================================================================
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'args', 'path', 'start')
+    
+    def __init__(self, profiler, name: str, args: dict):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+    
+    def __enter__(self):
+        stack = self.profiler._stack()
+        self.path = (stack[-1].path if stack else ()) + (self.name,)
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.profiler._stack().pop()
+        self.profiler._record(self, end)
+        return False
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class Profiler:
+    """Spans anidados y contadores para ver en qué se va el tiempo de cada comando.
+    
+    Desactivado, `span()` devuelve un contexto vacío y `count()` no hace nada, así que
+    el coste es una comprobación. Activo (--profile o WSM_TRACE=fichero.json) guarda
+    cada span con su ruta en el árbol, hilo, inicio y duración: de ahí salen el árbol
+    de tiempos y la traza en formato Chrome (chrome://tracing o ui.perfetto.dev).
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+    
+    def enable(self):
+        self.enabled = True
+        self._origin = time.perf_counter()
+    
+    def span(self, name: str, **args):
+        return _Span(self, name, args) if self.enabled else _NULL_SPAN
+    
+    def count(self, name: str, n: int = 1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + n
+    
+    def bind(self, fn):
+        """Envuelve `fn` para que sus spans cuelguen del span actual aunque corra en otro hilo"""
+        stack = self._stack() if self.enabled else None
+        if not stack:
+            return fn
+        parent = stack[-1]
+        
+        def run(*args, **kwargs):
+            local = self._stack()
+            local.append(parent)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                local.pop()
+        return run
+    
+    def _stack(self) -> list:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    def _record(self, span: _Span, end: float):
+        with self._lock:
+            self.events.append((span.path, threading.get_ident(), span.start - self._origin,
+                                end - span.start, span.args))
+    
+    def print_tree(self):
+        """Árbol de tiempos agregado por ruta de spans, hijos ordenados por tiempo total"""
+        nodes = {}
+        for path, _, _, dur, _ in self.events:
+            node = nodes.setdefault(path, [0, 0.0])
+            node[0] += 1
+            node[1] += dur
+        children = {}
+        for path in nodes:
+            children.setdefault(path[:-1], []).append(path)
+        total = sum(nodes[p][1] for p in children.get((), [])) or 1e-9
+        
+        print(f"\n{Colors.BOLD}⏱️  Perfil ({total * 1000:.1f} ms){Colors.ENDC}\n", file=sys.stderr)
+        
+        def show(path, depth):
+            n, dur = nodes[path]
+            label = '  ' * depth + path[-1] + (f" ×{n}" if n > 1 else '')
+            print(f"  {label:<48} {dur * 1000:>10.1f} ms {dur / total:>6.1%}", file=sys.stderr)
+            for child in sorted(children.get(path, []), key=lambda p: -nodes[p][1]):
+                show(child, depth + 1)
+        
+        for root in sorted(children.get((), []), key=lambda p: -nodes[p][1]):
+            show(root, 0)
+        if self.counters:
+            print(f"\n  {Colors.BOLD}Contadores{Colors.ENDC}", file=sys.stderr)
+            for name, value in sorted(self.counters.items()):
+                shown = format_bytes(value) if name.startswith('bytes_') else value
+                print(f"  {name:<48} {shown:>13}", file=sys.stderr)
+        print(file=sys.stderr)
+    
+    def write_chrome_trace(self, path: str):
+        """Vuelca spans (eventos "X") y contadores (eventos "C") en formato Chrome trace"""
+        pid = os.getpid()
+        events = [{'name': p[-1], 'cat': 'wsm', 'ph': 'X', 'pid': pid, 'tid': tid,
+                   'ts': round(start * 1e6, 1), 'dur': round(dur * 1e6, 1),
+                   'args': {k: v if isinstance(v, (int, float, bool)) else str(v) for k, v in args.items()}}
+                  for p, tid, start, dur, args in self.events]
+        end = round((time.perf_counter() - self._origin) * 1e6, 1)
+        events += [{'name': name, 'ph': 'C', 'pid': pid, 'ts': end, 'args': {name: value}}
+                   for name, value in sorted(self.counters.items())]
+        write_json_atomic(Path(path), {'traceEvents': events, 'displayTimeUnit': 'ms'})
+
+PROFILER = Profiler()
+span = PROFILER.span
+count = PROFILER.count
+
+# ============================================================================
+# CATÁLOGO Y CONTABILIDAD DE CONTEXTO
+# ============================================================================
+
+SKILLS_REPO_URL = os.environ.get("WSM_SKILLS_REPO", "https://github.com/sickn33/antigravity-awesome-skills.git")
+SOURCES_FILE = "skill-sources.json"
+
+CATALOG_CATEGORIES = ['public', 'private', 'user']
+CATALOG_INDEX_FILE = ".catalog-index.json"
+CATALOG_INDEX_VERSION = 3
+
+# Aproximación habitual para markdown/inglés: ~4 caracteres por token
+CHARS_PER_TOKEN = 4
+
+STORE_LATEST = "latest"
+STORE_HASH_LEN = 16
+
+SYNC_MANIFEST_FILE = ".sync-manifest.json"
+HASH_CACHE_FILE = ".hash-cache.json"
+# A partir de este tamaño los ficheros se hashean vía mmap en vez de por bloques
+MMAP_THRESHOLD = 4 << 20
+
+SYNC_JOURNAL_FILE = ".sync-journal.json"
+SYNC_LOCK_FILE = ".sync.lock"
+GENERATIONS_DIR = ".generations"
+# Dentro de cada generación: firma de la configuración de fuentes que la produjo
+GENERATION_INFO_FILE = ".generation.json"
+# Modo lazy: metadatos de todo el catálogo, ficheros sólo de los skills en uso
+LAZY_CATALOG_FILE = ".lazy-catalog.json"
+LAZY_CATALOG_VERSION = 1
+GENERATIONS_KEEP = 2
+
+LOCK_FILE = "skill-lock.json"
+LOCK_VERSION = 1
+
+LOAD_PLAN_FILE = "load-plan.json"
+LOAD_PLAN_LINKS_DIR = "load-plan"
+
+# Snapshots offline del catálogo: el manifiesto va siempre como primer miembro
+SNAPSHOT_MANIFEST = "MANIFEST.json"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FORMATS = ('tar.zst', 'tar.gz', 'zip')
+SNAPSHOT_IMPORT_DIR = "import"
+
+def estimate_tokens(size: int) -> int:
+    """Tokens aproximados para un contenido de `size` bytes"""
+    return (size + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def format_bytes(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 ** 2:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / 1024 ** 2:.1f} MB"
+
+def hash_file(path: str) -> str:
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        count('files_hashed')
+        count('bytes_hashed', size)
+        if size >= MMAP_THRESHOLD:
+            import mmap
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest()
+        h = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+        return h.hexdigest()
+
+def _hash_file_or_none(path: str) -> Optional[str]:
+    try:
+        return hash_file(path)
+    except OSError:
+        return None
+
+def tree_files(path: str) -> Dict[str, str]:
+    """Ficheros de un árbol → {ruta relativa con '/': ruta absoluta} (sin directorios ocultos)"""
+    files = {}
+    for root, dirs, names in os.walk(path):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in names:
+            full = os.path.join(root, name)
+            files[os.path.relpath(full, path).replace(os.sep, '/')] = full
+    return files
+
+def hash_tree(path: str) -> str:
+    """Hash de contenido de un árbol: rutas relativas ordenadas + sha256 de cada fichero"""
+    h = hashlib.sha256()
+    for rel, full in sorted(tree_files(path).items()):
+        h.update(f"{rel}\0{hash_file(full)}\n".encode())
+    return h.hexdigest()[:STORE_HASH_LEN]
+
+def temp_path(path: Path) -> Path:
+    """Temporal oculto junto a `path`, único por proceso e hilo (para publicar con rename)"""
+    return path.with_name(f".{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+
+def write_json_atomic(path: Path, data, **kwargs):
+    """Escribe JSON en un temporal y lo publica con rename (nunca queda a medias)"""
+    tmp = temp_path(path)
+    with open(tmp, 'w') as f:
+        json.dump(data, f, **kwargs)
+    os.replace(tmp, path)
+
+def copy_file(src, dst):
+    """shutil.copy2 que contabiliza los bytes copiados (copy_function para copytree)"""
+    shutil.copy2(src, dst)
+    if PROFILER.enabled:
+        count('files_copied')
+        count('bytes_copied', os.path.getsize(dst))
+
+def _link_or_copy(src, dst):
+    """copy_function para copytree: hardlink si el filesystem lo permite, copia si no"""
+    try:
+        os.link(src, dst)
+        count('links_created')
+    except OSError:
+        copy_file(src, dst)
+
+def read_config(path) -> dict:
+    """Lee un skill-config.json"""
+    with span('config.read'):
+        with open(path) as f:
+            return json.load(f)
+
+def write_config(path, config: dict):
+    """Escribe un skill-config.json"""
+    with span('config.write'):
+        with open(path, 'w') as f:
+            json.dump(config, f, indent=2)
+
+def check_workspace_name(name) -> str:
+    """Valida que un nombre de workspace sea un único componente de ruta dentro de workspaces/"""
+    if (not isinstance(name, str) or not name or name.startswith('.') or '\0' in name
+            or '/' in name or '\\' in name or Path(name).name != name):
+        raise ValueError(f"nombre de workspace no válido: {name!r} (un único componente de ruta, sin '/' ni '.' inicial)")
+    return name
+
+def pid_alive(pid) -> bool:
+    """¿Sigue vivo el proceso `pid`? Un pid desconocido se da por muerto"""
+    if not isinstance(pid, int) or pid <= 0:
+        return False
+    if os.name == 'nt':
+        # os.kill(pid, 0) terminaría el proceso en Windows, donde tampoco hay flock
+        return pid == os.getpid()
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def catalog_lock(method):
+    """Ejecuta un método del manager con el lock de publicación del catálogo tomado"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._sync_lock():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def _force_remove(func, path, _):
+    """onerror de rmtree: quita el sólo-lectura de las versiones del store y reintenta"""
+    os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+    func(path)
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zstandard no está instalado: usa tar.gz o zip, o 'pip install zstandard'")
+    return zstandard
+
+def write_snapshot(path: Path, fmt: str, members):
+    """Escribe un snapshot en streaming; `members` son (nombre, bytes | None, ruta | None)"""
+    import tarfile
+    import zipfile
+    if fmt == 'zip':
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for arcname, data, src in members:
+                if src is None:
+                    zf.writestr(arcname, data)
+                else:
+                    zf.write(src, arcname)
+        return
+    
+    def fill(tar):
+        import io
+        with tar:
+            for arcname, data, src in members:
+                info = tarfile.TarInfo(arcname)
+                if src is None:
+                    info.size, info.mtime = len(data), int(time.time())
+                    tar.addfile(info, io.BytesIO(data))
+                    continue
+                st = os.stat(src)
+                info.size, info.mtime, info.mode = st.st_size, int(st.st_mtime), st.st_mode & 0o777
+                with open(src, 'rb') as f:
+                    tar.addfile(info, f)
+    
+    with open(path, 'wb') as raw:
+        if fmt == 'tar.zst':
+            with _import_zstandard().ZstdCompressor().stream_writer(raw, closefd=False) as stream:
+                fill(tarfile.open(fileobj=stream, mode='w|'))
+        else:
+            fill(tarfile.open(fileobj=raw, mode='w|gz'))
+
+def snapshot_path_ok(rel: str) -> bool:
+    """Ruta relativa segura dentro de un snapshot: sin '', '.', '..', '\\' ni ser absoluta"""
+    return bool(rel) and '\\' not in rel and not {'', '.', '..'} & set(rel.split('/'))
+
+def iter_snapshot(path: Path):
+    """Recorre los ficheros de un snapshot en orden y en streaming → (nombre, fichero)"""
+    import tarfile
+    import zipfile
+    with open(path, 'rb') as raw:
+        magic = raw.read(4)
+        raw.seek(0)
+        if magic.startswith(b'PK'):
+            with zipfile.ZipFile(raw) as zf:
+                for info in zf.infolist():
+                    if not info.is_dir():
+                        with zf.open(info) as f:
+                            yield info.filename, f
+            return
+        
+        def members(tar):
+            with tar:
+                for member in tar:
+                    if member.isfile():
+                        yield member.name, tar.extractfile(member)
+        
+        if magic == b'\x28\xb5\x2f\xfd':
+            with _import_zstandard().ZstdDecompressor().stream_reader(raw) as stream:
+                yield from members(tarfile.open(fileobj=stream, mode='r|'))
+        else:
+            yield from members(tarfile.open(fileobj=raw, mode='r|*'))
+
+# ============================================================================
+# MOTOR DE REGLAS DE RECOMENDACIÓN
+# ============================================================================
+
+RULES_FILE = "skill-rules.json"
+RULE_DIMENSIONS = ('type', 'lang', 'db')
+_RULES_CACHE = {}
+
+class RuleEngine:
+    """Reglas de skill-rules.json compiladas en tablas de búsqueda indexadas.
+    
+    Cada regla es `{"category", "when": {"type"|"lang"|"db": [...] | "*"}, "skills", "weight"}`.
+    Las dimensiones de `when` se combinan con AND y los valores de una lista con OR;
+    "*" exige que la dimensión tenga algún valor y una regla sin `when` aplica siempre.
+    Al compilar se indexa (dimensión, valor) → reglas, así que evaluar sólo toca las
+    reglas candidatas, sin importar cuántos stacks haya definidos.
+    """
+    
+    def __init__(self, data: dict):
+        self.data = data
+        self.categories = list(data.get('categories', []))
+        self.rules = []
+        self.arity = []
+        self.always = []
+        self.index = {dim: {} for dim in RULE_DIMENSIONS}
+        
+        for rid, rule in enumerate(data.get('rules', [])):
+            when = rule.get('when') or {}
+            category = rule['category']
+            if category not in self.categories:
+                self.categories.append(category)
+            self.rules.append((category, tuple(rule.get('skills', [])), float(rule.get('weight', 1))))
+            self.arity.append(len(when))
+            if not when:
+                self.always.append(rid)
+            for dim, values in when.items():
+                if dim not in RULE_DIMENSIONS:
+                    raise ValueError(f"Regla {rid}: dimensión desconocida '{dim}'")
+                if isinstance(values, str):
+                    values = [values]
+                if '*' in values:
+                    values = ['*']
+                for v in values:
+                    self.index[dim].setdefault(v, []).append(rid)
+        
+        self.category_order = {c: i for i, c in enumerate(self.categories)}
+    
+    def matching_rules(self, project_type, language, database) -> List[int]:
+        """Ids de las reglas cuyas condiciones se cumplen todas"""
+        hits = {}
+        for dim, value in zip(RULE_DIMENSIONS, (project_type, language, database)):
+            if not value:
+                continue
+            table = self.index[dim]
+            for rid in table.get(value, ()):
+                hits[rid] = hits.get(rid, 0) + 1
+            for rid in table.get('*', ()):
+                hits[rid] = hits.get(rid, 0) + 1
+        matched = [rid for rid, n in hits.items() if n == self.arity[rid]]
+        return sorted(matched + self.always)
+    
+    def score(self, project_type, language, database) -> Dict[str, Dict[str, float]]:
+        """Acumula en un único pase el peso de cada skill por categoría (deduplicando)"""
+        scores = {}
+        for rid in self.matching_rules(project_type, language, database):
+            category, skills, weight = self.rules[rid]
+            bucket = scores.setdefault(category, {})
+            for s in skills:
+                bucket[s] = bucket.get(s, 0) + weight
+        return scores
+    
+    def suggest(self, project_type, language, database) -> Dict[str, List[str]]:
+        """Sugerencias por categoría, ordenadas por peso (empates en orden de aparición)"""
+        scores = self.score(project_type, language, database)
+        return {
+            category: sorted(scores[category], key=lambda s: -scores[category][s])
+            for category in sorted(scores, key=self.category_order.get)
+        }
+
+def load_rule_engine(candidates: List[Path]) -> RuleEngine:
+    """Carga y compila el primer fichero de reglas existente (cacheado por mtime/tamaño)"""
+    path = next((p for p in candidates if p.exists()), None)
+    if path is None:
+        return RuleEngine({})
+    st = path.stat()
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    engine = _RULES_CACHE.get(key)
+    if engine is None:
+        with open(path, encoding='utf-8') as f:
+            engine = RuleEngine(json.load(f))
+        _RULES_CACHE.clear()
+        _RULES_CACHE[key] = engine
+    return engine
+
+# ============================================================================
+# DETECCIÓN DEL STACK DE UN PROYECTO
+# ============================================================================
+
+LANGUAGE_EXTENSIONS = {
+    '.py': 'Python', '.go': 'Go',
+    '.js': 'JavaScript/TypeScript', '.ts': 'JavaScript/TypeScript',
+    '.tsx': 'JavaScript/TypeScript', '.jsx': 'JavaScript/TypeScript',
+    '.dart': 'Dart/Flutter', '.rs': 'Rust',
+    '.java': 'Java/Kotlin', '.kt': 'Java/Kotlin',
+    '.cs': 'C#/.NET', '.c': 'C/C++', '.cpp': 'C/C++', '.h': 'C/C++',
+    '.swift': 'Swift/SwiftUI', '.rb': 'Ruby', '.php': 'PHP',
+    '.ex': 'Elixir', '.exs': 'Elixir', '.scala': 'Scala',
+    '.jl': 'Julia', '.hs': 'Haskell', '.sol': 'Blockchain/Web3',
+}
+LANG_MIN_SHARE = 0.05       # por debajo, el lenguaje es una traza (scripts sueltos)
+STACK_MIN_SHARE = 0.20      # a partir de aquí, un lenguaje secundario es otro stack
+LANG_FILE_BYTES_CAP = 256 * 1024
+
+class LanguageStats:
+    """Ficheros y bytes por lenguaje de un proyecto, con cuotas ponderadas por tamaño.
+    
+    El peso de cada fichero es su tamaño (el stat que ya trae el recorrido con
+    scandir, sin leer el fichero) con un tope de LANG_FILE_BYTES_CAP, para que un
+    bundle o un fichero generado enorme no decida el lenguaje. Un script suelto en
+    un repositorio grande se queda en traza.
+    """
+    
+    def __init__(self):
+        self.files = {}
+        self.bytes = {}
+        self.weight = {}
+    
+    def add(self, lang: str, size: int):
+        self.files[lang] = self.files.get(lang, 0) + 1
+        self.bytes[lang] = self.bytes.get(lang, 0) + size
+        self.weight[lang] = self.weight.get(lang, 0) + min(max(size, 1), LANG_FILE_BYTES_CAP)
+    
+    def shares(self) -> List[tuple]:
+        """[(lenguaje, cuota)] de mayor a menor"""
+        total = sum(self.weight.values())
+        ranked = sorted(self.weight, key=lambda lang: (-self.weight[lang], -self.files[lang], lang))
+        return [(lang, self.weight[lang] / total) for lang in ranked]
+    
+    def significant(self, min_share: float = LANG_MIN_SHARE) -> List[str]:
+        return [lang for lang, share in self.shares() if share >= min_share]
+    
+    @property
+    def primary(self) -> Optional[str]:
+        langs = self.significant()
+        return langs[0] if langs else None
+    
+    @property
+    def secondary(self) -> Optional[str]:
+        langs = self.significant()
+        return langs[1] if len(langs) > 1 else None
+    
+    def describe(self) -> str:
+        """'JavaScript/TypeScript 82% · Python 15% (trazas: Go)'"""
+        main, traces = [], []
+        for lang, share in self.shares():
+            if share >= LANG_MIN_SHARE:
+                main.append(f"{lang} {share:.0%}")
+            else:
+                traces.append(lang)
+        return ' · '.join(main) + (f" (trazas: {', '.join(traces)})" if traces else '')
+    
+    def merge(self, other: 'LanguageStats'):
+        for lang, n in other.files.items():
+            self.files[lang] = self.files.get(lang, 0) + n
+            self.bytes[lang] = self.bytes.get(lang, 0) + other.bytes[lang]
+            self.weight[lang] = self.weight.get(lang, 0) + other.weight[lang]
+    
+    def to_dict(self) -> Dict[str, dict]:
+        return {lang: {'files': self.files[lang], 'bytes': self.bytes[lang], 'share': round(share, 3)}
+                for lang, share in self.shares()}
+
+SUBPROJECT_MANIFESTS = {'package.json', 'go.mod', 'pyproject.toml', 'pubspec.yaml', 'Cargo.toml'}
+MANIFEST_FILES = {
+    'package.json', 'pubspec.yaml', 'go.mod', 'requirements.txt',
+    'pyproject.toml', 'Cargo.toml', 'Gemfile', 'composer.json',
+    'build.gradle', 'pom.xml', 'Podfile', 'go.sum',
+}
+SCAN_SKIP_DIRS = {'.git', '.agent', '.agents', 'node_modules', 'vendor', '.venv',
+                  'venv', '__pycache__', '.dart_tool', 'build', 'dist',
+                  '.idea', '.vscode', 'out_', '.DS_Store'}
+DB_PATTERNS = {
+    'Supabase': ['supabase'],
+    'PostgreSQL': ['postgres', 'pgx', 'psycopg', 'pg ', 'postgresql'],
+    'MongoDB/NoSQL': ['mongodb', 'mongoose', 'mongoclient'],
+    'MySQL': ['mysql', 'mariadb'],
+    'SQLite': ['sqlite', 'sqlite3'],
+    'Redis': ['redis', 'ioredis'],
+    'Firebase': ['firebase', 'firestore'],
+    'Neon Postgres': ['neon', '@neondatabase'],
+    'Google Sheets': ['gspread', 'google-sheets', 'googleapis.com/auth/spreadsheets', 'sheets'],
+    'Elasticsearch': ['elasticsearch', 'elastic'],
+    'DynamoDB': ['dynamodb', 'aws-sdk'],
+}
+
+class ProjectScan:
+    """Lo que encontró el recorrido bajo una raíz: lenguajes, nombres de fichero y manifiestos"""
+    
+    def __init__(self, manifest: Optional[str] = None):
+        self.manifest = manifest          # manifiesto que la convierte en sub-proyecto
+        self.langs = LanguageStats()
+        self.files = set()
+        self.manifests = []               # (nombre, contenido en minúsculas)
+    
+    def merge(self, other: 'ProjectScan'):
+        self.langs.merge(other.langs)
+        self.files |= other.files
+        self.manifests += other.manifests
+
+def scan_project(path: Path) -> Dict[str, ProjectScan]:
+    """Recorre el proyecto una sola vez y reparte cada fichero a su sub-proyecto.
+    
+    Una raíz de sub-proyecto es un directorio con alguno de SUBPROJECT_MANIFESTS y
+    cada fichero cuenta para la raíz más cercana por encima ('.' si no hay otra).
+    Las entradas de un directorio se leen antes de repartirlas, para saber primero
+    si el propio directorio es una raíz. El tamaño sale del stat de scandir.
+    """
+    top = str(path)
+    scans = {}
+    pending = [(top, '.')]
+    while pending:
+        dirpath, root = pending.pop()
+        try:
+            with os.scandir(dirpath) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        manifest = next((e.name for e in entries if e.name in SUBPROJECT_MANIFESTS), None)
+        if manifest or dirpath == top:
+            root = '.' if dirpath == top else Path(os.path.relpath(dirpath, top)).as_posix()
+            scans[root] = ProjectScan(manifest)
+        scan = scans[root]
+        for entry in entries:
+            fname = entry.name
+            if entry.is_dir():
+                if not entry.is_symlink() and fname not in SCAN_SKIP_DIRS and not fname.startswith('out_'):
+                    pending.append((entry.path, root))
+                continue
+            count('files_scanned')
+            
+            # Lenguaje por extensión, ponderado por tamaño
+            lang = LANGUAGE_EXTENSIONS.get(os.path.splitext(fname)[1].lower())
+            if lang:
+                try:
+                    scan.langs.add(lang, entry.stat().st_size)
+                except OSError:
+                    pass
+            
+            # Detectar archivos clave
+            scan.files.add(fname)
+            
+            # Leer manifiestos para dependencias
+            if fname in MANIFEST_FILES:
+                try:
+                    with open(entry.path, 'r', errors='ignore') as f:
+                        scan.manifests.append((fname, f.read().lower()))
+                except:
+                    pass
+    return scans
+
+def detect_stack(scan: ProjectScan) -> dict:
+    """Lenguajes (con cuotas), tipo de proyecto y base de datos de un ProjectScan"""
+    langs = scan.langs
+    detected_files = scan.files
+    file_contents_to_scan = scan.manifests
+    detected_langs = set(langs.significant())
+    primary_lang = langs.primary
+    
+    # ── Detectar tipo de proyecto ──
+    detected_type = None
+    if 'Dockerfile' in detected_files or 'docker-compose.yml' in detected_files or 'docker-compose.yaml' in detected_files:
+        if 'docker-compose.yml' in detected_files or 'docker-compose.yaml' in detected_files:
+            detected_type = 'Microservicios'
+        else:
+            detected_type = 'API Backend'
+    if 'pubspec.yaml' in detected_files:
+        detected_type = 'Mobile App'
+    if 'package.json' in detected_files and not detected_type:
+        # Revisar si es frontend o fullstack
+        for fname, content in file_contents_to_scan:
+            if fname == 'package.json':
+                if any(fw in content for fw in ['react', 'vue', 'angular', 'svelte', 'next', 'nuxt']):
+                    if 'Dart/Flutter' in detected_langs or 'Python' in detected_langs or 'Go' in detected_langs:
+                        detected_type = 'Full-Stack'
+                    else:
+                        detected_type = 'Web Frontend'
+                elif any(bk in content for bk in ['express', 'fastify', 'koa', 'nest', 'hono']):
+                    detected_type = 'API Backend'
+    if not detected_type:
+        if '.github' in detected_files or 'terraform' in detected_files:
+            detected_type = 'DevOps/Infra'
+        elif any(ext == '.sol' for ext in [Path(f).suffix for f in detected_files]):
+            detected_type = 'Blockchain/Web3'
+        elif primary_lang == 'Python':
+            # Revisar si es AI/ML o CLI
+            for fname, content in file_contents_to_scan:
+                if any(ml in content for ml in ['torch', 'tensorflow', 'sklearn', 'langchain', 'openai', 'transformers']):
+                    detected_type = 'AI/ML'
+                    break
+            if not detected_type:
+                detected_type = 'CLI/Automatización'
+        elif primary_lang == 'Go':
+            detected_type = 'API Backend'
+    
+    # ── Detectar base de datos ──
+    detected_db = None
+    all_content = ' '.join(c for _, c in file_contents_to_scan)
+    for db_name, patterns in DB_PATTERNS.items():
+        if any(p in all_content for p in patterns):
+            detected_db = db_name
+            break
+    
+    # Otros lenguajes con peso propio: cada uno es un stack con sus skills base
+    shares = dict(langs.shares())
+    stacks = [lang for lang in list(shares)[1:] if shares[lang] >= STACK_MIN_SHARE]
+    return {'languages': sorted(detected_langs), 'lang': primary_lang, 'secondary_lang': langs.secondary,
+            'language_shares': langs.to_dict(),
+            'stacks': [primary_lang] + stacks if primary_lang else [],
+            'type': detected_type, 'db': detected_db}
+
+# ============================================================================
+# CO-OCURRENCIA DE SKILLS ENTRE WORKSPACES
+# ============================================================================
+
+COOCCURRENCE_FILE = ".usage-cooccurrence.json"
+COOCCURRENCE_VERSION = 1
+STACK_PREFIX = "stack:"
+
+def stack_features(stack: Optional[dict]) -> List[str]:
+    """Convierte {'type', 'lang', 'db'} en items 'stack:type=...' de la cesta"""
+    if not stack:
+        return []
+    return [f"{STACK_PREFIX}{k}={v}" for k, v in sorted(stack.items()) if v]
+
+class CooccurrenceIndex:
+    """Matriz dispersa de co-ocurrencias (skill × skill y skill × stack).
+    
+    Cada workspace aporta una "cesta" con sus `enabled_skills` y los rasgos de su
+    stack. Los items se numeran en un vocabulario y sólo se guardan los pares con
+    recuento > 0. En disco el triángulo superior va como un array plano
+    [i, j, n, ...]; las cestas se recuerdan por workspace junto con la firma
+    (mtime, tamaño) de su skill-config.json, así que `refresh` sólo resta y suma
+    las cestas de los workspaces que cambiaron.
+    """
+    
+    def __init__(self):
+        self.vocab = []
+        self.ids = {}
+        self.counts = []
+        self.pairs = {}
+        self.baskets = {}
+    
+    def _id(self, item: str) -> int:
+        i = self.ids.get(item)
+        if i is None:
+            i = self.ids[item] = len(self.vocab)
+            self.vocab.append(item)
+            self.counts.append(0)
+        return i
+    
+    def _apply(self, basket: List[int], delta: int):
+        for a in basket:
+            self.counts[a] += delta
+            row = self.pairs.setdefault(a, {})
+            for b in basket:
+                if a != b:
+                    n = row.get(b, 0) + delta
+                    if n:
+                        row[b] = n
+                    else:
+                        row.pop(b, None)
+    
+    @classmethod
+    def load(cls, path: Path) -> 'CooccurrenceIndex':
+        idx = cls()
+        if not path.exists():
+            return idx
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data.get('version') != COOCCURRENCE_VERSION:
+                return idx
+            idx.vocab = data['vocab']
+            idx.ids = {item: i for i, item in enumerate(idx.vocab)}
+            idx.counts = data['counts']
+            flat = data['pairs']
+            for k in range(0, len(flat), 3):
+                a, b, n = flat[k], flat[k + 1], flat[k + 2]
+                idx.pairs.setdefault(a, {})[b] = n
+                idx.pairs.setdefault(b, {})[a] = n
+            idx.baskets = {ws: (tuple(v['sig']), v['items']) for ws, v in data['workspaces'].items()}
+        except Exception:
+            return cls()
+        return idx
+    
+    def save(self, path: Path):
+        flat = []
+        for a, row in self.pairs.items():
+            for b, n in row.items():
+                if a < b:
+                    flat.extend((a, b, n))
+        data = {
+            'version': COOCCURRENCE_VERSION,
+            'vocab': self.vocab,
+            'counts': self.counts,
+            'pairs': flat,
+            'workspaces': {ws: {'sig': list(sig), 'items': items} for ws, (sig, items) in self.baskets.items()},
+        }
+        write_json_atomic(path, data, separators=(',', ':'))
+    
+    def refresh(self, workspaces_dir: Path) -> bool:
+        """Sincroniza las cestas con los skill-config.json actuales; True si hubo cambios"""
+        seen = set()
+        changed = False
+        if workspaces_dir.is_dir():
+            with os.scandir(workspaces_dir) as it:
+                for entry in it:
+                    if entry.name.startswith('.') or not entry.is_dir():
+                        continue
+                    cfg = os.path.join(entry.path, "skill-config.json")
+                    try:
+                        st = os.stat(cfg)
+                    except OSError:
+                        continue
+                    seen.add(entry.name)
+                    sig = (st.st_mtime_ns, st.st_size)
+                    prev = self.baskets.get(entry.name)
+                    if prev and prev[0] == sig:
+                        continue
+                    try:
+                        c = read_config(cfg)
+                    except Exception:
+                        continue
+                    items = list(dict.fromkeys(c.get('enabled_skills', []))) + stack_features(c.get('stack'))
+                    basket = [self._id(item) for item in items]
+                    if prev:
+                        self._apply(prev[1], -1)
+                    self._apply(basket, +1)
+                    self.baskets[entry.name] = (sig, basket)
+                    changed = True
+        for ws in set(self.baskets) - seen:
+            self._apply(self.baskets.pop(ws)[1], -1)
+            changed = True
+        return changed
+    
+    def recommend(self, items: List[str], exclude: Set[str], limit: int = 8,
+                  min_support: int = 2) -> List[tuple]:
+        """Skills que más co-ocurren con `items` → [(skill, score, soporte)]
+        
+        El score suma la confianza P(skill | item) de cada item de la cesta.
+        """
+        scores = {}
+        support = {}
+        for item in items:
+            a = self.ids.get(item)
+            if a is None or not self.counts[a]:
+                continue
+            for b, n in self.pairs.get(a, {}).items():
+                scores[b] = scores.get(b, 0.0) + n / self.counts[a]
+                support[b] = max(support.get(b, 0), n)
+        ranked = []
+        for b, score in scores.items():
+            skill = self.vocab[b]
+            if skill.startswith(STACK_PREFIX) or skill in exclude or support[b] < min_support:
+                continue
+            ranked.append((skill, score, support[b]))
+        ranked.sort(key=lambda r: (-r[1], r[0]))
+        return ranked[:limit]
+
+# ============================================================================
+# GRAFO DE DEPENDENCIAS ENTRE SKILLS
+# ============================================================================
+
+FRONTMATTER_LIST_KEYS = ('requires', 'conflicts')
+
+def parse_frontmatter(text: str) -> dict:
+    """Claves simples del frontmatter YAML de un SKILL.md (sin depender de PyYAML).
+    
+    Las listas admiten `[a, b]`, `a, b` o un bloque de líneas `- a`.
+    """
+    if not text.startswith('---'):
+        return {}
+    parts = text.split('---', 2)
+    if len(parts) < 3:
+        return {}
+    data = {}
+    key = None
+    for line in parts[1].splitlines():
+        stripped = line.strip()
+        if stripped.startswith('- ') and key:
+            if not isinstance(data.get(key), list):
+                data[key] = []
+            data[key].append(stripped[2:].strip().strip('"').strip("'"))
+            continue
+        if ':' not in line or line[:1].isspace():
+            continue
+        key, value = line.split(':', 1)
+        key, value = key.strip(), value.strip()
+        if value.startswith('[') and value.endswith(']'):
+            value = [v.strip().strip('"').strip("'") for v in value[1:-1].split(',') if v.strip()]
+        else:
+            value = value.strip('"').strip("'")
+        data[key] = value
+    for key in FRONTMATTER_LIST_KEYS:
+        value = data.get(key)
+        if isinstance(value, str):
+            data[key] = [v.strip() for v in value.split(',') if v.strip()]
+    return data
+
+class SkillGraph:
+    """Grafo `requires`/`conflicts` construido una vez desde el índice del catálogo.
+    
+    Los conflictos son simétricos. El cierre transitivo de cada skill se memoiza
+    (y con él el de todas sus dependencias), así que habilitar un skill en un
+    workspace con muchos otros sólo recorre lo que aún no se había resuelto.
+    """
+    
+    def __init__(self, index: Dict[str, dict]):
+        self.index = index
+        self.requires = {}
+        self.conflicts = {}
+        for name, entry in index.items():
+            if entry.get('requires'):
+                self.requires[name] = entry['requires']
+            for other in entry.get('conflicts', []):
+                self.conflicts.setdefault(name, set()).add(other)
+                self.conflicts.setdefault(other, set()).add(name)
+        self._closure = {}
+        self._dependents = None
+    
+    def closure(self, skill: str) -> tuple:
+        """El skill y todas sus dependencias, dependencias primero"""
+        return self._visit(skill, ())
+    
+    def _visit(self, skill: str, chain: tuple) -> tuple:
+        cached = self._closure.get(skill)
+        if cached is not None:
+            return cached
+        if skill in chain:
+            raise ValueError(f"dependencia cíclica {' → '.join(chain + (skill,))}")
+        order = {}
+        for dep in self.requires.get(skill, ()):
+            for name in self._visit(dep, chain + (skill,)):
+                order[name] = True
+        order[skill] = True
+        result = tuple(order)
+        self._closure[skill] = result
+        return result
+    
+    def conflicts_among(self, skills) -> List[tuple]:
+        """Pares (a, b) en conflicto dentro de un conjunto de skills"""
+        present = set(skills)
+        return sorted({tuple(sorted((a, b))) for a in present for b in self.conflicts.get(a, ()) if b in present})
+    
+    def dependents(self, skill: str) -> Set[str]:
+        """Skills que requieren directamente a `skill`"""
+        if self._dependents is None:
+            reverse = {}
+            for name, deps in self.requires.items():
+                for dep in deps:
+                    reverse.setdefault(dep, set()).add(name)
+            self._dependents = reverse
+        return self._dependents.get(skill, set())
+
+# ============================================================================
+# SKILLS CASI DUPLICADOS (MinHash + LSH)
+# ============================================================================
+
+MINHASH_FILE = ".minhash-index.json"
+MINHASH_VERSION = 1
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16
+SHINGLE_WORDS = 3
+DEDUPE_THRESHOLD = 0.5
+LSH_MAX_PAIRWISE = 16
+_WORD_RE = re.compile(r"\w+")
+
+def minhash_signature(text: str) -> List[int]:
+    """Firma MinHash de los shingles de SHINGLE_WORDS palabras de un texto.
+    
+    One Permutation Hashing: un único hash de 64 bits por shingle, repartido en
+    MINHASH_PERMUTATIONS cubetas (el mínimo de cada una es un valor de la firma);
+    las cubetas vacías se rellenan rotando desde la siguiente no vacía. Cuesta un
+    pase sobre los shingles en lugar de uno por permutación.
+    """
+    import zlib
+    words = _WORD_RE.findall(text.lower())
+    k = MINHASH_PERMUTATIONS
+    sig = [None] * k
+    for i in range(max(1, len(words) - SHINGLE_WORDS + 1)):
+        g = ' '.join(words[i:i + SHINGLE_WORDS]).encode()
+        h = zlib.crc32(g) << 32 | zlib.crc32(g, 0x9E3779B9)
+        b, v = h % k, h // k
+        if sig[b] is None or v < sig[b]:
+            sig[b] = v
+    if None in sig:
+        filled = [i for i, v in enumerate(sig) if v is not None]
+        if not filled:
+            return [0] * k
+        for i in range(k):
+            if sig[i] is None:
+                j = next((f for f in filled if f > i), filled[0])
+                sig[i] = sig[j] + ((j - i) % k) * (1 << 58)
+    return sig
+
+class MinHashIndex:
+    """Firmas MinHash de los SKILL.md del catálogo y agrupación por LSH.
+    
+    Cada firma se guarda junto a la `sig` de su entrada en el índice del catálogo,
+    así que `refresh` sólo vuelve a leer los skills nuevos o modificados. Las firmas
+    se cortan en MINHASH_BANDS bandas: dos skills son candidatos si coinciden en
+    alguna, y se agrupan si la similitud estimada (fracción de mínimos iguales)
+    supera el umbral. Coste ~lineal en el número de skills.
+    """
+    
+    def __init__(self):
+        self.skills = {}
+    
+    @classmethod
+    def load(cls, path: Path) -> 'MinHashIndex':
+        idx = cls()
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data.get('version') == MINHASH_VERSION:
+                idx.skills = {name: (v['sig'], v['minhash']) for name, v in data['skills'].items()}
+        except Exception:
+            pass
+        return idx
+    
+    def save(self, path: Path):
+        data = {
+            'version': MINHASH_VERSION,
+            'skills': {name: {'sig': sig, 'minhash': mh} for name, (sig, mh) in self.skills.items()},
+        }
+        write_json_atomic(path, data, separators=(',', ':'))
+    
+    def refresh(self, skills_dir: Path, index: Dict[str, dict]) -> bool:
+        """Sincroniza las firmas con el índice del catálogo; True si hubo cambios"""
+        changed = False
+        for name in set(self.skills) - set(index):
+            del self.skills[name]
+            changed = True
+        for name, entry in index.items():
+            sig = [entry['category']] + entry.get('sig', [])
+            prev = self.skills.get(name)
+            if prev and prev[0] == sig:
+                continue
+            base = Path(entry['path']) if entry.get('lazy') else skills_dir / entry['category'] / name
+            try:
+                with open(base / "SKILL.md", encoding='utf-8', errors='replace') as f:
+                    text = f.read()
+            except OSError:
+                continue
+            count('files_hashed')
+            self.skills[name] = (sig, minhash_signature(text))
+            changed = True
+        return changed
+    
+    def clusters(self, threshold: float = DEDUPE_THRESHOLD) -> List[dict]:
+        """Grupos de skills casi duplicados → [{'skills': [...], 'similarity': min. estimada}]"""
+        rows = MINHASH_PERMUTATIONS // MINHASH_BANDS
+        buckets = {}
+        for name, (_, mh) in self.skills.items():
+            for band in range(MINHASH_BANDS):
+                key = (band, tuple(mh[band * rows:(band + 1) * rows]))
+                buckets.setdefault(key, []).append(name)
+        
+        parent = {}
+        
+        def find(x):
+            while parent.get(x, x) != x:
+                parent[x] = parent.get(parent[x], parent[x])
+                x = parent[x]
+            return x
+        
+        similarity = {}
+        for members in buckets.values():
+            # Cubetas grandes (p. ej. skills generados de una misma plantilla): cada
+            # miembro se compara sólo con el primero, para no caer en O(n²)
+            heads = members if len(members) <= LSH_MAX_PAIRWISE else members[:1]
+            for i, a in enumerate(heads):
+                for b in members[i + 1:]:
+                    ra, rb = find(a), find(b)
+                    if ra == rb:
+                        continue
+                    ma, mb = self.skills[a][1], self.skills[b][1]
+                    sim = sum(x == y for x, y in zip(ma, mb)) / MINHASH_PERMUTATIONS
+                    if sim >= threshold:
+                        similarity[(a, b) if a < b else (b, a)] = sim
+                        parent[max(ra, rb)] = min(ra, rb)
+        
+        groups = {}
+        for (a, b), sim in similarity.items():
+            g = groups.setdefault(find(a), {'skills': set(), 'similarity': 1.0})
+            g['skills'].update((a, b))
+            g['similarity'] = min(g['similarity'], sim)
+        result = []
+        for g in groups.values():
+            result.append({'skills': sorted(g['skills']), 'similarity': round(g['similarity'], 2)})
+        result.sort(key=lambda c: (-len(c['skills']), c['skills']))
+        return result
+
+FUZZY_SUGGESTIONS = 3
+FUZZY_CANDIDATES = 24
+FUZZY_MIN_DICE = 0.5
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Distancia de Damerau-Levenshtein (transposiciones adyacentes); corta en limit + 1"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2, prev = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            if prev2 is not None and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+class NameIndex:
+    """Índice de trigramas sobre los nombres del catálogo, para "¿quisiste decir?".
+    
+    Cada nombre se trocea en trigramas (con relleno, así pesan los inicios) y se
+    indexa en listas invertidas. Una consulta cuenta trigramas compartidos sólo con
+    los nombres que tienen alguno, se queda con los FUZZY_CANDIDATES de mayor
+    coeficiente de Dice y los reordena por distancia de edición. La lista ordenada
+    de nombres sirve además para completar por prefijo con bisect.
+    """
+    
+    def __init__(self, names):
+        self.names = sorted(set(names))
+        self._sizes = []
+        self._postings = {}
+        for i, name in enumerate(self.names):
+            grams = self.trigrams(name)
+            self._sizes.append(len(grams))
+            for g in grams:
+                self._postings.setdefault(g, []).append(i)
+    
+    @staticmethod
+    def trigrams(name: str) -> Set[str]:
+        padded = f"  {name.lower()} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+    
+    def __contains__(self, name: str) -> bool:
+        i = bisect.bisect_left(self.names, name)
+        return i < len(self.names) and self.names[i] == name
+    
+    def complete(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Nombres que empiezan por `prefix`, en orden alfabético"""
+        start = bisect.bisect_left(self.names, prefix)
+        end = bisect.bisect_left(self.names, prefix + '\U0010ffff', start)
+        return self.names[start:end if limit is None else min(end, start + limit)]
+    
+    def suggest(self, name: str, limit: int = FUZZY_SUGGESTIONS) -> List[str]:
+        """Los nombres más parecidos a `name` (vacío si ninguno se parece lo suficiente)"""
+        query = name.lower()
+        grams = self.trigrams(query)
+        shared = {}
+        for g in grams:
+            for i in self._postings.get(g, ()):
+                shared[i] = shared.get(i, 0) + 1
+        dice = {i: 2 * n / (len(grams) + self._sizes[i]) for i, n in shared.items()}
+        candidates = sorted(dice, key=dice.get, reverse=True)[:FUZZY_CANDIDATES]
+        limit_edits = max(1, len(query) // 3)
+        ranked = []
+        for i in candidates:
+            candidate = self.names[i]
+            dist = edit_distance(query, candidate.lower(), limit_edits)
+            # Cerca en edición (erratas) o con muchos trigramas en común (prefijos, palabras movidas)
+            if dist <= limit_edits or dice[i] >= FUZZY_MIN_DICE:
+                ranked.append((dist, -dice[i], candidate))
+        ranked.sort()
+        return [candidate for _, _, candidate in ranked[:limit]]
+
+# ============================================================================
+# AUTOCOMPLETADO DE SHELL (bash, zsh, fish)
+# ============================================================================
+
+COMPLETION_DIR = ".completion"
+COMPLETION_SHELLS = ('bash', 'zsh', 'fish')
+COMPLETION_KINDS = {'workspace': 'workspaces', 'skill': 'skills', 'skills': 'skills'}
+
+def completion_spec(parser: 'argparse.ArgumentParser') -> Dict[str, dict]:
+    """Qué completar en cada posición de cada comando, sacado del propio parser.
+    
+    {comando: {'args': [tipo por posición], 'repeat': bool, 'options': [...]}}; el
+    tipo es 'workspaces', 'skills', una lista de palabras (subcomandos o choices) o
+    None. Los subcomandos anidados aparecen como 'store ingest'.
+    """
+    import argparse
+    spec = {}
+    
+    def walk(p, key):
+        entry = {'args': [], 'repeat': False, 'nested': False, 'options': [], 'values': []}
+        for action in p._actions:
+            if isinstance(action, argparse._SubParsersAction):
+                entry['args'].append(sorted(action.choices))
+                entry['nested'] = bool(key)
+                for name, child in action.choices.items():
+                    walk(child, f"{key} {name}".strip())
+            elif action.option_strings:
+                if '-h' in action.option_strings:
+                    continue
+                entry['options'].extend(action.option_strings)
+                if action.nargs != 0:
+                    entry['values'].extend(action.option_strings)
+            else:
+                entry['args'].append(sorted(action.choices) if action.choices
+                                     else COMPLETION_KINDS.get(action.dest))
+                entry['repeat'] = action.nargs in ('*', '+')
+        spec[key] = entry
+    
+    walk(parser, '')
+    return spec
+
+def _completion_cases(spec: Dict[str, dict], kind_of, words_of) -> List[tuple]:
+    """(patrones 'comando/posición', acción) agrupados por acción"""
+    groups = {}
+    for key, entry in spec.items():
+        for pos, kind in enumerate(entry['args']):
+            if kind is None:
+                continue
+            pattern = f"{key}/{'*' if entry['repeat'] and pos == len(entry['args']) - 1 else pos}"
+            action = words_of(kind) if isinstance(kind, list) else kind_of(kind)
+            groups.setdefault(action, []).append(pattern)
+    return [(patterns, action) for action, patterns in groups.items()]
+
+_COMPLETION_ROOT_SH = '''_wsm_root() {
+    local d=$PWD i
+    for i in 0 1 2 3 4 5; do
+        if [[ -d $d/.agent || -d $d/workspaces ]]; then REPLY=$d; return; fi
+        if [[ ${d##*/} == workspaces ]]; then REPLY=${d%%/*}; return; fi
+        [[ -z $d || $d == / ]] && break
+        d=${d%%/*}
+    done
+    REPLY=%(fallback)s
+}
+
+_wsm_parse() {
+    # Comando (p. ej. 'store ingest') y posición del argumento que se está escribiendo
+    local w nested=' %(nested)s ' skip=
+    _wsm_cmd= _wsm_pos=0
+    for w in "$@"; do
+        if [[ -n $skip ]]; then skip=; continue; fi
+        case $w in
+            %(values)s) skip=1; continue ;;
+            -*) continue ;;
+        esac
+        if [[ -z $_wsm_cmd ]]; then _wsm_cmd=$w
+        elif [[ $_wsm_pos == 0 && $nested == *" $_wsm_cmd "* ]]; then _wsm_cmd="$_wsm_cmd $w"
+        else ((_wsm_pos++))
+        fi
+    done
+}
+
+_wsm_kind() {
+    REPLY=
+    case "$_wsm_cmd/$_wsm_pos" in
+%(cases)s
+    esac
+}
+
+_wsm_options() {
+    case "$_wsm_cmd" in
+%(options)s
+    esac
+}
+'''
+
+_COMPLETION_BASH = '''# wsm: autocompletado para bash (generado por 'wsm completion bash')
+# Lee los nombres de <proyecto>/.agent/%(dir)s/ sin arrancar Python.
+%(common)s
+_wsm() {
+    local cur=${COMP_WORDS[COMP_CWORD]} REPLY _wsm_cmd _wsm_pos
+    _wsm_parse "${COMP_WORDS[@]:1:COMP_CWORD-1}"
+    if [[ $cur == -* ]]; then
+        _wsm_options
+        COMPREPLY=($(compgen -W "$REPLY" -- "$cur"))
+        return
+    fi
+    _wsm_kind
+    case $REPLY in
+        '') return ;;
+        =*) COMPREPLY=($(compgen -W "${REPLY#=}" -- "$cur")); return ;;
+    esac
+    local kind=$REPLY
+    _wsm_root
+    local f="$REPLY/.agent/%(dir)s/$kind"
+    [[ -r $f ]] && COMPREPLY=($(compgen -W "$(< "$f")" -- "$cur"))
+}
+complete -o default -F _wsm wsm
+'''
+
+_COMPLETION_ZSH = '''#compdef wsm
+# wsm: autocompletado para zsh (generado por 'wsm completion zsh')
+# Lee los nombres de <proyecto>/.agent/%(dir)s/ sin arrancar Python.
+%(common)s
+_wsm() {
+    local cur=${words[CURRENT]} REPLY _wsm_cmd _wsm_pos
+    _wsm_parse "${(@)words[2,CURRENT-1]}"
+    if [[ $cur == -* ]]; then
+        _wsm_options
+        compadd -- ${=REPLY}
+        return
+    fi
+    _wsm_kind
+    case $REPLY in
+        '') _files; return ;;
+        =*) compadd -- ${=REPLY#=}; return ;;
+    esac
+    local kind=$REPLY
+    _wsm_root
+    local f="$REPLY/.agent/%(dir)s/$kind"
+    [[ -r $f ]] && compadd -- ${(f)"$(< $f)"}
+}
+compdef _wsm wsm
+'''
+
+_COMPLETION_FISH = '''# wsm: autocompletado para fish (generado por 'wsm completion fish')
+# Lee los nombres de <proyecto>/.agent/%(dir)s/ sin arrancar Python.
+function __wsm_root
+    set -l d $PWD
+    for i in 0 1 2 3 4 5
+        if test -d $d/.agent -o -d $d/workspaces
+            echo $d; return
+        end
+        if test (basename $d) = workspaces
+            dirname $d; return
+        end
+        test $d = / ; and break
+        set d (dirname $d)
+    end
+    echo %(fallback)s
+end
+
+function __wsm_parse
+    set -g __wsm_cmd ''
+    set -g __wsm_pos 0
+    set -l skip 0
+    for w in (commandline -opc)[2..-1]
+        if test $skip = 1
+            set skip 0; continue
+        end
+        if contains -- $w %(values)s
+            set skip 1; continue
+        end
+        string match -q -- '-*' $w; and continue
+        if test -z "$__wsm_cmd"
+            set __wsm_cmd $w
+        else if test $__wsm_pos = 0; and contains -- $__wsm_cmd %(nested)s
+            set __wsm_cmd "$__wsm_cmd $w"
+        else
+            set __wsm_pos (math $__wsm_pos + 1)
+        end
+    end
+end
+
+function __wsm_complete
+    __wsm_parse
+    set -l kind
+    switch "$__wsm_cmd/$__wsm_pos"
+%(cases)s
+    end
+    switch "$kind"
+        case ''
+            return 1
+        case '=*'
+            string split ' ' -- (string sub -s 2 -- $kind)
+        case '*'
+            set -l f (__wsm_root)/.agent/%(dir)s/$kind
+            test -r $f; and cat $f
+    end
+end
+
+function __wsm_options
+    __wsm_parse
+    switch "$__wsm_cmd"
+%(options)s
+    end
+end
+
+complete -c wsm -f -a '(__wsm_complete)'
+complete -c wsm -f -n 'string match -q -- "-*" (commandline -ct)' -a '(__wsm_options)'
+'''
+
+def render_completion(shell: str, spec: Dict[str, dict], fallback: Path) -> str:
+    """Script de autocompletado para `shell` a partir de completion_spec()"""
+    nested = sorted(key for key, entry in spec.items() if entry['nested'])
+    values = sorted({opt for entry in spec.values() for opt in entry['values']})
+    # Las opciones globales (--json...) van antes del comando, las demás después
+    options = [(key, ' '.join(entry['options'])) for key, entry in spec.items() if entry['options']]
+    
+    if shell == 'fish':
+        q = lambda s: "'" + s.replace("\\", "\\\\").replace("'", "\\'") + "'"
+        cases = '\n'.join(f"        case {' '.join(q(p) for p in patterns)}\n            set kind {q(action)}"
+                          for patterns, action in _completion_cases(
+                              spec, lambda kind: kind, lambda words: '=' + ' '.join(words)))
+        opts = '\n'.join(f"        case {q(key)}\n            string split ' ' -- {q(words)}"
+                         for key, words in options)
+        return _COMPLETION_FISH % {'dir': COMPLETION_DIR, 'fallback': q(str(fallback)),
+                                   'values': ' '.join(values), 'nested': ' '.join(q(n) for n in nested),
+                                   'cases': cases, 'options': opts}
+    
+    q = lambda s: "'" + s.replace("'", "'\\''") + "'"
+    cases = '\n'.join(f"        {'|'.join(q(p.rsplit('/', 1)[0]) + '/' + p.rsplit('/', 1)[1] for p in patterns)})"
+                      f" REPLY={q(action)} ;;"
+                      for patterns, action in _completion_cases(
+                          spec, lambda kind: kind, lambda words: '=' + ' '.join(words)))
+    opts = '\n'.join(f"        {q(key)}) REPLY={q(words)} ;;" for key, words in options)
+    common = _COMPLETION_ROOT_SH % {'fallback': q(str(fallback)), 'nested': ' '.join(nested),
+                                    'values': '|'.join(values), 'cases': cases, 'options': opts}
+    template = _COMPLETION_ZSH if shell == 'zsh' else _COMPLETION_BASH
+    return template % {'dir': COMPLETION_DIR, 'common': common}
+
+# ============================================================================
+# ESTADO CENTRAL OPCIONAL (SQLite)
+# ============================================================================
+
+STATE_DB_FILE = "state.db"
+STATE_DB_VERSION = 1
+
+class StateStore:
+    """Estado central en .agent/state.db (SQLite en modo WAL), opcional.
+    
+    Guarda cada workspace (su skill-config.json completo y una tabla de skills
+    habilitados indexada por skill), los metadatos del catálogo y un historial de
+    operaciones. Los skill-config.json siguen escribiéndose como vista para los
+    agentes. Cada hilo abre su propia conexión y las escrituras van en
+    transacciones BEGIN IMMEDIATE: varios procesos `wsm` a la vez se serializan en
+    lugar de pisarse los cambios.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS workspaces (
+            name TEXT PRIMARY KEY,
+            config TEXT NOT NULL,
+            json_mtime INTEGER,
+            updated REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS enabled_skills (
+            workspace TEXT NOT NULL REFERENCES workspaces(name) ON DELETE CASCADE,
+            skill TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            PRIMARY KEY (workspace, skill)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS enabled_by_skill ON enabled_skills (skill, workspace);
+        CREATE TABLE IF NOT EXISTS catalog (
+            name TEXT PRIMARY KEY,
+            category TEXT,
+            bytes INTEGER,
+            tokens INTEGER,
+            files INTEGER,
+            requires TEXT,
+            conflicts TEXT
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY,
+            ts REAL NOT NULL,
+            op TEXT NOT NULL,
+            workspace TEXT,
+            detail TEXT
+        );
+        CREATE INDEX IF NOT EXISTS history_by_workspace ON history (workspace, id);
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._local = threading.local()
+        self._conn()
+    
+    def _conn(self) -> 'sqlite3.Connection':
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            import sqlite3
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != STATE_DB_VERSION:
+                conn.executescript(self.SCHEMA)
+                conn.execute(f"PRAGMA user_version={STATE_DB_VERSION}")
+            self._local.conn = conn
+            self._local.depth = 0
+        return conn
+    
+    @contextlib.contextmanager
+    def transaction(self):
+        """Transacción de escritura (reentrante dentro del mismo hilo)"""
+        conn = self._conn()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+        finally:
+            self._local.depth = 0
+    
+    # ── Workspaces ──
+    
+    def get_workspace(self, name: str) -> Optional[tuple]:
+        """(config, mtime del JSON exportado) o None"""
+        row = self._conn().execute("SELECT config, json_mtime FROM workspaces WHERE name = ?",
+                                   (name,)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+    
+    def put_workspace(self, name: str, config: dict, json_mtime: Optional[int],
+                      op: Optional[str] = None, detail: Optional[str] = None):
+        with self.transaction() as conn:
+            conn.execute("INSERT INTO workspaces (name, config, json_mtime, updated) VALUES (?, ?, ?, ?) "
+                         "ON CONFLICT (name) DO UPDATE SET config = excluded.config, "
+                         "json_mtime = excluded.json_mtime, updated = excluded.updated",
+                         (name, json.dumps(config), json_mtime, time.time()))
+            conn.execute("DELETE FROM enabled_skills WHERE workspace = ?", (name,))
+            conn.executemany("INSERT OR IGNORE INTO enabled_skills (workspace, skill, position) VALUES (?, ?, ?)",
+                             [(name, skill, i) for i, skill in enumerate(config.get('enabled_skills', []))])
+            if op:
+                self.log(op, name, detail)
+    
+    def delete_workspace(self, name: str, op: str = 'delete'):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM workspaces WHERE name = ?", (name,))
+            self.log(op, name)
+    
+    def workspaces(self) -> Dict[str, dict]:
+        rows = self._conn().execute("SELECT name, config FROM workspaces ORDER BY name")
+        return {name: json.loads(config) for name, config in rows}
+    
+    def json_mtimes(self) -> Dict[str, Optional[int]]:
+        return dict(self._conn().execute("SELECT name, json_mtime FROM workspaces"))
+    
+    def who_uses(self, skill: str) -> List[str]:
+        rows = self._conn().execute("SELECT workspace FROM enabled_skills WHERE skill = ? ORDER BY workspace",
+                                    (skill,))
+        return [row[0] for row in rows]
+    
+    # ── Catálogo e historial ──
+    
+    def replace_catalog(self, index: Dict[str, dict]):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM catalog")
+            conn.executemany("INSERT INTO catalog VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             [(name, e.get('category'), e.get('bytes'), e.get('tokens'), e.get('files'),
+                               json.dumps(e.get('requires', [])), json.dumps(e.get('conflicts', [])))
+                              for name, e in index.items()])
+    
+    def catalog_names(self) -> Set[str]:
+        return {row[0] for row in self._conn().execute("SELECT name FROM catalog")}
+    
+    def log(self, op: str, workspace: Optional[str] = None, detail: Optional[str] = None):
+        with self.transaction() as conn:
+            conn.execute("INSERT INTO history (ts, op, workspace, detail) VALUES (?, ?, ?, ?)",
+                         (time.time(), op, workspace, detail))
+    
+    def history(self, workspace: Optional[str] = None, limit: int = 50) -> List[dict]:
+        if workspace:
+            rows = self._conn().execute("SELECT ts, op, workspace, detail FROM history WHERE workspace = ? "
+                                        "ORDER BY id DESC LIMIT ?", (workspace, limit))
+        else:
+            rows = self._conn().execute("SELECT ts, op, workspace, detail FROM history "
+                                        "ORDER BY id DESC LIMIT ?", (limit,))
+        return [{'ts': ts, 'op': op, 'workspace': ws, 'detail': detail} for ts, op, ws, detail in rows]
+
+def state_transaction(method):
+    """Ejecuta un método del manager en una transacción del estado SQLite, si está activo"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        state = self._state()
+        if state is None:
+            return method(self, *args, **kwargs)
+        with state.transaction():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+# ============================================================================
+# DETECCIÓN AUTOMÁTICA DE RUTAS
+# ============================================================================
+
+# Directorio de la instalación: workspace-manager.py, skill-rules.json y wsm/
+INSTALL_DIR = Path(__file__).resolve().parent.parent
+SCRIPT_PATH = INSTALL_DIR / "workspace-manager.py"
+
+def detect_project_root() -> Path:
+    """Detecta la raíz del proyecto automáticamente priorizando el CWD"""
+    # 1. Intentar desde el directorio de trabajo actual (CWD)
+    # Esto permite que 'wsm' funcione como herramienta global instalada en otro lugar
+    try:
+        cwd = Path.cwd()
+        for current in [cwd] + list(cwd.parents)[:5]:
+            if (current / ".agent").exists() or (current / "workspaces").exists():
+                return current
+            if current.name == "workspaces":
+                return current.parent
+    except:
+        pass
+
+    # 2. Fallback al directorio del script (comportamiento original)
+    current = INSTALL_DIR
+    
+    # Caso 1: Ya estamos en la raíz
+    if (current / ".agent").exists() or (current / "workspaces").exists():
+        return current
+    
+    # Caso 2: Buscar hacia arriba
+    for _ in range(5):
+        if current.name == "workspaces":
+            return current.parent
+        parent = current.parent
+        if (parent / ".agent").exists() or (parent / "workspaces").exists():
+            return parent
+        current = parent
+    
+    return INSTALL_DIR
+
+# ============================================================================
+# WORKSPACE MANAGER
+# ============================================================================
+
+class WorkspaceManager:
+    def __init__(self, root: Optional[Path] = None, out: Optional[TextIO] = None):
+        with span('detect_root'):
+            self.root_dir = Path(root).resolve() if root else detect_project_root()
+        self.skills_dir = self.root_dir / ".agent" / "skills"
+        self.workspaces_dir = self.root_dir / "workspaces"
+        self.templates_dir = self.root_dir / "skill-config-templates"
+        self.store_dir = self.root_dir / ".agent" / "store"
+        with span('rules.load'):
+            self.rules = load_rule_engine([
+                self.root_dir / RULES_FILE,
+                INSTALL_DIR / RULES_FILE,
+            ])
+            self.skill_database = self._load_skill_database()
+        self._catalog_index = None
+        self._skill_graph = None
+        self._name_index = None
+        self._dedupe_cache = {}
+        self._sync_mutex = threading.RLock()
+        self._sync_depth = 0
+        self._sync_fd = None
+        self._state_store = None
+        self._state_lock = threading.Lock()
+        self._template_cache = {}
+        # stream: callable(dict) que recibe los elementos de los listados (NDJSON).
+        # interactive=False: sin input(), clear ni paginador (--json, --quiet, librería)
+        # out: adónde va la salida para humanos (el CLI pasa sys.stdout); con None los
+        # métodos sólo devuelven su Result, que es lo que usa la API wsm
+        self.stream = None
+        self.interactive = True
+        self.out = out
+    
+    def _print(self, *args, **kwargs):
+        """Salida para humanos del manager (nada si out es None)"""
+        if self.out is not None:
+            print(*args, file=self.out, **kwargs)
+    
+    def _on_terminal(self) -> bool:
+        """Modo interactivo con la salida en una terminal (paginador, clear)"""
+        return self.interactive and self.out is not None and self.out.isatty()
+    
+    def _emit(self, items: list, record: dict):
+        """Añade un elemento a un listado, o lo envía ya si hay streaming NDJSON"""
+        if self.stream:
+            self.stream(record)
+        else:
+            items.append(record)
+    
+    def initialize_project(self, force: bool = False, snapshot: Optional[str] = None, lazy: bool = False):
+        """Inicializa estructura"""
+        self._print(f"{Colors.BLUE}🚀 Inicializando...{Colors.ENDC}")
+        self._print(f"{Colors.CYAN}📁 Raíz: {self.root_dir}{Colors.ENDC}\n")
+        
+        for dir_path in [
+            self.skills_dir / "public",
+            self.skills_dir / "private", 
+            self.skills_dir / "user",
+            self.workspaces_dir,
+            self.templates_dir
+        ]:
+            dir_path.mkdir(parents=True, exist_ok=True)
+            self._print(f"✅ {dir_path.relative_to(self.root_dir)}")
+        
+        catalog = None
+        if snapshot:
+            # Hosts sin red: el catálogo sale de un snapshot de 'wsm export-catalog'
+            catalog = self.import_catalog(snapshot)
+            if not catalog:
+                self._print(f"{Colors.RED}⚠️  Error al importar el snapshot{Colors.ENDC}")
+        elif not (self.skills_dir / "public" / "docx").exists() or force:
+            self._print(f"\n{Colors.YELLOW}📦 Clonando skills...{Colors.ENDC}")
+            catalog = self.sync_from_github(mode='lazy' if lazy else None)
+            if not catalog:
+                self._print(f"{Colors.RED}⚠️  Error al clonar{Colors.ENDC}")
+        
+        self._create_templates()
+        self._print(f"\n{Colors.GREEN}✨ Inicializado!{Colors.ENDC}")
+        ok = catalog is None or bool(catalog)
+        return Result(ok, None if ok else 'catalog_failed', root=str(self.root_dir),
+                      catalog=catalog.to_dict() if catalog is not None else None)
+    
+    def _create_templates(self):
+        templates = {
+            "frontend-bundle.json": {
+                "name": "Frontend Bundle",
+                "enabled_skills": ["frontend-design", "react-patterns", "tailwind-patterns", "testing-patterns"]
+            },
+            "backend-bundle.json": {
+                "name": "Backend Bundle",
+                "enabled_skills": ["api-patterns", "backend-patterns", "testing-patterns", "clean-code"]
+            },
+            "mobile-bundle.json": {
+                "name": "Mobile Bundle",
+                "enabled_skills": ["flutter-supabase-architect", "mobile-design", "testing-patterns"]
+            },
+            "fullstack-bundle.json": {
+                "name": "Full-Stack Bundle",
+                "extends": ["frontend-bundle", "backend-bundle"],
+                "enabled_skills": ["senior-fullstack"]
+            }
+        }
+        for name, config in templates.items():
+            path = self.templates_dir / name
+            if not path.exists():
+                with open(path, 'w') as f:
+                    json.dump(config, f, indent=2)
+    
+    def create_workspace(self, name: str, template=None, description: str = "",
+                         stack: Optional[dict] = None):
+        """Crea workspace (`template` admite un nombre o una lista para componer)"""
+        # Modo lazy: materializar los skills de la plantilla fuera de la transacción SQLite
+        if template and self._is_lazy():
+            try:
+                resolved = self._resolve_templates([template] if isinstance(template, str) else list(template))
+            except (ValueError, FileNotFoundError):
+                resolved = None
+            if resolved:
+                checked = self._resolve_skill_set(resolved['enabled_skills'])
+                self._materialize(checked['skills'] if checked else resolved['enabled_skills'])
+        return self._create_workspace(name, template, description, stack)
+    
+    @state_transaction
+    def _create_workspace(self, name: str, template, description: str, stack: Optional[dict]):
+        try:
+            check_workspace_name(name)
+        except ValueError as e:
+            self._print(f"{Colors.RED}❌ {e}{Colors.ENDC}")
+            return Result(False, 'invalid_name', workspace=name, message=str(e))
+        path = self.workspaces_dir / name
+        if path.exists():
+            self._print(f"{Colors.RED}❌ Ya existe{Colors.ENDC}")
+            return Result(False, 'workspace_exists', workspace=name)
+        
+        resolved = None
+        unknown = []
+        if template:
+            names = [template] if isinstance(template, str) else list(template)
+            try:
+                resolved = self._resolve_templates(names)
+            except (ValueError, FileNotFoundError) as e:
+                self._print(f"{Colors.RED}❌ Plantilla: {e}{Colors.ENDC}")
+                return Result(False, 'template_error', workspace=name, message=str(e))
+            # Dependencias, conflictos y presupuesto: lo mismo que 'wsm enable' skill a skill
+            checked = self._resolve_skill_set(resolved['enabled_skills'], resolved['max_context_tokens'])
+            if not checked:
+                self._print(f"{Colors.RED}❌ Plantilla: {checked['message']}{Colors.ENDC}")
+                return Result(False, checked.error, workspace=name, **checked.data)
+            resolved = {**resolved, 'enabled_skills': checked['skills']}
+            unknown = [s for s in resolved['enabled_skills'] if s not in self._load_catalog_index()]
+            if unknown:
+                self._print(f"{Colors.YELLOW}⚠️  Skills de la plantilla que no están en el catálogo: {', '.join(unknown)}{Colors.ENDC}")
+        
+        self._print(f"{Colors.BLUE}🏗️  Creando: {name}{Colors.ENDC}")
+        
+        path.mkdir(parents=True)
+        agent = path / ".agents"
+        agent.mkdir()
+        
+        # Crear directorio de skills (se llenará con symlinks por skill)
+        skills_link_dir = agent / "skills"
+        skills_link_dir.mkdir(exist_ok=True)
+        
+        # Config
+        config = {
+            "name": name,
+            "description": description,
+            "enabled_skills": [],
+            "disabled_skills": [],
+            "skill_priority": {},
+            "max_context_tokens": None
+        }
+        if stack:
+            config['stack'] = stack
+        
+        if resolved:
+            config['templates'] = resolved['templates']
+            config['enabled_skills'] = list(resolved['enabled_skills'])
+            config['skill_priority'] = dict(resolved['skill_priority'])
+            config['max_context_tokens'] = resolved['max_context_tokens']
+        
+        self._save_config(path / "skill-config.json", config, 'create')
+        
+        # Crear symlinks para los skills habilitados
+        self.sync_workspace_skills(name, quiet=True)
+        
+        # README
+        self._write_workspace_readme(path, name, description)
+        self._refresh_completion_names()
+        
+        self._print(f"{Colors.GREEN}✅ Creado: {path.relative_to(self.root_dir)}{Colors.ENDC}")
+        return Result(workspace=name, path=str(path), templates=config.get('templates', []),
+                      enabled_skills=config['enabled_skills'], unknown_skills=unknown)
+    
+    def _write_workspace_readme(self, path: Path, name: str, description: str):
+        """README autogenerado del workspace"""
+        script_rel = os.path.relpath(SCRIPT_PATH, path)
+        with open(path / "README.md", 'w') as f:
+            f.write(f"""# {name}
+
+{description}
+
+## Skills
+
+```bash
+# Using the wsm alias (recommended):
+wsm list-skills {name}
+wsm enable {name} skill-name
+
+# Or using the direct path:
+python3 {script_rel} list-skills {name}
+```
+
+## Prompt Antigravity
+
+```
+Workspace: {name}
+Carga skills de ./skill-config.json
+Confirma qué tienes activo.
+```
+""")
+    
+    def _resolve_templates(self, names: List[str]) -> dict:
+        """Resuelve herencia (`extends`) y composición de plantillas, con caché.
+        
+        Las plantillas se visitan en orden topológico (padres antes que hijos) y se
+        fusionan en ese orden: `enabled_skills` se acumulan sin duplicados,
+        `disabled_skills` retira skills heredados y `skill_priority` /
+        `max_context_tokens` del último que los defina prevalecen. El resultado se
+        cachea por combinación y se invalida si cambia alguno de los ficheros usados.
+        """
+        key = tuple(names)
+        cached = self._template_cache.get(key)
+        if cached and all(self._file_sig(p) == sig for p, sig in cached['files'].items()):
+            return cached['resolved']
+        
+        order, done, files = [], set(), {}
+        
+        def visit(name, chain):
+            if name in done:
+                return
+            if name in chain:
+                raise ValueError(f"herencia cíclica {' → '.join(chain + [name])}")
+            t = self.templates_dir / f"{name}.json"
+            if not t.exists():
+                raise FileNotFoundError(f"no existe '{name}' en {t.parent.relative_to(self.root_dir)}")
+            with open(t) as f:
+                data = json.load(f)
+            files[t] = self._file_sig(t)
+            parents = data.get('extends', [])
+            for parent in [parents] if isinstance(parents, str) else parents:
+                visit(parent, chain + [name])
+            done.add(name)
+            order.append((name, data))
+        
+        for name in names:
+            visit(name, [])
+        
+        enabled = {}
+        priority = {}
+        max_tokens = None
+        for _, data in order:
+            for s in data.get('enabled_skills', []):
+                enabled[s] = True
+            for s in data.get('disabled_skills', []):
+                enabled.pop(s, None)
+            priority.update(data.get('skill_priority', {}))
+            if data.get('max_context_tokens') is not None:
+                max_tokens = data['max_context_tokens']
+        
+        resolved = {
+            'templates': [name for name, _ in order],
+            'enabled_skills': list(enabled),
+            'skill_priority': priority,
+            'max_context_tokens': max_tokens,
+        }
+        self._template_cache[key] = {'files': files, 'resolved': resolved}
+        return resolved
+    
+    @staticmethod
+    def _file_sig(path: Path):
+        try:
+            st = path.stat()
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+    
+    def list_workspaces(self):
+        """Lista workspaces"""
+        if not self.workspaces_dir.exists():
+            self._print(f"{Colors.RED}❌ No hay workspaces{Colors.ENDC}")
+            return Result(items=[], count=0)
+        
+        configs = self._workspace_configs()
+        if not configs:
+            self._print(f"{Colors.YELLOW}📭 No hay workspaces{Colors.ENDC}")
+            return Result(items=[], count=0)
+        
+        items = []
+        self._print(f"\n{Colors.BOLD}📂 Workspaces ({len(configs)}):{Colors.ENDC}\n")
+        for name, c in sorted(configs.items()):
+            self._print(f"  {Colors.CYAN}•{Colors.ENDC} {name:20}")
+            if c.get('description'):
+                self._print(f"    {c['description']}")
+            self._print(f"    Skills: {len(c.get('enabled_skills', []))}\n")
+            self._emit(items, {'type': 'workspace', 'name': name, 'description': c.get('description', ''),
+                               'skills': len(c.get('enabled_skills', []))})
+        return Result(items=items, count=len(configs))
+    
+    def _resolve_skill_set(self, skills: List[str], max_tokens: Optional[int] = None) -> Result:
+        """Completa un conjunto de skills con sus `requires` y lo valida como `enable`.
+        
+        Los skills que no están en el catálogo se dejan tal cual (quien llama los
+        avisa). Falla con 'dependency_cycle', 'missing_dependency', 'conflict' o
+        'budget_exceeded' y un `message` legible; si no, result['skills'] es el
+        conjunto completo con las dependencias antes de quien las requiere.
+        """
+        graph = self._get_skill_graph()
+        order = {}
+        for skill in skills:
+            if skill not in graph.index:
+                order[skill] = True
+                continue
+            try:
+                closure = graph.closure(skill)
+            except ValueError as e:
+                return Result(False, 'dependency_cycle', skill=skill, message=f"{skill}: {e}")
+            missing = [s for s in closure if s != skill and s not in graph.index]
+            if missing:
+                return Result(False, 'missing_dependency', skill=skill, missing=missing,
+                              message=f"{skill} requiere skills que no están en el catálogo: {', '.join(missing)}")
+            order.update(dict.fromkeys(closure, True))
+        expanded = list(order)
+        conflicts = graph.conflicts_among(expanded)
+        if conflicts:
+            return Result(False, 'conflict', conflicts=[list(pair) for pair in conflicts],
+                          message="conflicto entre " + ', '.join(f"{a} ↔ {b}" for a, b in conflicts))
+        if max_tokens:
+            tokens = self._context_cost(expanded)[1]
+            if tokens > max_tokens:
+                return Result(False, 'budget_exceeded', tokens=tokens, max_context_tokens=max_tokens,
+                              message=f"~{tokens} tokens superan max_context_tokens ({max_tokens})")
+        return Result(skills=expanded)
+    
+    def enable_skill(self, workspace: str, skill: str):
+        """Habilita skill"""
+        # Modo lazy: materializar (git) antes de abrir la transacción del estado SQLite,
+        # para no tener su lock de escritura tomado mientras tanto
+        graph = self._get_skill_graph()
+        if self._is_lazy() and skill in graph.index:
+            try:
+                self._materialize(graph.closure(skill))
+            except ValueError:
+                pass
+        return self._enable_skill(workspace, skill)
+    
+    @state_transaction
+    def _enable_skill(self, workspace: str, skill: str):
+        cfg = self.workspaces_dir / workspace / "skill-config.json"
+        if not cfg.exists():
+            self._print(f"{Colors.RED}❌ Workspace no encontrado{Colors.ENDC}")
+            return Result(False, 'workspace_not_found', workspace=workspace)
+        
+        c = self._load_config(cfg)
+        
+        enabled = c.get('enabled_skills', [])
+        if skill in enabled:
+            self._print(f"{Colors.YELLOW}⚠️  Ya habilitado{Colors.ENDC}")
+            return Result(False, 'already_enabled', workspace=workspace, skill=skill)
+        
+        # Dependencias (`requires`) transitivas y conflictos con lo ya habilitado
+        graph = self._get_skill_graph()
+        if skill not in graph.index:
+            suggestions = self._skill_not_found(skill)
+            return Result(False, 'skill_not_found', workspace=workspace, skill=skill, suggestions=suggestions)
+        try:
+            closure = graph.closure(skill)
+        except ValueError as e:
+            self._print(f"{Colors.RED}❌ {skill}: {e}{Colors.ENDC}")
+            return Result(False, 'dependency_cycle', workspace=workspace, skill=skill, message=str(e))
+        to_add = [s for s in closure if s not in enabled]
+        missing = [s for s in to_add if s != skill and s not in graph.index]
+        if missing:
+            self._print(f"{Colors.RED}❌ {skill} requiere skills que no están en el catálogo: {', '.join(missing)}{Colors.ENDC}")
+            return Result(False, 'missing_dependency', workspace=workspace, skill=skill, missing=missing)
+        conflicts = [pair for pair in graph.conflicts_among(enabled + to_add)
+                     if pair[0] in to_add or pair[1] in to_add]
+        if conflicts:
+            self._print(f"{Colors.RED}❌ Conflicto al habilitar {skill}:{Colors.ENDC}")
+            for a, b in conflicts:
+                self._print(f"    {Colors.RED}•{Colors.ENDC} {a} ↔ {b}")
+            return Result(False, 'conflict', workspace=workspace, skill=skill,
+                          conflicts=[list(pair) for pair in conflicts])
+        
+        # Respetar el presupuesto de contexto del workspace
+        limit = c.get('max_context_tokens')
+        if limit:
+            used = self._context_cost(enabled)[1]
+            cost = self._context_cost(to_add)[1]
+            if used + cost > limit:
+                self._print(f"{Colors.RED}❌ Presupuesto de contexto excedido: {skill} (~{cost} tokens){Colors.ENDC}")
+                self._print(f"{Colors.YELLOW}   En uso: ~{used} / {limit} tokens. Usa 'wsm budget {workspace}' para ver el ranking.{Colors.ENDC}")
+                return Result(False, 'budget_exceeded', workspace=workspace, skill=skill,
+                              tokens=cost, used_tokens=used, max_context_tokens=limit)
+        
+        c.setdefault('enabled_skills', []).extend(to_add)
+        c['disabled_skills'] = [s for s in c.get('disabled_skills', []) if s not in to_add]
+        
+        self._save_config(cfg, c, 'enable', ' '.join(to_add))
+        
+        # Crear symlinks (el skill y las dependencias que faltaban)
+        for s in to_add:
+            self._create_skill_symlink(workspace, s, c)
+        self._refresh_load_plan(workspace)
+        
+        for dep in to_add[:-1]:
+            self._print(f"  {Colors.CYAN}+ {dep}{Colors.ENDC} (requerido por {skill})")
+        self._print(f"{Colors.GREEN}✅ Habilitado: {skill} en {workspace}{Colors.ENDC}")
+        return Result(workspace=workspace, skill=skill, dependencies=to_add[:-1])
+    
+    @state_transaction
+    def disable_skill(self, workspace: str, skill: str):
+        """Deshabilita skill"""
+        cfg = self.workspaces_dir / workspace / "skill-config.json"
+        if not cfg.exists():
+            self._print(f"{Colors.RED}❌ Workspace no encontrado{Colors.ENDC}")
+            return Result(False, 'workspace_not_found', workspace=workspace)
+        
+        c = self._load_config(cfg)
+        
+        if skill not in c.get('enabled_skills', []):
+            self._print(f"{Colors.YELLOW}⚠️  No habilitado{Colors.ENDC}")
+            suggestions = NameIndex(c.get('enabled_skills', [])).suggest(skill)
+            if suggestions:
+                self._print(f"{Colors.YELLOW}   ¿Quisiste decir: {', '.join(suggestions)}?{Colors.ENDC}")
+            return Result(False, 'not_enabled', workspace=workspace, skill=skill, suggestions=suggestions)
+        
+        c['enabled_skills'].remove(skill)
+        self._save_config(cfg, c, 'disable', skill)
+        
+        # Eliminar symlink del skill
+        self._remove_skill_symlink(workspace, skill)
+        self._refresh_load_plan(workspace)
+        
+        self._print(f"{Colors.GREEN}✅ Deshabilitado: {skill} de {workspace}{Colors.ENDC}")
+        required_by = sorted(self._get_skill_graph().dependents(skill) & set(c['enabled_skills']))
+        if required_by:
+            self._print(f"{Colors.YELLOW}⚠️  Lo siguen requiriendo: {', '.join(required_by)}{Colors.ENDC}")
+        return Result(workspace=workspace, skill=skill, required_by=required_by)
+    
+    def show_skill_graph(self, skill: str):
+        """Árbol de `requires`, skills que lo requieren y conflictos de un skill"""
+        graph = self._get_skill_graph()
+        if skill not in graph.index:
+            suggestions = self._skill_not_found(skill)
+            return Result(False, 'skill_not_found', skill=skill, suggestions=suggestions)
+        try:
+            closure = graph.closure(skill)
+        except ValueError as e:
+            self._print(f"{Colors.RED}❌ {e}{Colors.ENDC}")
+            return Result(False, 'dependency_cycle', skill=skill, message=str(e))
+        
+        self._print(f"\n{Colors.BOLD}🕸️  {skill}{Colors.ENDC}\n")
+        shown = set()
+        
+        def tree(name, prefix):
+            deps = graph.requires.get(name, [])
+            for i, dep in enumerate(deps):
+                last = i == len(deps) - 1
+                note = ""
+                if dep not in graph.index:
+                    note = f" {Colors.RED}(no está en el catálogo){Colors.ENDC}"
+                elif dep in shown and graph.requires.get(dep):
+                    note = f" {Colors.CYAN}(ver arriba){Colors.ENDC}"
+                self._print(f"  {prefix}{'└─' if last else '├─'} {dep}{note}")
+                if dep not in shown:
+                    shown.add(dep)
+                    tree(dep, prefix + ('   ' if last else '│  '))
+        
+        if graph.requires.get(skill):
+            self._print(f"  {Colors.BOLD}Requiere:{Colors.ENDC}")
+            tree(skill, '')
+        else:
+            self._print(f"  {Colors.BOLD}Requiere:{Colors.ENDC} —")
+        required_by = sorted(graph.dependents(skill))
+        conflicts = sorted(graph.conflicts.get(skill, ()))
+        self._print(f"  {Colors.BOLD}Requerido por:{Colors.ENDC} {', '.join(required_by) or '—'}")
+        self._print(f"  {Colors.BOLD}Conflictos:{Colors.ENDC} {', '.join(conflicts) or '—'}")
+        tokens = self._context_cost(closure)[1]
+        self._print(f"\n  Al habilitarlo: {len(closure)} skills, ~{tokens} tokens\n")
+        return Result(skill=skill, requires=list(graph.requires.get(skill, [])), closure=list(closure),
+                      missing=[s for s in closure if s not in graph.index],
+                      required_by=required_by, conflicts=conflicts, tokens=tokens)
+    
+    def list_workspace_skills(self, workspace: str):
+        """Lista skills de workspace"""
+        cfg = self.workspaces_dir / workspace / "skill-config.json"
+        if not cfg.exists():
+            self._print(f"{Colors.RED}❌ No encontrado{Colors.ENDC}")
+            return Result(False, 'workspace_not_found', workspace=workspace)
+        
+        c = self._load_config(cfg)
+        
+        skills = c.get('enabled_skills', [])
+        index = self._load_catalog_index()
+        items = []
+        self._print(f"\n{Colors.BOLD}📊 {workspace} ({len(skills)} skills):{Colors.ENDC}\n")
+        for s in sorted(skills):
+            entry = index.get(s)
+            if entry:
+                self._print(f"  {Colors.GREEN}✓{Colors.ENDC} {s:40} {'~' + str(entry['tokens']):>8} tokens  {format_bytes(entry['bytes']):>9}")
+                self._emit(items, {'type': 'skill', 'name': s, 'in_catalog': True, 'category': entry['category'],
+                                   'tokens': entry['tokens'], 'bytes': entry['bytes']})
+            else:
+                self._print(f"  {Colors.RED}✗{Colors.ENDC} {s:40} {Colors.YELLOW}(no está en el catálogo){Colors.ENDC}")
+                self._emit(items, {'type': 'skill', 'name': s, 'in_catalog': False})
+        
+        total_bytes, total_tokens = self._context_cost(skills)
+        limit = c.get('max_context_tokens')
+        budget = f" / {limit}" if limit else ""
+        color = Colors.RED if limit and total_tokens > limit else Colors.CYAN
+        self._print(f"\n  {Colors.BOLD}Total:{Colors.ENDC} {color}~{total_tokens}{budget} tokens{Colors.ENDC} ({format_bytes(total_bytes)})")
+        self._print()
+        return Result(items=items, workspace=workspace, count=len(skills), total_tokens=total_tokens,
+                      total_bytes=total_bytes, max_context_tokens=limit)
+    
+    def list_catalog(self):
+        """Lista el catálogo completo (nombre, categoría y coste de contexto)"""
+        index = self._load_catalog_index()
+        items = []
+        self._print(f"\n{Colors.BOLD}Skills ({len(index)}):{Colors.ENDC}\n")
+        for name in sorted(index):
+            entry = index[name]
+            self._print(f"  • {name}")
+            self._emit(items, {'type': 'skill', 'name': name, 'category': entry['category'],
+                               'tokens': entry['tokens'], 'bytes': entry['bytes'],
+                               'materialized': not entry.get('lazy')})
+        self._print()
+        return Result(items=items, count=len(index))
+    
+    def budget_report(self, workspace: str, set_limit: Optional[int] = None):
+        """Ranking de skills de un workspace por coste de contexto"""
+        cfg = self.workspaces_dir / workspace / "skill-config.json"
+        if not cfg.exists():
+            self._print(f"{Colors.RED}❌ Workspace no encontrado: {workspace}{Colors.ENDC}")
+            return Result(False, 'workspace_not_found', workspace=workspace)
+        
+        # Sólo --set escribe: el informe en sí no abre transacción en el estado
+        c = self._set_budget_limit(cfg, workspace, set_limit) if set_limit is not None else self._load_config(cfg)
+        
+        index = self._load_catalog_index()
+        skills = c.get('enabled_skills', [])
+        ranked = sorted(skills, key=lambda s: (-index.get(s, {}).get('tokens', 0), s))
+        total_bytes, total_tokens = self._context_cost(skills)
+        limit = c.get('max_context_tokens')
+        
+        self._print(f"\n{Colors.BOLD}💰 Presupuesto de contexto — {workspace}{Colors.ENDC}\n")
+        items = []
+        cumulative = 0
+        for i, s in enumerate(ranked, 1):
+            entry = index.get(s)
+            if not entry:
+                self._print(f"  {i:3}. {s:40} {Colors.YELLOW}(no está en el catálogo){Colors.ENDC}")
+                self._emit(items, {'type': 'skill', 'rank': i, 'name': s, 'in_catalog': False})
+                continue
+            cumulative += entry['tokens']
+            share = entry['tokens'] * 100 / total_tokens if total_tokens else 0
+            cum_share = cumulative * 100 / total_tokens if total_tokens else 0
+            self._print(f"  {i:3}. {s:40} {'~' + str(entry['tokens']):>8} tokens {share:5.1f}%  (acum. {cum_share:5.1f}%)")
+            self._emit(items, {'type': 'skill', 'rank': i, 'name': s, 'in_catalog': True, 'tokens': entry['tokens'],
+                               'bytes': entry['bytes'], 'share': round(share, 2), 'cumulative_share': round(cum_share, 2)})
+        
+        self._print(f"\n  {Colors.BOLD}Total:{Colors.ENDC} ~{total_tokens} tokens ({format_bytes(total_bytes)})")
+        if limit:
+            remaining = limit - total_tokens
+            color = Colors.GREEN if remaining >= 0 else Colors.RED
+            self._print(f"  {Colors.BOLD}Límite:{Colors.ENDC} {limit} tokens → {color}restante {remaining}{Colors.ENDC}")
+        else:
+            self._print(f"  {Colors.CYAN}Sin límite (usa 'wsm budget {workspace} --set N'){Colors.ENDC}")
+        self._print()
+        return Result(items=items, workspace=workspace, total_tokens=total_tokens, total_bytes=total_bytes,
+                      max_context_tokens=limit, remaining_tokens=limit - total_tokens if limit else None)
+    
+    @state_transaction
+    def _set_budget_limit(self, cfg: Path, workspace: str, limit: int) -> dict:
+        c = self._load_config(cfg)
+        c['max_context_tokens'] = limit or None
+        self._save_config(cfg, c, 'budget', str(c['max_context_tokens']))
+        self._refresh_load_plan(workspace)
+        self._print(f"{Colors.GREEN}✅ max_context_tokens = {c['max_context_tokens']}{Colors.ENDC}")
+        return c
+    
+    @staticmethod
+    def _skill_priorities(config: dict) -> Dict[str, float]:
+        """`skill_priority` de una config con valores numéricos ("5" se acepta como 5).
+        
+        ValueError con el skill culpable si alguno no es un número.
+        """
+        prios = config.get('skill_priority') or {}
+        if not isinstance(prios, dict):
+            raise ValueError("skill_priority debe ser un objeto {skill: prioridad}")
+        out = {}
+        for skill, value in prios.items():
+            if isinstance(value, str):
+                with contextlib.suppress(ValueError):
+                    value = float(value)
+                    value = int(value) if value.is_integer() else value
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"la prioridad de '{skill}' no es un número: {value!r}")
+            out[skill] = value
+        return out
+    
+    def _build_load_plan(self, config: dict, max_tokens: Optional[int] = None,
+                         max_bytes: Optional[int] = None):
+        """Ordena los skills habilitados por `skill_priority` y trunca al presupuesto.
+        
+        Mayor prioridad se carga antes (por defecto 0; empates en el orden de
+        `enabled_skills`). El plan es un prefijo: en cuanto un skill no cabe, él y
+        todos los de menor prioridad quedan fuera. Devuelve (cargados, descartados);
+        ValueError si alguna prioridad no es numérica.
+        """
+        index = self._load_catalog_index()
+        priority = self._skill_priorities(config)
+        enabled = list(dict.fromkeys(config.get('enabled_skills', [])))
+        ordered = sorted(enumerate(enabled), key=lambda p: (-priority.get(p[1], 0), p[0]))
+        if max_tokens is None:
+            max_tokens = config.get('max_context_tokens')
+        
+        loaded, dropped = [], []
+        used_tokens = used_bytes = 0
+        full = False
+        for _, skill in ordered:
+            entry = index.get(skill)
+            if not entry:
+                dropped.append({'skill': skill, 'reason': 'missing'})
+                continue
+            if not full and ((max_tokens and used_tokens + entry['tokens'] > max_tokens) or
+                             (max_bytes and used_bytes + entry['bytes'] > max_bytes)):
+                full = True
+            if full:
+                dropped.append({'skill': skill, 'reason': 'budget', 'tokens': entry['tokens']})
+                continue
+            used_tokens += entry['tokens']
+            used_bytes += entry['bytes']
+            loaded.append({
+                'order': len(loaded) + 1,
+                'skill': skill,
+                'priority': priority.get(skill, 0),
+                'path': f"skills/{skill}",
+                'tokens': entry['tokens'],
+                'bytes': entry['bytes'],
+            })
+        return loaded, dropped
+    
+    def write_load_plan(self, workspace: str, max_tokens: Optional[int] = None,
+                        max_bytes: Optional[int] = None, links: bool = False,
+                        quiet: bool = False):
+        """Materializa el plan de carga en .agents/load-plan.json (y symlinks numerados)"""
+        ws_path = self.workspaces_dir / workspace
+        cfg = ws_path / "skill-config.json"
+        if not cfg.exists():
+            if not quiet:
+                self._print(f"{Colors.RED}❌ Workspace no encontrado: {workspace}{Colors.ENDC}")
+            return Result(False, 'workspace_not_found', workspace=workspace)
+        
+        c = self._load_config(cfg)
+        
+        try:
+            loaded, dropped = self._build_load_plan(c, max_tokens, max_bytes)
+        except ValueError as e:
+            if not quiet:
+                self._print(f"{Colors.RED}❌ {cfg.relative_to(self.root_dir)}: {e}{Colors.ENDC}")
+            return Result(False, 'invalid_priority', workspace=workspace, message=str(e))
+        agents = ws_path / ".agents"
+        agents.mkdir(exist_ok=True)
+        plan = {
+            'workspace': workspace,
+            'max_context_tokens': max_tokens if max_tokens is not None else c.get('max_context_tokens'),
+            'max_bytes': max_bytes,
+            'total_tokens': sum(e['tokens'] for e in loaded),
+            'total_bytes': sum(e['bytes'] for e in loaded),
+            'load_order': loaded,
+            'dropped': dropped,
+        }
+        with open(agents / LOAD_PLAN_FILE, 'w') as f:
+            json.dump(plan, f, indent=2)
+        
+        # Symlinks numerados (01-skill → ../skills/skill) para agentes que leen en orden
+        links_dir = agents / LOAD_PLAN_LINKS_DIR
+        if links or links_dir.is_dir():
+            if links_dir.is_dir():
+                for item in links_dir.iterdir():
+                    if item.is_symlink():
+                        item.unlink()
+            links_dir.mkdir(exist_ok=True)
+            width = max(2, len(str(len(loaded))))
+            for e in loaded:
+                link = links_dir / f"{e['order']:0{width}d}-{e['skill']}"
+                try:
+                    link.symlink_to(os.path.join("..", "skills", e['skill']))
+                except OSError:
+                    pass
+        
+        if not quiet:
+            self._print(f"\n{Colors.BOLD}📋 Plan de carga — {workspace}{Colors.ENDC}\n")
+            for e in loaded:
+                self._print(f"  {Colors.GREEN}{e['order']:3}.{Colors.ENDC} {e['skill']:40} "
+                      f"prio {e['priority']:>3}  {'~' + str(e['tokens']):>8} tokens")
+            for d in dropped:
+                reason = 'no está en el catálogo' if d['reason'] == 'missing' else 'fuera de presupuesto'
+                self._print(f"  {Colors.RED}  ✗{Colors.ENDC} {d['skill']:40} {Colors.YELLOW}({reason}){Colors.ENDC}")
+            budget = f" / {plan['max_context_tokens']}" if plan['max_context_tokens'] else ""
+            self._print(f"\n  {Colors.BOLD}Total:{Colors.ENDC} ~{plan['total_tokens']}{budget} tokens "
+                  f"({format_bytes(plan['total_bytes'])})")
+            self._print(f"  {Colors.CYAN}→ {(agents / LOAD_PLAN_FILE).relative_to(self.root_dir)}{Colors.ENDC}\n")
+        return Result(path=str(agents / LOAD_PLAN_FILE), **plan)
+    
+    def _refresh_load_plan(self, workspace: str):
+        """Regenera el plan de carga si el workspace ya tiene uno.
+        
+        El límite de tokens se vuelve a leer de `max_context_tokens` en la config
+        actual; el de bytes, que no está en la config, se conserva del plan anterior.
+        """
+        plan_path = self.workspaces_dir / workspace / ".agents" / LOAD_PLAN_FILE
+        if not plan_path.exists():
+            return
+        try:
+            with open(plan_path) as f:
+                prev = json.load(f)
+        except Exception:
+            prev = {}
+        self.write_load_plan(workspace, None, prev.get('max_bytes'), quiet=True)
+    
+    @state_transaction
+    def set_skill_priority(self, workspace: str, skill: str, priority: int):
+        """Fija la prioridad de carga de un skill en skill-config.json"""
+        cfg = self.workspaces_dir / workspace / "skill-config.json"
+        if not cfg.exists():
+            self._print(f"{Colors.RED}❌ Workspace no encontrado{Colors.ENDC}")
+            return Result(False, 'workspace_not_found', workspace=workspace)
+        
+        c = self._load_config(cfg)
+        
+        prio = c.setdefault('skill_priority', {})
+        if priority:
+            prio[skill] = priority
+        else:
+            prio.pop(skill, None)
+        self._save_config(cfg, c, 'priority', f"{skill}={priority}")
+        
+        self._refresh_load_plan(workspace)
+        
+        self._print(f"{Colors.GREEN}✅ Prioridad de {skill} en {workspace}: {priority}{Colors.ENDC}")
+        return Result(workspace=workspace, skill=skill, priority=priority)
+    
+    def show_skill_detail(self, skill_name: str, lang: str = 'en'):
+        """Muestra el detalle completo de un skill del catálogo"""
+        import subprocess
+        # ── Buscar el skill en las categorías disponibles ──
+        skill_path = None
+        for cat in ['public', 'private', 'user']:
+            candidate = self.skills_dir / cat / skill_name
+            if candidate.is_dir() and (candidate / "SKILL.md").exists():
+                skill_path = candidate
+                break
+        else:
+            # Modo lazy: el SKILL.md de un skill sin materializar está en el mirror
+            entry = self._load_lazy_catalog().get(skill_name)
+            if entry and (Path(entry['path']) / "SKILL.md").exists():
+                skill_path = Path(entry['path'])
+        
+        if not skill_path:
+            suggestions = self._skill_not_found(skill_name, lang)
+            return Result(False, 'skill_not_found', skill=skill_name, suggestions=suggestions)
+        
+        # ── Leer SKILL.md ──
+        with open(skill_path / "SKILL.md", 'r', encoding='utf-8') as f:
+            raw = f.read()
+        
+        # ── Parsear frontmatter YAML ──
+        fm_name = skill_name
+        fm_desc = ''
+        fm_risk = 'unknown'
+        fm_source = 'unknown'
+        body = raw
+        
+        if raw.startswith('---'):
+            parts = raw.split('---', 2)
+            if len(parts) >= 3:
+                fm_block = parts[1]
+                body = parts[2].strip()
+                for line in fm_block.strip().splitlines():
+                    if line.startswith('name:'):
+                        fm_name = line.split(':', 1)[1].strip().strip('"').strip("'")
+                    elif line.startswith('risk:'):
+                        fm_risk = line.split(':', 1)[1].strip().strip('"').strip("'")
+                    elif line.startswith('source:'):
+                        fm_source = line.split(':', 1)[1].strip().strip('"').strip("'")
+                    elif line.startswith('description:'):
+                        fm_desc = line.split(':', 1)[1].strip().strip('"').strip("'")
+        
+        # ── Enriquecer desde skills_index.json ──
+        index_category = ''
+        index_path = self.root_dir / "antigravity-awesome-skills" / "skills_index.json"
+        if index_path.exists():
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    index_data = json.load(f)
+                for entry in index_data:
+                    if entry.get('id') == skill_name or entry.get('name') == skill_name:
+                        if not fm_desc and entry.get('description'):
+                            fm_desc = entry['description']
+                        index_category = entry.get('category', '')
+                        if fm_source == 'unknown' and entry.get('source'):
+                            fm_source = entry['source']
+                        if fm_risk == 'unknown' and entry.get('risk'):
+                            fm_risk = entry['risk']
+                        break
+            except Exception:
+                pass
+        
+        # ── Construir la salida ──
+        github_url = f"https://github.com/sickn33/antigravity-awesome-skills/tree/main/skills/{skill_name}"
+        
+        lines = []
+        lines.append(f"{Colors.CYAN}{Colors.BOLD}{'═'*70}")
+        if lang == 'es':
+            lines.append(f"  📖 DETALLE DEL SKILL — {fm_name}")
+        else:
+            lines.append(f"  📖 SKILL DETAIL — {fm_name}")
+        lines.append(f"{'═'*70}{Colors.ENDC}")
+        lines.append('')
+        
+        # Metadata
+        if lang == 'es':
+            lines.append(f"  {Colors.BOLD}Nombre:{Colors.ENDC}      {fm_name}")
+            if fm_desc:
+                lines.append(f"  {Colors.BOLD}Descripción:{Colors.ENDC} {fm_desc}")
+            if index_category:
+                lines.append(f"  {Colors.BOLD}Categoría:{Colors.ENDC}  {index_category}")
+            lines.append(f"  {Colors.BOLD}Fuente:{Colors.ENDC}      {fm_source}")
+            lines.append(f"  {Colors.BOLD}Riesgo:{Colors.ENDC}      {fm_risk}")
+            lines.append(f"  {Colors.BOLD}GitHub:{Colors.ENDC}      {github_url}")
+        else:
+            lines.append(f"  {Colors.BOLD}Name:{Colors.ENDC}        {fm_name}")
+            if fm_desc:
+                lines.append(f"  {Colors.BOLD}Description:{Colors.ENDC} {fm_desc}")
+            if index_category:
+                lines.append(f"  {Colors.BOLD}Category:{Colors.ENDC}    {index_category}")
+            lines.append(f"  {Colors.BOLD}Source:{Colors.ENDC}      {fm_source}")
+            lines.append(f"  {Colors.BOLD}Risk:{Colors.ENDC}        {fm_risk}")
+            lines.append(f"  {Colors.BOLD}GitHub:{Colors.ENDC}      {github_url}")
+        
+        lines.append('')
+        lines.append(f"{Colors.CYAN}{'─'*70}{Colors.ENDC}")
+        lines.append('')
+        
+        # Body del SKILL.md (traducir encabezados si es español)
+        if lang == 'es':
+            translations = {
+                '## Use this skill when': '## Usa este skill cuando',
+                '## Do not use this skill when': '## No uses este skill cuando',
+                '## Instructions': '## Instrucciones',
+                '## Purpose': '## Propósito',
+                '## Capabilities': '## Capacidades',
+                '## Behavioral Traits': '## Comportamiento',
+                '## Knowledge Base': '## Base de Conocimiento',
+                '## Response Approach': '## Enfoque de Respuesta',
+                '## Example Interactions': '## Ejemplos de Uso',
+                '## Examples': '## Ejemplos',
+                '### Core': '### Núcleo',
+                '### Architecture Patterns': '### Patrones de Arquitectura',
+                '### Performance Optimization': '### Optimización de Rendimiento',
+                '### Testing Strategies': '### Estrategias de Testing',
+                '### Security & Compliance': '### Seguridad y Cumplimiento',
+                '### Advanced Features': '### Características Avanzadas',
+                '### Data Management & Persistence': '### Gestión de Datos y Persistencia',
+                '### DevOps & Deployment': '### DevOps y Despliegue',
+                '### Advanced UI & UX Implementation': '### Implementación Avanzada de UI/UX',
+                '### Platform Integration Mastery': '### Dominio de Integración de Plataformas',
+                '### State Management Excellence': '### Excelencia en Gestión de Estado',
+                '## When to use': '## Cuándo usar',
+                '## When not to use': '## Cuándo no usar',
+                '## Best Practices': '## Mejores Prácticas',
+                '## Key Concepts': '## Conceptos Clave',
+                '## Common Patterns': '## Patrones Comunes',
+                '## Troubleshooting': '## Resolución de Problemas',
+                '## References': '## Referencias',
+                '## Getting Started': '## Primeros Pasos',
+                '## Configuration': '## Configuración',
+                '## Usage': '## Uso',
+            }
+            for en_header, es_header in translations.items():
+                body = body.replace(en_header, es_header)
+        
+        lines.append(body)
+        lines.append('')
+        lines.append(f"{Colors.CYAN}{'═'*70}{Colors.ENDC}")
+        
+        output = '\n'.join(lines)
+        result = Result(skill=skill_name, name=fm_name, description=fm_desc, category=index_category,
+                        source=fm_source, risk=fm_risk, path=str(skill_path), github=github_url, body=body)
+        
+        # ── Paginación con less para scroll (sólo en una terminal) ──
+        if not self._on_terminal():
+            self._print(output)
+            return result
+        try:
+            proc = subprocess.Popen(
+                ['less', '-R'],
+                stdin=subprocess.PIPE,
+                encoding='utf-8'
+            )
+            proc.communicate(input=output)
+        except (FileNotFoundError, BrokenPipeError):
+            # Fallback: imprimir directamente si less no está disponible
+            self._print(output)
+        return result
+    
+    def recommend_skills(self, workspace: str, aggregate: bool = True):
+        """Recomienda skills basándose en el contenido del workspace.
+        
+        En un monorepo añade un grupo por sub-proyecto; aggregate=False deja sólo
+        esos grupos (sin las sugerencias del conjunto del workspace).
+        """
+        ws_path = self.workspaces_dir / workspace
+        cfg_path = ws_path / "skill-config.json"
+        if not cfg_path.exists():
+            self._print(f"{Colors.RED}❌ Workspace no encontrado: {workspace}{Colors.ENDC}")
+            return Result(False, 'workspace_not_found', workspace=workspace)
+        
+        config = self._load_config(cfg_path)
+        already_enabled = set(config.get('enabled_skills', []))
+        
+        if self._on_terminal():
+            os.system('clear' if os.name != 'nt' else 'cls')
+        self._print(f"{Colors.CYAN}{Colors.BOLD}{'═'*70}")
+        self._print(f"  🔍 RECOMENDACIÓN DE SKILLS — {workspace}")
+        self._print(f"{'═'*70}{Colors.ENDC}\n")
+        
+        self._print(f"{Colors.YELLOW}  Escaneando contenido del workspace...{Colors.ENDC}\n")
+        
+        # ── Escanear archivos del workspace (un único recorrido, repartido por sub-proyecto) ──
+        with span('project.scan'):
+            scans = scan_project(ws_path)
+        whole = ProjectScan()
+        for scan in scans.values():
+            whole.merge(scan)
+        detected = detect_stack(whole)
+        primary_lang, detected_type, detected_db = detected['lang'], detected['type'], detected['db']
+        langs = whole.langs
+        shares = dict(langs.shares())
+        stacks = detected['stacks'][1:]
+        
+        # Monorepo: dos o más raíces con manifiesto propio
+        roots = [root for root, scan in sorted(scans.items()) if scan.manifest]
+        subprojects = {}
+        if len(roots) > 1:
+            for root in roots:
+                sub_det = detect_stack(scans[root])
+                if sub_det['lang'] or sub_det['type']:
+                    subprojects[root] = sub_det
+        
+        # ── Mostrar hallazgos ──
+        self._print(f"  {Colors.BOLD}Hallazgos:{Colors.ENDC}")
+        if primary_lang:
+            self._print(f"    💻 Lenguaje:  {Colors.GREEN}{langs.describe()}{Colors.ENDC}")
+        if detected_type:
+            self._print(f"    📦 Tipo:      {Colors.GREEN}{detected_type}{Colors.ENDC}")
+        if detected_db:
+            self._print(f"    🗄️  Database:  {Colors.GREEN}{detected_db}{Colors.ENDC}")
+        if already_enabled:
+            self._print(f"    ✅ Ya activos: {Colors.CYAN}{len(already_enabled)} skills{Colors.ENDC}")
+        if subprojects:
+            self._print(f"    📁 Sub-proyectos ({len(subprojects)}):")
+            for root, sub_det in subprojects.items():
+                desc = ' · '.join(filter(None, (sub_det['type'], scans[root].langs.describe(), sub_det['db'])))
+                self._print(f"       {Colors.CYAN}{root:24}{Colors.ENDC} {desc}")
+        self._print()
+        
+        detected['subprojects'] = {root: {k: v for k, v in sub_det.items() if k != 'languages'}
+                                   for root, sub_det in subprojects.items()}
+        if not primary_lang and not detected_type:
+            self._print(f"  {Colors.YELLOW}⚠️  No se detectó suficiente contenido para recomendar skills.{Colors.ENDC}")
+            self._print(f"  {Colors.YELLOW}    Asegúrate de que el workspace tenga archivos fuente.{Colors.ENDC}\n")
+            return Result(workspace=workspace, detected=detected, suggestions={}, enabled=[])
+        
+        # ── Generar recomendaciones ──
+        suggested = self._get_suggested_skills(detected_type, primary_lang, detected_db) if aggregate else {}
+        
+        # Añadir skills base del lenguaje y tipo detectados
+        base_skills = self._stack_base_skills(primary_lang, detected_type, detected_db)
+        base_skills.update(self.skill_database['essential'])
+        
+        # Por sub-proyecto: sus skills base; los que piden varios van a un grupo común
+        per_project = {root: self._stack_base_skills(sub_det['lang'], sub_det['type'], sub_det['db'])
+                       for root, sub_det in subprojects.items()}
+        needed_by = {}
+        for root, skills in per_project.items():
+            for s in skills:
+                needed_by.setdefault(s, []).append(root)
+        project_skills = {}
+        common = sorted(s for s, rs in needed_by.items() if len(rs) > 1 and s not in already_enabled)
+        if common:
+            project_skills["🔗 Comunes a varios sub-proyectos"] = common
+        for root, skills in per_project.items():
+            own = sorted(s for s in skills if len(needed_by[s]) == 1 and s not in already_enabled)
+            if own:
+                sub_det = subprojects[root]
+                project_skills[f"📁 {root} ({sub_det['type'] or sub_det['lang']})"] = own
+        
+        # Incluir skills base como categoría si hay alguno nuevo
+        listed = set(needed_by)
+        base_new = [s for s in sorted(base_skills) if s not in already_enabled and s not in listed]
+        if not aggregate:
+            base_new = [s for s in base_new if s in self.skill_database['essential']]
+        stack_skills = {}
+        for lang in stacks if aggregate else []:
+            extra = [s for s in self.skill_database['languages'].get(lang, [])
+                     if s not in already_enabled and s not in base_skills and s not in listed]
+            if extra:
+                stack_skills[f"⚡ Stack {lang} ({shares[lang]:.0%})"] = extra
+        if base_new or stack_skills or project_skills:
+            base = {"⚡ Skills Base (lenguaje/tipo/db)": base_new} if base_new else {}
+            suggested = {**project_skills, **base, **stack_skills,
+                         **{cat: [s for s in slist if s not in listed] for cat, slist in suggested.items()}}
+        
+        # Filtrar ya habilitados de todas las categorías
+        suggested = {cat: [s for s in slist if s not in already_enabled]
+                     for cat, slist in suggested.items()}
+        suggested = {cat: slist for cat, slist in suggested.items() if slist}
+        
+        # Sumar lo que activan workspaces parecidos (el stack sólo se guarda si se acepta algo)
+        stack = {'type': detected_type, 'lang': primary_lang, 'db': detected_db}
+        listed = {s for slist in suggested.values() for s in slist}
+        similar = self._load_cooccurrence().recommend(
+            list(already_enabled) + stack_features(stack),
+            exclude=already_enabled | listed) if aggregate else []
+        if similar:
+            suggested["👥 Workspaces como este también activan"] = [s for s, _, _ in similar]
+        suggested = self._collapse_duplicates(suggested, already_enabled)
+        
+        if not suggested:
+            self._print(f"  {Colors.GREEN}✨ ¡Ya tienes todos los skills recomendados habilitados!{Colors.ENDC}\n")
+            return Result(workspace=workspace, detected=detected, stack=stack, suggestions={}, enabled=[])
+        
+        # ── Mostrar recomendaciones con selección múltiple ──
+        self._print(f"{Colors.BOLD}{'─'*50}")
+        self._print(f"  🧩 Recomendaciones ({sum(len(v) for v in suggested.values())} skills)")
+        self._print(f"{'─'*50}{Colors.ENDC}\n")
+        
+        flat_skills = []
+        for cat, slist in suggested.items():
+            self._print(f"  {Colors.BOLD}▸ {cat}:{Colors.ENDC}")
+            for s in slist:
+                flat_skills.append(s)
+                self._print(f"    {Colors.CYAN}{len(flat_skills):2}.{Colors.ENDC} {s}")
+            self._print()
+        
+        result = Result(workspace=workspace, detected=detected, stack=stack, suggestions=suggested, enabled=[])
+        if not self.interactive:
+            return result
+        
+        self._print(f"  {Colors.YELLOW}Introduce los números separados por coma (ej: 1,3,5)")
+        self._print(f"  o 'all' para todos, Enter para ninguno{Colors.ENDC}")
+        
+        try:
+            sel = input(f"\n{Colors.YELLOW}  → {Colors.ENDC}").strip()
+            if sel.lower() == 'all':
+                self._print(f"\n{Colors.YELLOW}  Habilitando todos...{Colors.ENDC}\n")
+                for s in flat_skills:
+                    if self.enable_skill(workspace, s):
+                        result['enabled'].append(s)
+                self._print(f"\n{Colors.GREEN}{'═'*70}")
+                self._print(f"  ✅ {len(flat_skills)} skills habilitados en '{workspace}'!")
+                self._print(f"{'═'*70}{Colors.ENDC}\n")
+            elif sel:
+                indices = [int(x.strip()) for x in sel.split(',') if x.strip()]
+                added = 0
+                self._print()
+                for idx in indices:
+                    if 1 <= idx <= len(flat_skills):
+                        if self.enable_skill(workspace, flat_skills[idx-1]):
+                            result['enabled'].append(flat_skills[idx-1])
+                        added += 1
+                if added:
+                    self._print(f"\n{Colors.GREEN}{'═'*70}")
+                    self._print(f"  ✅ {added} skills habilitados en '{workspace}'!")
+                    self._print(f"{'═'*70}{Colors.ENDC}\n")
+            else:
+                self._print(f"\n{Colors.CYAN}  Sin cambios.{Colors.ENDC}\n")
+        except:
+            self._print(f"\n{Colors.CYAN}  Sin cambios.{Colors.ENDC}\n")
+        if result['enabled']:
+            self._remember_stack(workspace, stack)
+        return result
+    
+    def _remember_stack(self, workspace: str, stack: dict):
+        """Guarda en skill-config.json el stack detectado (rasgos para "workspaces como este")"""
+        cfg = self.workspaces_dir / workspace / "skill-config.json"
+        config = self._load_config(cfg)
+        if config.get('stack') != stack:
+            config['stack'] = stack
+            self._save_config(cfg, config, 'stack')
+    
+    @catalog_lock
+    def sync_from_github(self, auto_fix: bool = False, mode: Optional[str] = None):
+        """Sincroniza el catálogo desde las fuentes configuradas, de forma transaccional.
+        
+        Las fuentes de skill-sources.json se descargan en paralelo y se fusionan
+        por prioridad. El catálogo resultante se prepara en una generación aparte
+        (.agent/skills/.generations/gen-*) y se publica cambiando de forma atómica el
+        symlink `public`, así que nadie ve nunca un catálogo a medias. Todo el sync va
+        con el lock de publicación (.agent/skills/.sync.lock) tomado y cada paso queda
+        en un journal con el pid del dueño: si el proceso muere, la siguiente escritura
+        del catálogo deshace la preparación o termina la publicación.
+        
+        En modo lazy (`mode='lazy'`, se recuerda hasta `mode='full'`) se guardan los
+        metadatos de todo el catálogo pero sólo se materializan los skills que usa
+        algún workspace; los que ya nadie usa se desalojan del catálogo publicado.
+        """
+        self._print(f"\n{Colors.BLUE}🔄 Sincronizando...{Colors.ENDC}\n")
+        self._recover_sync()
+        
+        try:
+            lazy_path = self.skills_dir / LAZY_CATALOG_FILE
+            if mode == 'lazy' and not lazy_path.exists():
+                self.skills_dir.mkdir(parents=True, exist_ok=True)
+                write_json_atomic(lazy_path, {'version': LAZY_CATALOG_VERSION, 'skills': {}})
+            elif mode == 'full' and lazy_path.exists():
+                lazy_path.unlink()
+            lazy = self._is_lazy()
+            self._catalog_index = None
+            wanted = self._referenced_skills() if lazy else None
+            sources_sig = self._sources_signature()
+            
+            self._print(f"{Colors.YELLOW}📦 Descargando...{Colors.ENDC}")
+            with span('sources.fetch'):
+                fetched = self._fetch_sources(sparse=wanted)
+            if not fetched:
+                self._print(f"{Colors.RED}❌ Ninguna fuente disponible{Colors.ENDC}")
+                return Result(False, 'no_sources')
+            
+            result = Result(changed=False, new=0, updated=0, shadowed={}, fixed={}, lazy=lazy)
+            pub = self.skills_dir / "public"
+            materialized = {d.name for d in pub.iterdir() if d.is_dir()} if pub.is_dir() else set()
+            # En modo lazy también hay trabajo si acaba de activarse o cambió qué skills se usan
+            known = set(self._load_lazy_catalog())
+            pending = lazy and (not known or materialized != wanted & (known | materialized))
+            # Editar skill-sources.json (prioridades, fuentes nuevas o quitadas) también es un cambio
+            if not any(changed for _, _, changed in fetched) and pub.is_symlink() and not pending \
+                    and mode != 'full' and self._generation_info().get('sources') == sources_sig:
+                self._print(f"{Colors.GREEN}✅ Sin cambios en las fuentes{Colors.ENDC}")
+            else:
+                merged, shadowed = self._merge_sources(fetched)
+                for name, (winner, losers) in sorted(shadowed.items()):
+                    self._print(f"  {Colors.CYAN}↪{Colors.ENDC} {name}: {winner} oculta a {', '.join(losers)}")
+                keep = None
+                if lazy:
+                    with span('lazy.catalog'):
+                        write_json_atomic(lazy_path, {'version': LAZY_CATALOG_VERSION,
+                                                      'skills': self._build_lazy_catalog(fetched, merged)},
+                                          separators=(',', ':'))
+                    # Las dependencias pueden haber cambiado con el catálogo nuevo
+                    self._catalog_index = None
+                    keep = self._referenced_skills()
+                    if keep - wanted:
+                        for src, _, _ in fetched:
+                            mirror = self.root_dir / ".agent" / "sources" / src['name']
+                            if (mirror / ".git").exists():
+                                self._set_sparse_checkout(mirror, src, keep)
+                    merged = {name: path for name, path in merged.items() if name in keep}
+                    self._print(f"  {Colors.CYAN}🪶 Modo lazy: {len(merged)} skills en uso de "
+                          f"{len(self._load_lazy_catalog())}{Colors.ENDC}")
+                # Manifiesto de hashes del origen, para que 'wsm verify' detecte copias a medias
+                with span('manifest.build'):
+                    manifest = self._build_manifest(merged)
+                with span('publish'):
+                    new, upd = self._publish_generation(merged, keep, info={'sources': sources_sig})
+                self._print(f"{Colors.GREEN}✅ Nuevos: {new}, Actualizados: {upd}{Colors.ENDC}")
+                self._catalog_index = None
+                manifest = {**self._load_sync_manifest(), **manifest}
+                if lazy:
+                    manifest = {name: files for name, files in manifest.items() if (pub / name).is_dir()}
+                    evicted = sorted(materialized - {d.name for d in pub.iterdir() if d.is_dir()})
+                    if evicted:
+                        self._print(f"  {Colors.YELLOW}🧹 Desalojados (sin uso): {len(evicted)}{Colors.ENDC}")
+                    result.data['evicted'] = evicted
+                self._save_sync_manifest(manifest)
+                result.data.update(changed=True, new=new, updated=upd,
+                                   shadowed={name: {'winner': w, 'shadowed': l} for name, (w, l) in shadowed.items()})
+                
+                # Con store activo, publicar las nuevas versiones (cambio de puntero `latest`)
+                if self.store_dir.is_dir():
+                    self.store_ingest(sorted(self._store_references()))
+            
+            if auto_fix:
+                result.data['fixed'] = self._fix_broken()
+            self._refresh_completion_names()
+            self._record_catalog('sync')
+            
+            self._print(f"\n{Colors.GREEN}✨ Sincronizado!{Colors.ENDC}")
+            return result
+        except Exception as e:
+            self._print(f"{Colors.RED}❌ Error: {e}{Colors.ENDC}")
+            self._recover_sync()
+            return Result(False, 'sync_failed', message=str(e))
+    
+    # ── Fuentes de skills ──
+    
+    def _load_sources(self) -> List[dict]:
+        """Fuentes de skill-sources.json (o sólo el upstream público por defecto).
+        
+        Cada fuente tiene `name`, `priority` (mayor gana) y uno de `url` (git, con
+        `ref` opcional), `path` (directorio local) o `tarball` (.tar/.tar.gz); `subdir`
+        indica dónde están los skills (por defecto `skills/` si existe, o la raíz).
+        """
+        path = self.root_dir / SOURCES_FILE
+        if not path.exists():
+            return [{'name': 'upstream', 'url': SKILLS_REPO_URL, 'priority': 0}]
+        with open(path) as f:
+            sources = json.load(f).get('sources', [])
+        names = [src['name'] for src in sources]
+        if len(set(names)) != len(names):
+            raise ValueError(f"{SOURCES_FILE}: nombres de fuente duplicados")
+        return sources
+    
+    def _sources_signature(self) -> str:
+        """Hash de la configuración de fuentes normalizada (claves ordenadas, orden de la lista)"""
+        data = json.dumps(self._load_sources(), sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(data.encode()).hexdigest()[:STORE_HASH_LEN]
+    
+    def _generation_info(self) -> dict:
+        """Metadatos de la generación publicada ({} si no tiene)"""
+        try:
+            with open(self.skills_dir / "public" / GENERATION_INFO_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _fetch_source(self, src: dict, state: dict, force: bool = False, sparse: Optional[Set[str]] = None):
+        """Actualiza una fuente de forma incremental → (directorio de skills, revisión).
+        
+        Con `sparse` (modo lazy) el working tree de un mirror git sólo contiene los
+        SKILL.md y los directorios de esos skills (git sparse-checkout).
+        """
+        import subprocess
+        import tarfile
+        mirror = self.root_dir / ".agent" / "sources" / src['name']
+        if 'url' in src:
+            ref = src.get('ref')
+            if (mirror / ".git").exists():
+                with span('git.fetch', source=src['name']):
+                    subprocess.run(["git", "-C", str(mirror), "fetch", "--depth", "1", "origin"] + ([ref] if ref else []),
+                                   check=True, capture_output=True)
+                    # trustctime=false: los hardlinks de las generaciones cambian el ctime y
+                    # no deben forzar a git a reescribir ficheros idénticos
+                    subprocess.run(["git", "-C", str(mirror), "-c", "core.trustctime=false",
+                                    "reset", "--hard", "FETCH_HEAD"],
+                                   check=True, capture_output=True)
+                self._set_sparse_checkout(mirror, src, sparse)
+            else:
+                if mirror.exists():
+                    shutil.rmtree(mirror)
+                mirror.parent.mkdir(parents=True, exist_ok=True)
+                with span('git.clone', source=src['name']):
+                    subprocess.run(["git", "clone", "--depth", "1"] + (["--branch", ref] if ref else []) +
+                                   (["--no-checkout"] if sparse is not None else []) +
+                                   [src['url'], str(mirror)], check=True, capture_output=True)
+                if sparse is not None:
+                    self._set_sparse_checkout(mirror, src, sparse)
+                    subprocess.run(["git", "-C", str(mirror), "checkout"], check=True, capture_output=True)
+            rev = subprocess.run(["git", "-C", str(mirror), "rev-parse", "HEAD"],
+                                 check=True, capture_output=True, text=True).stdout.strip()
+            root = mirror
+        elif 'tarball' in src:
+            st = os.stat(src['tarball'])
+            rev = f"{st.st_mtime_ns}:{st.st_size}"
+            if force or state.get('rev') != rev or not mirror.exists():
+                if mirror.exists():
+                    shutil.rmtree(mirror)
+                mirror.mkdir(parents=True)
+                with span('tar.extract', source=src['name']), tarfile.open(src['tarball']) as tar:
+                    if hasattr(tarfile, 'data_filter'):
+                        tar.extractall(mirror, filter='data')
+                    else:
+                        tar.extractall(mirror)
+            root = mirror
+        elif 'path' in src:
+            root = Path(src['path']).expanduser()
+            if not root.is_dir():
+                raise FileNotFoundError(f"no existe {root}")
+            sub = root / src.get('subdir', 'skills')
+            sig = hashlib.sha256()
+            for d in sorted((sub if sub.is_dir() else root).iterdir()):
+                md = d / "SKILL.md"
+                if md.exists():
+                    sig.update(f"{d.name}:{md.stat().st_mtime_ns}:{d.stat().st_mtime_ns}\n".encode())
+            rev = sig.hexdigest()[:STORE_HASH_LEN]
+        else:
+            raise ValueError("la fuente necesita 'url', 'path' o 'tarball'")
+        
+        sub = root / src.get('subdir', 'skills')
+        return (sub if sub.is_dir() else root), rev
+    
+    @staticmethod
+    def _sparse_patterns(src: dict, skills) -> List[str]:
+        """Patrones de sparse-checkout: todos los SKILL.md más los directorios de `skills`"""
+        sub = src.get('subdir', 'skills').strip('/')
+        patterns = ['/*/SKILL.md', f'/{sub}/*/SKILL.md']
+        for name in sorted(skills):
+            patterns += [f'/{name}/', f'/{sub}/{name}/']
+        return patterns
+    
+    def _set_sparse_checkout(self, mirror: Path, src: dict, sparse: Optional[Set[str]]):
+        """Ajusta el working tree de un mirror git al modo lazy (o lo devuelve a completo)"""
+        import subprocess
+        with span('git.sparse', source=src['name']):
+            if sparse is not None:
+                subprocess.run(["git", "-C", str(mirror), "sparse-checkout", "set", "--no-cone"] +
+                               self._sparse_patterns(src, sparse), check=True, capture_output=True)
+            elif (mirror / ".git" / "info" / "sparse-checkout").exists():
+                subprocess.run(["git", "-C", str(mirror), "sparse-checkout", "disable"],
+                               check=True, capture_output=True)
+                (mirror / ".git" / "info" / "sparse-checkout").unlink()
+    
+    def _fetch_sources(self, force: bool = False, sparse: Optional[Set[str]] = None) -> List[tuple]:
+        """Descarga todas las fuentes en paralelo → [(fuente, directorio, cambió)]"""
+        from concurrent.futures import ThreadPoolExecutor
+        sources = self._load_sources()
+        state_path = self.root_dir / ".agent" / "sources" / "state.json"
+        state = {}
+        if state_path.exists():
+            try:
+                with open(state_path) as f:
+                    state = json.load(f)
+            except Exception:
+                state = {}
+        
+        fetched = []
+        with ThreadPoolExecutor(max_workers=max(1, len(sources))) as pool:
+            futures = [(src, pool.submit(PROFILER.bind(self._fetch_source), src, state.get(src['name'], {}),
+                                         force, sparse))
+                       for src in sources]
+            for src, future in futures:
+                try:
+                    path, rev = future.result()
+                except Exception as e:
+                    self._print(f"  {Colors.RED}❌{Colors.ENDC} {src['name']}: {e}")
+                    continue
+                changed = state.get(src['name'], {}).get('rev') != rev
+                state[src['name']] = {'rev': rev, 'time': time.time()}
+                mark = f"{Colors.GREEN}actualizada{Colors.ENDC}" if changed else "sin cambios"
+                self._print(f"  {Colors.CYAN}•{Colors.ENDC} {src['name']} (prioridad {src.get('priority', 0)}): {mark}")
+                fetched.append((src, path, changed))
+        
+        # Quitar del estado las fuentes que ya no están configuradas
+        state = {name: v for name, v in state.items() if name in {src['name'] for src in sources}}
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(state_path, state, indent=2)
+        return fetched
+    
+    @staticmethod
+    def _merge_sources(fetched: List[tuple]):
+        """Fusión determinista: gana la mayor prioridad y, a igualdad, la que aparece antes.
+        
+        Devuelve ({skill: directorio}, {skill: (ganadora, [ocultadas])}).
+        """
+        ranked = sorted(enumerate(fetched), key=lambda p: (-p[1][0].get('priority', 0), p[0]))
+        merged, owner, shadowed = {}, {}, {}
+        for _, (src, path, _) in ranked:
+            for item in sorted(path.iterdir()):
+                if item.name.startswith('.') or not (item / "SKILL.md").exists():
+                    continue
+                if item.name in merged:
+                    shadowed.setdefault(item.name, (owner[item.name], []))[1].append(src['name'])
+                    continue
+                merged[item.name] = item
+                owner[item.name] = src['name']
+        return merged, shadowed
+    
+    def list_sources(self):
+        """Muestra las fuentes configuradas con su última revisión"""
+        state_path = self.root_dir / ".agent" / "sources" / "state.json"
+        state = {}
+        if state_path.exists():
+            with open(state_path) as f:
+                state = json.load(f)
+        sources = self._load_sources()
+        items = []
+        self._print(f"\n{Colors.BOLD}📡 Fuentes ({len(sources)}):{Colors.ENDC}\n")
+        for src in sorted(sources, key=lambda src: -src.get('priority', 0)):
+            location = src.get('url') or src.get('path') or src.get('tarball')
+            rev = state.get(src['name'], {}).get('rev', '—')
+            self._print(f"  {Colors.CYAN}{src.get('priority', 0):>4}{Colors.ENDC}  {src['name']:15} {location}")
+            self._print(f"        rev: {rev}")
+            self._emit(items, {'type': 'source', 'name': src['name'], 'priority': src.get('priority', 0),
+                               'location': location, 'rev': state.get(src['name'], {}).get('rev')})
+        self._print()
+        return Result(items=items, count=len(sources))
+    
+    # ── Catálogo lazy (materialización bajo demanda) ──
+    
+    def _is_lazy(self) -> bool:
+        return (self.skills_dir / LAZY_CATALOG_FILE).exists()
+    
+    def _load_lazy_catalog(self) -> Dict[str, dict]:
+        """Metadatos de todos los skills de las fuentes ({} si el modo lazy está apagado)"""
+        path = self.skills_dir / LAZY_CATALOG_FILE
+        if not path.exists():
+            return {}
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except Exception:
+            return {}
+        return data.get('skills', {}) if data.get('version') == LAZY_CATALOG_VERSION else {}
+    
+    def _build_lazy_catalog(self, fetched: List[tuple], merged: Dict[str, Path]) -> Dict[str, dict]:
+        """Metadatos (fuente, ruta en el mirror, tamaño, tokens, relaciones) de cada skill.
+        
+        En los mirrors git los tamaños salen de `git ls-tree -l`, sin necesidad de
+        tener los ficheros en el working tree; el SKILL.md siempre está presente.
+        """
+        import subprocess
+        owner = {str(path): src['name'] for src, path, _ in fetched}
+        sizes = {}
+        for src, path, _ in fetched:
+            mirror = self.root_dir / ".agent" / "sources" / src['name']
+            if not (mirror / ".git").exists():
+                continue
+            with span('git.ls_tree', source=src['name']):
+                out = subprocess.run(["git", "-C", str(mirror), "ls-tree", "-r", "-l", "--full-tree", "HEAD"],
+                                     check=True, capture_output=True, text=True).stdout
+            prefix = os.path.relpath(path, mirror)
+            prefix = '' if prefix == '.' else prefix + '/'
+            for line in out.splitlines():
+                info, rel = line.split('\t', 1)
+                size = info.split()[3]
+                if not rel.startswith(prefix) or size == '-':
+                    continue
+                parts = rel[len(prefix):].split('/')
+                if len(parts) < 2:
+                    continue
+                acc = sizes.setdefault(str(path / parts[0]), [0, 0])
+                acc[0] += int(size)
+                acc[1] += 1
+        
+        catalog = {}
+        for name, skill_path in merged.items():
+            size, files = sizes.get(str(skill_path)) or self._measure_tree(str(skill_path))
+            try:
+                sig = [os.stat(skill_path).st_mtime_ns, os.stat(skill_path / "SKILL.md").st_mtime_ns, size]
+            except OSError:
+                sig = []
+            catalog[name] = {
+                'source': owner.get(str(skill_path.parent)),
+                'path': str(skill_path),
+                'bytes': size,
+                'tokens': estimate_tokens(size),
+                'files': files,
+                'sig': sig,
+                **self._read_skill_relations(str(skill_path)),
+            }
+        return catalog
+    
+    def _referenced_skills(self) -> Set[str]:
+        """Skills habilitados en algún workspace, con sus dependencias (`requires`)"""
+        refs = set()
+        for c in self._workspace_configs().values():
+            refs.update(c.get('enabled_skills', []))
+        graph = self._get_skill_graph()
+        for skill in list(refs):
+            try:
+                refs.update(graph.closure(skill))
+            except ValueError:
+                pass
+        return refs
+    
+    def _materialize(self, names) -> List[str]:
+        """Modo lazy: trae al catálogo publicado los skills indicados que aún no lo estén.
+        
+        Amplía el sparse-checkout de los mirrors git (sin red: los objetos ya están
+        en el clon) y publica una generación nueva que conserva lo ya materializado.
+        """
+        import subprocess
+        if not self._is_lazy():
+            return []
+        pub = self.skills_dir / "public"
+        names = set(names)
+        lazy = self._load_lazy_catalog()
+        if all(n not in lazy or (pub / n / "SKILL.md").exists() for n in names):
+            return []
+        # Mismo lock entre procesos que sync: sparse-checkout, generación y manifiesto
+        with self._sync_lock():
+            lazy = self._load_lazy_catalog()
+            todo = sorted({n for n in names if n in lazy and not (pub / n / "SKILL.md").exists()})
+            if not todo:
+                return []
+            with span('materialize', skills=len(todo)):
+                self._recover_sync()
+                by_mirror = {}
+                for name in todo:
+                    mirror = self.root_dir / ".agent" / "sources" / str(lazy[name]['source'])
+                    if (mirror / ".git").exists():
+                        by_mirror.setdefault(mirror, []).append(os.path.relpath(lazy[name]['path'], mirror))
+                for mirror, rels in by_mirror.items():
+                    subprocess.run(["git", "-C", str(mirror), "sparse-checkout", "add"] + [f"/{r}/" for r in rels],
+                                   check=True, capture_output=True)
+                skills = {name: Path(lazy[name]['path']) for name in todo}
+                self._publish_generation(skills)
+                self._save_sync_manifest({**self._load_sync_manifest(), **self._build_manifest(skills)})
+                self._catalog_index = None
+            self._print(f"  {Colors.CYAN}📥 Materializados: {', '.join(todo)}{Colors.ENDC}")
+            return todo
+    
+    @contextlib.contextmanager
+    def _sync_lock(self, blocking: bool = True):
+        """Lock exclusivo de publicación del catálogo (flock sobre .agent/skills/.sync.lock).
+        
+        Serializa entre procesos (flock) y entre hilos (RLock), y es reentrante: un
+        sync puede publicar generaciones o recuperar su propio journal sin bloquearse.
+        Con blocking=False produce False en lugar de esperar si otro lo tiene.
+        """
+        if not self._sync_mutex.acquire(blocking):
+            yield False
+            return
+        try:
+            if not self._sync_depth:
+                self.skills_dir.mkdir(parents=True, exist_ok=True)
+                fd = os.open(self.skills_dir / SYNC_LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    if fcntl is not None:
+                        with span('sync.lock'):
+                            fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+                except BlockingIOError:
+                    os.close(fd)
+                    fd = None
+                if fd is None:
+                    yield False
+                    return
+                self._sync_fd = fd
+            self._sync_depth += 1
+            try:
+                yield True
+            finally:
+                self._sync_depth -= 1
+                if not self._sync_depth:
+                    os.close(self._sync_fd)
+                    self._sync_fd = None
+        finally:
+            self._sync_mutex.release()
+    
+    def _write_sync_journal(self, state: str, **fields):
+        journal = self.skills_dir / SYNC_JOURNAL_FILE
+        write_json_atomic(journal, {'state': state, 'pid': os.getpid(), 'time': time.time(), **fields}, indent=2)
+    
+    def _migrate_public_to_generations(self):
+        """Convierte un `public` real en la primera generación (rename O(1) + symlink)"""
+        pub = self.skills_dir / "public"
+        gens = self.skills_dir / GENERATIONS_DIR
+        gens.mkdir(parents=True, exist_ok=True)
+        if pub.is_symlink():
+            return
+        first = gens / "gen-0"
+        self._write_sync_journal('migrating', stage=first.name)
+        if pub.is_dir():
+            os.rename(pub, first)
+        else:
+            first.mkdir(exist_ok=True)
+        pub.symlink_to(os.path.join(GENERATIONS_DIR, first.name))
+        (self.skills_dir / SYNC_JOURNAL_FILE).unlink()
+    
+    @catalog_lock
+    def _publish_generation(self, skills: Dict[str, Path], keep: Optional[Set[str]] = None,
+                            copy: bool = False, info: Optional[dict] = None):
+        """Prepara una generación con `skills` ({nombre: origen}) y la publica → (nuevos, actualizados).
+        
+        Los skills de la generación actual que no vienen en `skills` se conservan; con
+        `keep` (modo lazy) sólo los que estén en ese conjunto, y el resto se desaloja.
+        Con `copy` los skills nuevos se copian siempre, sin hardlinks al mirror. `info`
+        sustituye a los metadatos de la generación (por defecto se heredan).
+        """
+        pub = self.skills_dir / "public"
+        gens = self.skills_dir / GENERATIONS_DIR
+        self._migrate_public_to_generations()
+        previous = os.path.basename(os.readlink(pub))
+        
+        stage = gens / f"gen-{time.time_ns()}"
+        self._write_sync_journal('staging', stage=stage.name, previous=previous)
+        stage.mkdir()
+        
+        # Hardlinks a los mirrors propios (.agent/sources) cuando es posible; las fuentes
+        # `path` se copian para que editar el catálogo nunca toque el directorio original
+        mirrors = self.root_dir / ".agent" / "sources"
+        with span('copy.stage', skills=len(skills)):
+            for name, src in skills.items():
+                link = not copy and mirrors in Path(src).parents
+                shutil.copytree(src, stage / name, symlinks=True, copy_function=_link_or_copy if link else copy_file,
+                                ignore=shutil.ignore_patterns('.git'))
+        current = gens / previous
+        old_names = {d.name for d in current.iterdir() if d.is_dir()} if current.is_dir() else set()
+        # Los skills que ya no están en ninguna fuente se conservan, como hasta ahora
+        carry = old_names - set(skills)
+        if keep is not None:
+            carry &= keep
+        with span('copy.carry_over'):
+            for name in sorted(carry):
+                shutil.copytree(current / name, stage / name, symlinks=True, copy_function=_link_or_copy)
+        if info is None and (current / GENERATION_INFO_FILE).is_file():
+            copy_file(current / GENERATION_INFO_FILE, stage / GENERATION_INFO_FILE)
+        elif info is not None:
+            write_json_atomic(stage / GENERATION_INFO_FILE, info, indent=2)
+        
+        self._write_sync_journal('ready', stage=stage.name, previous=previous)
+        self._finish_publish(stage.name)
+        self._index_generation(stage, set(skills))
+        return len(set(skills) - old_names), len(set(skills) & old_names)
+    
+    def _finish_publish(self, stage: str):
+        """Flip atómico de `public` y limpieza de generaciones antiguas"""
+        gens = self.skills_dir / GENERATIONS_DIR
+        self._swap_symlink(self.skills_dir / "public", os.path.join(GENERATIONS_DIR, stage))
+        self._write_sync_journal('published', stage=stage)
+        
+        # Conservar la generación anterior como copia de seguridad
+        keep = sorted((d for d in gens.iterdir() if d.is_dir() and d.name.startswith('gen-')),
+                      key=lambda d: int(d.name.split('-', 1)[1]))[-GENERATIONS_KEEP:]
+        for d in gens.iterdir():
+            if d.is_dir() and d not in keep and d.name != stage:
+                shutil.rmtree(d, onerror=_force_remove)
+        (self.skills_dir / SYNC_JOURNAL_FILE).unlink()
+    
+    def _recover_sync(self):
+        """Deshace o completa una sincronización interrumpida según el journal.
+        
+        Sólo actúa si el lock de publicación está libre (o ya es nuestro) y el
+        proceso dueño del journal ha muerto: nunca toca un sync en curso.
+        """
+        journal = self.skills_dir / SYNC_JOURNAL_FILE
+        if not journal.exists():
+            return
+        with self._sync_lock(blocking=False) as held:
+            if held:
+                self._recover_journal(journal)
+    
+    def _recover_journal(self, journal: Path):
+        try:
+            with open(journal) as f:
+                j = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception:
+            j = {}
+        owner = j.get('pid')
+        if owner != os.getpid() and pid_alive(owner):
+            return
+        state = j.get('state')
+        gens = self.skills_dir / GENERATIONS_DIR
+        pub = self.skills_dir / "public"
+        
+        if state == 'migrating':
+            if not pub.exists() and not pub.is_symlink():
+                (gens / j['stage']).mkdir(parents=True, exist_ok=True)
+                pub.symlink_to(os.path.join(GENERATIONS_DIR, j['stage']))
+            self._print(f"{Colors.YELLOW}♻️  Migración a generaciones completada{Colors.ENDC}")
+        elif state == 'staging':
+            stage = gens / j.get('stage', '')
+            if j.get('stage') and stage.exists():
+                shutil.rmtree(stage, onerror=_force_remove)
+            self._print(f"{Colors.YELLOW}♻️  Sincronización interrumpida deshecha (se mantiene {j.get('previous')}){Colors.ENDC}")
+        elif state in ('ready', 'published'):
+            if (gens / j['stage']).is_dir():
+                self._finish_publish(j['stage'])
+                # La publicación no llegó a medir los skills nuevos: que el índice se rehaga
+                (self.skills_dir / CATALOG_INDEX_FILE).unlink(missing_ok=True)
+                self._print(f"{Colors.YELLOW}♻️  Sincronización interrumpida completada ({j['stage']}){Colors.ENDC}")
+        if journal.exists():
+            journal.unlink()
+    
+    def _fix_broken(self):
+        """Repara skills rotos"""
+        available = self._get_available_skills()
+        broken = {}
+        
+        for w in self._get_workspaces():
+            cfg = w / "skill-config.json"
+            if not cfg.exists():
+                continue
+            c = self._load_config(cfg)
+            bad = [s for s in c.get('enabled_skills', []) if s not in available]
+            if bad:
+                broken[w.name] = bad
+        
+        if broken:
+            self._print(f"\n{Colors.YELLOW}⚠️  Skills rotos:{Colors.ENDC}\n")
+            for ws, skills in broken.items():
+                self._print(f"  {ws}:")
+                for s in skills:
+                    self._print(f"    {Colors.RED}❌{Colors.ENDC} {s}")
+                    self.disable_skill(ws, s)
+        return broken
+    
+    def run_wizard(self):
+        """Wizard interactivo mejorado"""
+        if not self.interactive:
+            return Result(False, 'interactive_only')
+        os.system('clear' if os.name != 'nt' else 'cls')
+        self._print(f"{Colors.CYAN}{Colors.BOLD}{'═'*70}")
+        self._print("  🧙‍♂️ WORKSPACE WIZARD")
+        self._print(f"{'═'*70}{Colors.ENDC}\n")
+        
+        ans = {}
+        skills = set()
+        selected_type = None
+        selected_lang = None
+        selected_db = None
+        
+        # ── Paso 1: Nombre ──
+        ans['name'] = input(f"{Colors.YELLOW}📝 Nombre: {Colors.ENDC}").strip()
+        if not ans['name']:
+            self._print(f"{Colors.RED}❌ Requerido{Colors.ENDC}")
+            return Result(False, 'name_required')
+        
+        ans['desc'] = input(f"{Colors.YELLOW}📄 Descripción: {Colors.ENDC}").strip()
+        
+        # ── Paso 2: Tipo de Proyecto ──
+        self._print(f"\n{Colors.BOLD}{'─'*50}")
+        self._print(f"  📦 Tipo de Proyecto")
+        self._print(f"{'─'*50}{Colors.ENDC}")
+        types = list(self.skill_database['project_types'].keys())
+        for i, t in enumerate(types, 1):
+            self._print(f"  {Colors.CYAN}{i:2}.{Colors.ENDC} {t}")
+        try:
+            choice = int(input(f"\n{Colors.YELLOW}  → {Colors.ENDC}"))
+            if 1 <= choice <= len(types):
+                selected_type = types[choice-1]
+                skills.update(self.skill_database['project_types'][selected_type])
+                self._print(f"  {Colors.GREEN}✓ {selected_type}{Colors.ENDC}")
+        except:
+            pass
+        
+        # ── Paso 3: Lenguaje ──
+        self._print(f"\n{Colors.BOLD}{'─'*50}")
+        self._print(f"  💻 Lenguaje de Programación")
+        self._print(f"{'─'*50}{Colors.ENDC}")
+        langs = list(self.skill_database['languages'].keys())
+        for i, l in enumerate(langs, 1):
+            self._print(f"  {Colors.CYAN}{i:2}.{Colors.ENDC} {l}")
+        try:
+            choice = int(input(f"\n{Colors.YELLOW}  → {Colors.ENDC}"))
+            if 1 <= choice <= len(langs):
+                selected_lang = langs[choice-1]
+                skills.update(self.skill_database['languages'][selected_lang])
+                self._print(f"  {Colors.GREEN}✓ {selected_lang}{Colors.ENDC}")
+        except:
+            pass
+        
+        # ── Paso 4: Base de Datos ──
+        self._print(f"\n{Colors.BOLD}{'─'*50}")
+        self._print(f"  🗄️  Base de Datos")
+        self._print(f"{'─'*50}{Colors.ENDC}")
+        dbs = list(self.skill_database['databases'].keys())
+        for i, d in enumerate(dbs, 1):
+            self._print(f"  {Colors.CYAN}{i:2}.{Colors.ENDC} {d}")
+        self._print(f"  {Colors.CYAN} 0.{Colors.ENDC} Ninguna")
+        try:
+            choice = int(input(f"\n{Colors.YELLOW}  → {Colors.ENDC}"))
+            if 1 <= choice <= len(dbs):
+                selected_db = dbs[choice-1]
+                skills.update(self.skill_database['databases'][selected_db])
+                self._print(f"  {Colors.GREEN}✓ {selected_db}{Colors.ENDC}")
+        except:
+            pass
+        
+        # ── Paso 5: Skills Adicionales (multi-select) ──
+        self._print(f"\n{Colors.BOLD}{'─'*50}")
+        self._print(f"  🧩 Skills Adicionales (selección múltiple)")
+        self._print(f"{'─'*50}{Colors.ENDC}")
+        
+        # Build suggested skills based on previous selections
+        suggested = self._get_suggested_skills(selected_type, selected_lang, selected_db)
+        
+        # Remove skills already selected
+        suggested = {cat: [s for s in slist if s not in skills] 
+                     for cat, slist in suggested.items()}
+        suggested = self._collapse_duplicates(suggested, set(skills))
+        
+        if suggested:
+            self._print(f"  {Colors.CYAN}Basado en tu selección, te pueden ser útiles:{Colors.ENDC}\n")
+            
+            # Flatten all suggested skills into a numbered list
+            flat_skills = []
+            for cat, slist in suggested.items():
+                self._print(f"  {Colors.BOLD}▸ {cat}:{Colors.ENDC}")
+                for s in slist:
+                    flat_skills.append(s)
+                    self._print(f"    {Colors.CYAN}{len(flat_skills):2}.{Colors.ENDC} {s}")
+                self._print()
+            
+            self._print(f"  {Colors.YELLOW}Introduce los números separados por coma (ej: 1,3,5)")
+            self._print(f"  o 'all' para todos, Enter para ninguno{Colors.ENDC}")
+            
+            try:
+                sel = input(f"\n{Colors.YELLOW}  → {Colors.ENDC}").strip()
+                if sel.lower() == 'all':
+                    skills.update(flat_skills)
+                    self._print(f"  {Colors.GREEN}✓ Todos los skills añadidos ({len(flat_skills)}){Colors.ENDC}")
+                elif sel:
+                    indices = [int(x.strip()) for x in sel.split(',') if x.strip()]
+                    added = 0
+                    for idx in indices:
+                        if 1 <= idx <= len(flat_skills):
+                            skills.add(flat_skills[idx-1])
+                            added += 1
+                    self._print(f"  {Colors.GREEN}✓ {added} skills añadidos{Colors.ENDC}")
+            except:
+                pass
+        else:
+            self._print(f"  {Colors.CYAN}No hay sugerencias adicionales{Colors.ENDC}")
+        
+        # Add essential skills
+        skills.update(self.skill_database['essential'])
+        
+        # ── Resumen Final ──
+        self._print(f"\n{Colors.BOLD}{'═'*70}")
+        self._print(f"  📋 RESUMEN")
+        self._print(f"{'═'*70}{Colors.ENDC}\n")
+        self._print(f"  {Colors.BOLD}Nombre:{Colors.ENDC}      {ans['name']}")
+        if ans.get('desc'):
+            self._print(f"  {Colors.BOLD}Descripción:{Colors.ENDC} {ans['desc']}")
+        if selected_type:
+            self._print(f"  {Colors.BOLD}Tipo:{Colors.ENDC}        {selected_type}")
+        if selected_lang:
+            self._print(f"  {Colors.BOLD}Lenguaje:{Colors.ENDC}    {selected_lang}")
+        if selected_db:
+            self._print(f"  {Colors.BOLD}Database:{Colors.ENDC}    {selected_db}")
+        
+        self._print(f"\n  {Colors.BOLD}Skills ({len(skills)}):{Colors.ENDC}\n")
+        for s in sorted(skills):
+            self._print(f"    {Colors.GREEN}✓{Colors.ENDC} {s}")
+        
+        self._print()
+        if input(f"  {Colors.YELLOW}¿Crear workspace? (s/n): {Colors.ENDC}").lower() == 's':
+            created = self.create_workspace(ans['name'], description=ans.get('desc', ''),
+                                            stack={'type': selected_type, 'lang': selected_lang, 'db': selected_db})
+            if not created:
+                return created
+            self._print(f"\n{Colors.YELLOW}  Habilitando skills...{Colors.ENDC}\n")
+            for s in skills:
+                self.enable_skill(ans['name'], s)
+            self._print(f"\n{Colors.GREEN}{'═'*70}")
+            self._print(f"  ✅ Workspace '{ans['name']}' creado con {len(skills)} skills!")
+            self._print(f"{'═'*70}{Colors.ENDC}\n")
+            self._print(f"  cd {self.workspaces_dir / ans['name']}")
+            self._print()
+            return Result(workspace=ans['name'], created=True, enabled_skills=sorted(skills))
+        return Result(workspace=ans['name'], created=False)
+    
+    def _stack_base_skills(self, language, project_type, database) -> Set[str]:
+        """Skills base de un lenguaje, tipo de proyecto y base de datos"""
+        skills = set()
+        if language and language in self.skill_database['languages']:
+            skills.update(self.skill_database['languages'][language])
+        if project_type and project_type in self.skill_database['project_types']:
+            skills.update(self.skill_database['project_types'][project_type])
+        if database and database in self.skill_database['databases']:
+            skills.update(self.skill_database['databases'][database])
+        return skills
+    
+    def _get_suggested_skills(self, project_type, language, database):
+        """Genera sugerencias de skills basadas en las selecciones del wizard"""
+        return self.rules.suggest(project_type, language, database)
+
+    def _load_skill_database(self):
+        data = self.rules.data
+        return {
+            "languages": data.get("languages", {}),
+            "project_types": data.get("project_types", {}),
+            "databases": data.get("databases", {}),
+            "essential": data.get("essential", []),
+        }
+    
+    def _load_cooccurrence(self) -> CooccurrenceIndex:
+        """Matriz de co-ocurrencias actualizada de forma incremental con los workspaces"""
+        path = self.root_dir / ".agent" / COOCCURRENCE_FILE
+        idx = CooccurrenceIndex.load(path)
+        if idx.refresh(self.workspaces_dir) and path.parent.exists():
+            try:
+                idx.save(path)
+            except OSError:
+                pass
+        return idx
+    
+    def _duplicate_clusters(self, threshold: float = DEDUPE_THRESHOLD) -> List[dict]:
+        """Grupos de casi duplicados del catálogo (firmas MinHash cacheadas en disco)"""
+        key = ('clusters', threshold)
+        index = self._load_catalog_index()
+        if self._dedupe_cache.get('index') is index and key in self._dedupe_cache:
+            return self._dedupe_cache[key]
+        with span('dedupe.minhash'):
+            path = self.skills_dir / MINHASH_FILE
+            mh = MinHashIndex.load(path)
+            if mh.refresh(self.skills_dir, index) and self.skills_dir.exists():
+                try:
+                    mh.save(path)
+                except OSError:
+                    pass
+        with span('dedupe.lsh'):
+            clusters = mh.clusters(threshold)
+        self._dedupe_cache = {'index': index, key: clusters}
+        return clusters
+    
+    def _collapse_duplicates(self, suggested: Dict[str, List[str]], enabled: Set[str]) -> Dict[str, List[str]]:
+        """Deja un único representante por grupo de casi duplicados en las sugerencias.
+        
+        Si el workspace ya tiene un skill del grupo no se sugiere ninguno; si no, se
+        conserva el primero que aparezca (las categorías ya vienen ordenadas por peso).
+        """
+        group = {name: i for i, c in enumerate(self._duplicate_clusters()) for name in c['skills']}
+        taken = {group[s] for s in enabled if s in group}
+        collapsed = {}
+        for cat, slist in suggested.items():
+            keep = []
+            for s in slist:
+                g = group.get(s)
+                if g is None:
+                    keep.append(s)
+                elif g not in taken:
+                    taken.add(g)
+                    keep.append(s)
+            if keep:
+                collapsed[cat] = keep
+        return collapsed
+    
+    def dedupe_report(self, workspace: Optional[str] = None, threshold: float = DEDUPE_THRESHOLD) -> Result:
+        """Grupos de skills casi duplicados y, por workspace, los habilitados redundantes"""
+        start = time.perf_counter()
+        index = self._load_catalog_index()
+        clusters = self._duplicate_clusters(threshold)
+        usage = self._load_cooccurrence()
+        
+        def rank(name):
+            # Representante: el más usado en los workspaces y, a igualdad, el más ligero
+            i = usage.ids.get(name)
+            return (-(usage.counts[i] if i is not None else 0), index.get(name, {}).get('tokens', 0), name)
+        
+        if workspace:
+            cfg = self.workspaces_dir / workspace / "skill-config.json"
+            if not cfg.exists():
+                self._print(f"{Colors.RED}❌ Workspace no encontrado: {workspace}{Colors.ENDC}")
+                return Result(False, 'workspace_not_found', workspace=workspace)
+            enabled = set(self._load_config(cfg).get('enabled_skills', []))
+            items = []
+            saved = 0
+            self._print(f"\n{Colors.BOLD}🧬 Skills redundantes en '{workspace}':{Colors.ENDC}\n")
+            for c in clusters:
+                overlap = sorted((s for s in c['skills'] if s in enabled), key=rank)
+                if len(overlap) < 2:
+                    continue
+                keep, drop = overlap[0], overlap[1:]
+                tokens = sum(index.get(s, {}).get('tokens', 0) for s in drop)
+                saved += tokens
+                self._print(f"  {Colors.GREEN}{keep}{Colors.ENDC} ≈ {Colors.YELLOW}{', '.join(drop)}{Colors.ENDC} "
+                      f"(similitud ≥ {c['similarity']:.0%}, ~{tokens} tokens)")
+                self._emit(items, {'type': 'redundant', 'keep': keep, 'drop': drop,
+                                   'similarity': c['similarity'], 'tokens': tokens})
+            if saved:
+                self._print(f"\n  {Colors.CYAN}💡 Deshabilitarlos ahorraría ~{saved} tokens "
+                      f"(wsm disable {workspace} <skill>){Colors.ENDC}\n")
+            else:
+                self._print(f"  {Colors.GREEN}✅ Sin redundancias{Colors.ENDC}\n")
+            return Result(workspace=workspace, items=items, tokens_saved=saved)
+        
+        items = []
+        self._print(f"\n{Colors.BOLD}🧬 {len(clusters)} grupos de casi duplicados "
+              f"({len(index)} skills, umbral {threshold:.0%}):{Colors.ENDC}\n")
+        for c in clusters:
+            members = sorted(c['skills'], key=rank)
+            self._print(f"  {Colors.GREEN}{members[0]}{Colors.ENDC} ≈ {', '.join(members[1:])} "
+                  f"{Colors.CYAN}(≥ {c['similarity']:.0%}){Colors.ENDC}")
+            self._emit(items, {'type': 'cluster', 'representative': members[0], 'skills': members,
+                               'similarity': c['similarity']})
+        
+        group = {name: i for i, c in enumerate(clusters) for name in c['skills']}
+        redundant = []
+        for ws_name, (_, basket) in sorted(usage.baskets.items()):
+            groups = [group[usage.vocab[i]] for i in basket if usage.vocab[i] in group]
+            if len(groups) != len(set(groups)):
+                redundant.append(ws_name)
+        if redundant:
+            self._print(f"\n  {Colors.YELLOW}⚠️  Workspaces con skills redundantes: {', '.join(redundant)}{Colors.ENDC}")
+            self._print(f"  {Colors.YELLOW}   Detalle: wsm dedupe <workspace>{Colors.ENDC}")
+        self._print(f"\n  ({time.perf_counter() - start:.2f}s)\n")
+        return Result(items=items, skills=len(index), threshold=threshold, redundant_workspaces=redundant)
+    
+    # ── Estado central (SQLite) ──
+    
+    def _state(self) -> Optional[StateStore]:
+        """El StateStore si existe .agent/state.db (se activa con 'wsm db import')"""
+        if self._state_store is None:
+            with self._state_lock:
+                if self._state_store is None:
+                    path = self.root_dir / ".agent" / STATE_DB_FILE
+                    self._state_store = StateStore(path) if path.exists() else False
+        return self._state_store or None
+    
+    def _load_config(self, cfg: Path) -> dict:
+        """skill-config.json de un workspace; con estado SQLite, desde la base de datos.
+        
+        Si el JSON se editó a mano después de la última escritura de wsm (su mtime
+        no coincide con el registrado), se reimporta: la edición manda.
+        """
+        state = self._state()
+        if state is None:
+            return read_config(cfg)
+        name = cfg.parent.name
+        row = state.get_workspace(name)
+        mtime = os.stat(cfg).st_mtime_ns
+        if row and row[1] == mtime:
+            return row[0]
+        config = read_config(cfg)
+        state.put_workspace(name, config, mtime, 'import')
+        return config
+    
+    def _save_config(self, cfg: Path, config: dict, op: str, detail: Optional[str] = None):
+        """Escribe skill-config.json y, con estado SQLite, lo registra en la misma transacción"""
+        state = self._state()
+        if state is None:
+            write_config(cfg, config)
+            return
+        with state.transaction():
+            write_config(cfg, config)
+            state.put_workspace(cfg.parent.name, config, os.stat(cfg).st_mtime_ns, op, detail)
+    
+    def _reconcile_state(self, state: StateStore) -> Set[str]:
+        """Reimporta los skill-config.json nuevos o editados a mano → workspaces en disco.
+        
+        Un scandir de workspaces/ y un stat por config; sólo se leen los JSON cuyo
+        mtime no coincide con el registrado. Se llama antes de cualquier consulta
+        que cruce workspaces, igual que _load_config lo hace para uno solo.
+        """
+        recorded = state.json_mtimes()
+        on_disk, stale = set(), []
+        if self.workspaces_dir.is_dir():
+            with os.scandir(self.workspaces_dir) as it:
+                for entry in it:
+                    if entry.name.startswith('.') or not entry.is_dir():
+                        continue
+                    try:
+                        mtime = os.stat(os.path.join(entry.path, "skill-config.json")).st_mtime_ns
+                    except OSError:
+                        continue
+                    on_disk.add(entry.name)
+                    if recorded.get(entry.name) != mtime:
+                        stale.append((entry.name, mtime))
+        if stale:
+            with state.transaction():
+                for name, mtime in stale:
+                    try:
+                        config = read_config(self.workspaces_dir / name / "skill-config.json")
+                    except (OSError, ValueError):
+                        continue
+                    state.put_workspace(name, config, mtime, 'import')
+        return on_disk
+    
+    def _workspace_configs(self) -> Dict[str, dict]:
+        """{workspace: config} de todos los workspaces (una consulta con estado SQLite)"""
+        state = self._state()
+        if state is not None:
+            on_disk = self._reconcile_state(state)
+            return {name: c for name, c in state.workspaces().items() if name in on_disk}
+        configs = {}
+        for w in self._get_workspaces():
+            cfg = w / "skill-config.json"
+            if cfg.exists():
+                configs[w.name] = read_config(cfg)
+        return configs
+    
+    def _record_catalog(self, op: str):
+        """Copia los metadatos del catálogo al estado SQLite tras un sync/import"""
+        state = self._state()
+        if state is not None:
+            with state.transaction():
+                state.replace_catalog(self._load_catalog_index())
+                state.log(op)
+    
+    def who_uses(self, skill: str) -> Result:
+        """Workspaces que tienen habilitado un skill"""
+        state = self._state()
+        if state is not None:
+            on_disk = self._reconcile_state(state)
+            names = [name for name in state.who_uses(skill) if name in on_disk]
+        else:
+            names = sorted(name for name, c in self._workspace_configs().items()
+                           if skill in c.get('enabled_skills', []))
+        if not names and skill not in self._load_catalog_index():
+            suggestions = self._skill_not_found(skill)
+            return Result(False, 'skill_not_found', skill=skill, suggestions=suggestions)
+        
+        items = []
+        self._print(f"\n{Colors.BOLD}🔎 {skill}: {len(names)} workspaces{Colors.ENDC}\n")
+        for name in names:
+            self._print(f"  {Colors.CYAN}•{Colors.ENDC} {name}")
+            self._emit(items, {'type': 'workspace', 'name': name})
+        self._print()
+        return Result(skill=skill, items=items, count=len(names))
+    
+    def state_import(self) -> Result:
+        """Crea o refresca .agent/state.db desde los skill-config.json (el JSON manda)"""
+        agent = self.root_dir / ".agent"
+        if not agent.is_dir():
+            self._print(f"{Colors.RED}❌ Proyecto sin inicializar (falta .agent/){Colors.ENDC}")
+            return Result(False, 'not_initialized')
+        created = not (agent / STATE_DB_FILE).exists()
+        with self._state_lock:
+            self._state_store = StateStore(agent / STATE_DB_FILE)
+        state = self._state_store
+        
+        start = time.perf_counter()
+        names = set()
+        with state.transaction():
+            for w in self._get_workspaces():
+                cfg = w / "skill-config.json"
+                if not cfg.exists():
+                    continue
+                try:
+                    config = read_config(cfg)
+                except ValueError as e:
+                    self._print(f"  {Colors.RED}❌ {w.name}: {e}{Colors.ENDC}")
+                    continue
+                state.put_workspace(w.name, config, os.stat(cfg).st_mtime_ns)
+                names.add(w.name)
+            removed = sorted(set(state.json_mtimes()) - names)
+            for name in removed:
+                state.delete_workspace(name, 'db-prune')
+            state.replace_catalog(self._load_catalog_index())
+            state.log('db-import', detail=f"{len(names)} workspaces")
+        
+        self._print(f"{Colors.GREEN}✅ {'Creado' if created else 'Actualizado'}: "
+              f"{(agent / STATE_DB_FILE).relative_to(self.root_dir)} — {len(names)} workspaces, "
+              f"{len(self._load_catalog_index())} skills ({time.perf_counter() - start:.2f}s){Colors.ENDC}")
+        for name in removed:
+            self._print(f"  {Colors.YELLOW}− {name}{Colors.ENDC} (ya no existe)")
+        return Result(path=str(agent / STATE_DB_FILE), created=created, workspaces=len(names), removed=removed)
+    
+    def state_export(self) -> Result:
+        """Reescribe los skill-config.json desde el estado SQLite (la base de datos manda)"""
+        state = self._state()
+        if state is None:
+            self._print(f"{Colors.RED}❌ No hay estado SQLite. Créalo con 'wsm db import'.{Colors.ENDC}")
+            return Result(False, 'no_state')
+        exported, missing = [], []
+        with state.transaction():
+            for name, config in state.workspaces().items():
+                path = self.workspaces_dir / name
+                if not path.is_dir():
+                    missing.append(name)
+                    continue
+                self._save_config(path / "skill-config.json", config, 'db-export')
+                exported.append(name)
+        self._print(f"{Colors.GREEN}✅ Exportados: {len(exported)} skill-config.json{Colors.ENDC}")
+        if missing:
+            self._print(f"{Colors.YELLOW}⚠️  Sin directorio (usa 'wsm db check --repair'): {', '.join(missing)}{Colors.ENDC}")
+        return Result(exported=exported, missing=missing)
+    
+    def state_check(self, repair: bool = False) -> Result:
+        """Compara el estado SQLite con los skill-config.json y el catálogo"""
+        state = self._state()
+        if state is None:
+            self._print(f"{Colors.RED}❌ No hay estado SQLite. Créalo con 'wsm db import'.{Colors.ENDC}")
+            return Result(False, 'no_state')
+        
+        recorded = state.json_mtimes()
+        issues = {'untracked': [], 'orphaned': [], 'modified': [], 'catalog': False, 'unknown_skills': {}}
+        on_disk = {}
+        for w in self._get_workspaces():
+            cfg = w / "skill-config.json"
+            if cfg.exists():
+                on_disk[w.name] = cfg
+        issues['untracked'] = sorted(set(on_disk) - set(recorded))
+        issues['orphaned'] = sorted(set(recorded) - set(on_disk))
+        configs = state.workspaces()
+        for name in sorted(set(on_disk) & set(recorded)):
+            if os.stat(on_disk[name]).st_mtime_ns != recorded[name] and read_config(on_disk[name]) != configs[name]:
+                issues['modified'].append(name)
+        index = self._load_catalog_index()
+        issues['catalog'] = state.catalog_names() != set(index)
+        for name, c in configs.items():
+            unknown = [s for s in c.get('enabled_skills', []) if s not in index]
+            if unknown:
+                issues['unknown_skills'][name] = unknown
+        
+        labels = [('untracked', "no están en la base de datos"), ('orphaned', "en la base de datos pero sin directorio"),
+                  ('modified', "skill-config.json editado fuera de wsm")]
+        for key, label in labels:
+            if issues[key]:
+                self._print(f"  {Colors.YELLOW}⚠️  {label}: {', '.join(issues[key])}{Colors.ENDC}")
+        if issues['catalog']:
+            self._print(f"  {Colors.YELLOW}⚠️  metadatos del catálogo desactualizados{Colors.ENDC}")
+        for name, unknown in sorted(issues['unknown_skills'].items()):
+            self._print(f"  {Colors.YELLOW}⚠️  {name}: skills fuera del catálogo: {', '.join(unknown)}{Colors.ENDC}")
+        
+        consistent = not any(issues[key] for key, _ in labels) and not issues['catalog']
+        if consistent:
+            self._print(f"{Colors.GREEN}✅ Estado consistente: {len(configs)} workspaces{Colors.ENDC}")
+            return Result(**issues)
+        if not repair:
+            self._print(f"{Colors.YELLOW}   Usa 'wsm db check --repair' (el JSON manda) o 'wsm db export' (la base de datos manda).{Colors.ENDC}")
+            return Result(False, 'inconsistent', **issues)
+        
+        with state.transaction():
+            for name in issues['untracked'] + issues['modified']:
+                state.put_workspace(name, read_config(on_disk[name]), os.stat(on_disk[name]).st_mtime_ns, 'db-repair')
+            for name in issues['orphaned']:
+                state.delete_workspace(name, 'db-repair')
+            if issues['catalog']:
+                state.replace_catalog(index)
+        self._print(f"{Colors.GREEN}✅ Reparado{Colors.ENDC}")
+        return Result(repaired=True, **issues)
+    
+    def state_history(self, workspace: Optional[str] = None, limit: int = 20) -> Result:
+        """Últimas operaciones registradas en el estado SQLite"""
+        state = self._state()
+        if state is None:
+            self._print(f"{Colors.RED}❌ No hay estado SQLite. Créalo con 'wsm db import'.{Colors.ENDC}")
+            return Result(False, 'no_state')
+        items = []
+        for entry in reversed(state.history(workspace, limit)):
+            when = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['ts']))
+            self._print(f"  {Colors.CYAN}{when}{Colors.ENDC}  {entry['op']:14} {entry['workspace'] or '':20} {entry['detail'] or ''}")
+            self._emit(items, {'type': 'operation', **entry})
+        return Result(items=items)
+    
+    def _get_workspaces(self):
+        if not self.workspaces_dir.exists():
+            return []
+        return [d for d in self.workspaces_dir.iterdir() if d.is_dir() and not d.name.startswith('.')]
+    
+    def _get_available_skills(self):
+        skills = set()
+        with span('catalog.scan'):
+            for cat in ['public', 'private', 'user']:
+                p = self.skills_dir / cat
+                if p.exists():
+                    for d in p.iterdir():
+                        count('files_stat', 2)
+                        if d.is_dir() and (d / "SKILL.md").exists():
+                            skills.add(d.name)
+        skills.update(self._load_lazy_catalog())
+        return skills
+    
+    def _load_catalog_index(self) -> Dict[str, dict]:
+        """Índice del catálogo (categoría, bytes, tokens) cacheado en disco.
+        
+        Una entrada se reutiliza mientras no cambien los mtime del directorio del
+        skill y de su SKILL.md, así que sólo se vuelven a medir los skills nuevos o
+        modificados. Los tamaños de `public` ya los deja al día cada publicación
+        (_index_generation); una edición a mano dentro de un skill que no toque
+        esos dos mtime la detecta `wsm verify`, no este índice.
+        """
+        if self._catalog_index is not None:
+            return self._catalog_index
+        
+        with span('catalog.index'):
+            index_path = self.skills_dir / CATALOG_INDEX_FILE
+            cached = self._read_catalog_index_file()
+            
+            index = {}
+            dirty = False
+            for cat in CATALOG_CATEGORIES:
+                p = self.skills_dir / cat
+                if not p.is_dir():
+                    continue
+                with os.scandir(p) as it:
+                    for entry in it:
+                        if entry.name.startswith('.') or entry.name in index:
+                            continue
+                        try:
+                            if not entry.is_dir():
+                                continue
+                            skill_md = os.stat(os.path.join(entry.path, "SKILL.md"))
+                            count('files_stat', 2)
+                        except OSError:
+                            continue
+                        sig = [entry.stat().st_mtime_ns, skill_md.st_mtime_ns]
+                        prev = cached.get(entry.name)
+                        if prev and prev.get('category') == cat and prev.get('sig') == sig:
+                            index[entry.name] = prev
+                            continue
+                        index[entry.name] = self._index_entry(cat, entry.path, sig)
+                        dirty = True
+            
+            if (dirty or index.keys() != cached.keys()) and self.skills_dir.exists():
+                try:
+                    write_json_atomic(index_path, {'version': CATALOG_INDEX_VERSION, 'skills': index})
+                except OSError:
+                    pass
+            
+            # Modo lazy: los skills sin materializar entran con los metadatos del mirror
+            for name, entry in self._load_lazy_catalog().items():
+                if name not in index:
+                    index[name] = {**entry, 'category': 'public', 'lazy': True}
+        
+        self._catalog_index = index
+        return index
+    
+    def _read_catalog_index_file(self) -> Dict[str, dict]:
+        try:
+            with open(self.skills_dir / CATALOG_INDEX_FILE) as f:
+                data = json.load(f)
+        except Exception:
+            return {}
+        return data.get('skills', {}) if data.get('version') == CATALOG_INDEX_VERSION else {}
+    
+    def _index_entry(self, category: str, path: str, sig: list) -> dict:
+        """Entrada del índice del catálogo: mide el skill y lee sus relaciones"""
+        size, files = self._measure_tree(path)
+        entry = {'category': category, 'bytes': size, 'tokens': estimate_tokens(size),
+                 'files': files, 'sig': sig}
+        entry.update(self._read_skill_relations(path))
+        return entry
+    
+    def _index_generation(self, stage: Path, changed: Set[str]):
+        """Al publicar una generación, mide sólo los skills que trae `changed`.
+        
+        Los arrastrados de la generación anterior conservan su entrada con la firma
+        nueva (la copia cambia el inodo, no el contenido).
+        """
+        with span('catalog.index.publish', skills=len(changed)):
+            cached = self._read_catalog_index_file()
+            index = {n: e for n, e in cached.items() if e.get('category') != 'public'}
+            with os.scandir(stage) as it:
+                for entry in it:
+                    if entry.name.startswith('.') or not entry.is_dir():
+                        continue
+                    try:
+                        sig = [entry.stat().st_mtime_ns,
+                               os.stat(os.path.join(entry.path, "SKILL.md")).st_mtime_ns]
+                    except OSError:
+                        continue
+                    prev = cached.get(entry.name)
+                    if entry.name not in changed and prev and prev.get('category') == 'public':
+                        index[entry.name] = {**prev, 'sig': sig}
+                    else:
+                        index[entry.name] = self._index_entry('public', entry.path, sig)
+            try:
+                write_json_atomic(self.skills_dir / CATALOG_INDEX_FILE,
+                                  {'version': CATALOG_INDEX_VERSION, 'skills': index})
+            except OSError:
+                pass
+        self._catalog_index = None
+    
+    @staticmethod
+    def _read_skill_relations(path: str) -> dict:
+        """`requires`/`conflicts` del frontmatter de SKILL.md (sólo los que existan)"""
+        try:
+            with open(os.path.join(path, "SKILL.md"), encoding='utf-8', errors='replace') as f:
+                fm = parse_frontmatter(f.read(1 << 16))
+        except OSError:
+            return {}
+        return {key: fm[key] for key in FRONTMATTER_LIST_KEYS if fm.get(key)}
+    
+    def _get_skill_graph(self) -> SkillGraph:
+        """Grafo de dependencias del índice actual (se reconstruye si el índice cambia)"""
+        index = self._load_catalog_index()
+        if self._skill_graph is None or self._skill_graph.index is not index:
+            self._skill_graph = SkillGraph(index)
+        return self._skill_graph
+    
+    def _get_name_index(self) -> NameIndex:
+        """Índice de trigramas de los nombres del catálogo (se reconstruye si el índice cambia)"""
+        index = self._load_catalog_index()
+        if self._name_index is None or self._name_index[0] is not index:
+            self._name_index = (index, NameIndex(index))
+        return self._name_index[1]
+    
+    def _skill_not_found(self, skill: str, lang: str = 'es') -> List[str]:
+        """Informa de un skill inexistente con sugerencias; devuelve las sugerencias"""
+        suggestions = self._get_name_index().suggest(skill)
+        if lang == 'es':
+            self._print(f"{Colors.RED}❌ Skill no encontrado: {skill}{Colors.ENDC}")
+            if suggestions:
+                self._print(f"{Colors.YELLOW}   ¿Quisiste decir: {', '.join(suggestions)}?{Colors.ENDC}")
+            else:
+                self._print(f"{Colors.YELLOW}   Usa 'wsm list-skills' para ver el catálogo completo.{Colors.ENDC}")
+        else:
+            self._print(f"{Colors.RED}❌ Skill not found: {skill}{Colors.ENDC}")
+            if suggestions:
+                self._print(f"{Colors.YELLOW}   Did you mean: {', '.join(suggestions)}?{Colors.ENDC}")
+            else:
+                self._print(f"{Colors.YELLOW}   Use 'wsm list-skills' to see the full catalog.{Colors.ENDC}")
+        return suggestions
+    
+    def complete_skill_names(self, prefix: str = '') -> Result:
+        """Nombres del catálogo que empiezan por `prefix`"""
+        names = self._get_name_index().complete(prefix)
+        return Result(prefix=prefix, items=names)
+    
+    def _refresh_completion_names(self):
+        """Reescribe .agent/.completion/{skills,workspaces} si cambiaron.
+        
+        Son los ficheros que leen los scripts de `wsm completion`: un nombre por
+        línea, para que el TAB no tenga que arrancar Python.
+        """
+        agent = self.root_dir / ".agent"
+        if not agent.is_dir():
+            return
+        workspaces = []
+        if self.workspaces_dir.is_dir():
+            workspaces = sorted(d.name for d in self.workspaces_dir.iterdir()
+                                if (d / "skill-config.json").exists())
+        out = agent / COMPLETION_DIR
+        out.mkdir(exist_ok=True)
+        for kind, names in (('skills', sorted(self._load_catalog_index())), ('workspaces', workspaces)):
+            path = out / kind
+            text = ''.join(f"{name}\n" for name in names)
+            try:
+                if path.read_text(encoding='utf-8') == text:
+                    continue
+            except OSError:
+                pass
+            tmp = temp_path(path)
+            tmp.write_text(text, encoding='utf-8')
+            os.replace(tmp, path)
+    
+    def completion_script(self, shell: str, spec: Dict[str, dict]) -> Result:
+        """Imprime el script de autocompletado de `shell` (y deja al día los nombres que lee)"""
+        self._refresh_completion_names()
+        script = render_completion(shell, spec, self.root_dir)
+        self._print(script, end='')
+        return Result(shell=shell, script=script)
+    
+    def _measure_tree(self, path: str):
+        """Suma el tamaño de todos los ficheros de un skill → (bytes, ficheros)"""
+        size = files = 0
+        for root, dirs, names in os.walk(path):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            for name in names:
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                size += st.st_size
+                files += 1
+                count('files_stat')
+        return size, files
+    
+    def _context_cost(self, skills) -> tuple:
+        """Coste total (bytes, tokens) de una lista de skills según el índice"""
+        index = self._load_catalog_index()
+        entries = [index[s] for s in set(skills) if s in index]
+        return sum(e['bytes'] for e in entries), sum(e['tokens'] for e in entries)
+    
+    def _find_skill_path(self, skill_name: str) -> Optional[Path]:
+        """Busca un skill en las categorías del catálogo central"""
+        entry = self._load_catalog_index().get(skill_name)
+        if entry:
+            return self.skills_dir / entry['category'] / skill_name
+        for cat in ['public', 'private', 'user']:
+            candidate = self.skills_dir / cat / skill_name
+            if candidate.is_dir() and (candidate / "SKILL.md").exists():
+                return candidate
+        # También buscar en skills/ directamente (estructura alternativa del repo)
+        candidate = self.skills_dir / "skills" / skill_name
+        if candidate.is_dir() and (candidate / "SKILL.md").exists():
+            return candidate
+        return None
+    
+    def _create_skill_symlink(self, workspace: str, skill: str, config: Optional[dict] = None):
+        """Crea un symlink para un skill específico en el workspace"""
+        ws_skills_dir = self.workspaces_dir / workspace / ".agents" / "skills"
+        ws_skills_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Si es un symlink legacy (apunta al directorio completo), eliminarlo
+        if ws_skills_dir.is_symlink():
+            ws_skills_dir.unlink()
+            ws_skills_dir.mkdir(parents=True, exist_ok=True)
+        
+        link = ws_skills_dir / skill
+        if link.exists() or link.is_symlink():
+            return  # Ya existe
+        
+        skill_path = self._skill_link_target(skill, config or {})
+        if skill_path:
+            try:
+                with span('symlink.create', skill=skill):
+                    rel = os.path.relpath(skill_path, ws_skills_dir)
+                    link.symlink_to(rel)
+                count('links_created')
+            except Exception:
+                pass
+    
+    def _skill_link_target(self, skill: str, config: dict) -> Optional[Path]:
+        """Destino del symlink: versión fijada o `latest` del store, o el catálogo"""
+        versions = self.store_dir / skill
+        if versions.is_dir():
+            pinned = config.get('skill_versions', {}).get(skill)
+            if pinned and (versions / pinned).is_dir():
+                return versions / pinned
+            if (versions / STORE_LATEST).exists():
+                return versions / STORE_LATEST
+        return self._find_skill_path(skill)
+    
+    def _remove_skill_symlink(self, workspace: str, skill: str):
+        """Elimina el symlink de un skill del workspace"""
+        link = self.workspaces_dir / workspace / ".agents" / "skills" / skill
+        if link.is_symlink() or link.exists():
+            with span('symlink.remove', skill=skill):
+                if link.is_symlink():
+                    link.unlink()
+                elif link.is_dir():
+                    shutil.rmtree(link)
+    
+    def sync_workspace_skills(self, workspace: str, quiet: bool = False, verify: bool = False):
+        """Reconstruye los symlinks de skills de un workspace basándose en skill-config.json
+        
+        Si hay un skill-lock.json al día, los destinos se toman de él sin resolver
+        nada contra el catálogo; con `verify` se comprueba además el hash de cada uno
+        (también el de las versiones del store).
+        """
+        cfg_path = self.workspaces_dir / workspace / "skill-config.json"
+        if not cfg_path.exists():
+            if not quiet:
+                self._print(f"{Colors.RED}❌ Workspace no encontrado: {workspace}{Colors.ENDC}")
+            return Result(False, 'workspace_not_found', workspace=workspace)
+        
+        config = self._load_config(cfg_path)
+        
+        enabled = config.get('enabled_skills', [])
+        ws_skills_dir = self.workspaces_dir / workspace / ".agents" / "skills"
+        self._materialize(enabled)
+        
+        # Eliminar symlink legacy si existe
+        if ws_skills_dir.is_symlink():
+            ws_skills_dir.unlink()
+        
+        # Limpiar directorio de skills
+        if ws_skills_dir.exists():
+            with span('symlink.remove'):
+                for item in ws_skills_dir.iterdir():
+                    if item.is_symlink():
+                        item.unlink()
+                    elif item.is_dir():
+                        shutil.rmtree(item)
+        
+        ws_skills_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Crear symlinks para cada skill habilitado
+        lock = self._read_fresh_lock(workspace, config)
+        created = 0
+        not_found = []
+        mismatched = []
+        with span('symlink.create', workspace=workspace, skills=len(enabled)):
+            for skill in enabled:
+                entry = lock.get(skill)
+                skill_path = None
+                if entry and (self.root_dir / entry['path'] / "SKILL.md").exists():
+                    skill_path = self.root_dir / entry['path']
+                    # En el store el hash es el nombre del directorio: también se comprueba,
+                    # porque su sólo-lectura no impide que alguien lo edite
+                    if verify and hash_tree(str(skill_path)) != entry['hash']:
+                        mismatched.append(skill)
+                else:
+                    skill_path = self._skill_link_target(skill, config)
+                if skill_path:
+                    link = ws_skills_dir / skill
+                    try:
+                        rel = os.path.relpath(skill_path, ws_skills_dir)
+                        link.symlink_to(rel)
+                        count('links_created')
+                        created += 1
+                    except Exception as e:
+                        if not quiet:
+                            self._print(f"  {Colors.RED}❌{Colors.ENDC} {skill}: {e}")
+                else:
+                    not_found.append(skill)
+        
+        if not quiet:
+            self._print(f"\n{Colors.BOLD}🔗 Sync skills para '{workspace}':{Colors.ENDC}\n")
+            self._print(f"  {Colors.GREEN}✅ {created}/{len(enabled)} symlinks creados{Colors.ENDC}")
+            if lock:
+                self._print(f"  {Colors.CYAN}🔒 Destinos tomados de {LOCK_FILE}{Colors.ENDC}")
+            if mismatched:
+                self._print(f"  {Colors.YELLOW}⚠️  El contenido no coincide con el lock:{Colors.ENDC}")
+                for s in mismatched:
+                    self._print(f"    {Colors.RED}•{Colors.ENDC} {s}")
+            if not_found:
+                self._print(f"  {Colors.YELLOW}⚠️  No encontrados en catálogo:{Colors.ENDC}")
+                for s in not_found:
+                    self._print(f"    {Colors.RED}•{Colors.ENDC} {s}")
+            self._print()
+        
+        self._refresh_load_plan(workspace)
+        return Result(not mismatched, 'lock_mismatch' if mismatched else None, workspace=workspace,
+                      created=created, total=len(enabled), locked=bool(lock),
+                      not_found=not_found, mismatched=mismatched)
+    
+    @staticmethod
+    def _config_hash(config: dict) -> str:
+        """Huella de lo que determina la resolución: skills habilitados y versiones fijadas"""
+        key = json.dumps({'enabled': config.get('enabled_skills', []),
+                          'versions': config.get('skill_versions', {})}, sort_keys=True)
+        return hashlib.sha256(key.encode()).hexdigest()[:STORE_HASH_LEN]
+    
+    def _read_fresh_lock(self, workspace: str, config: dict) -> Dict[str, dict]:
+        """Entradas del skill-lock.json si sigue correspondiendo a skill-config.json"""
+        lock_path = self.workspaces_dir / workspace / LOCK_FILE
+        if not lock_path.exists():
+            return {}
+        try:
+            with open(lock_path) as f:
+                lock = json.load(f)
+        except Exception:
+            return {}
+        if lock.get('version') != LOCK_VERSION or lock.get('config_hash') != self._config_hash(config):
+            return {}
+        return lock.get('skills', {})
+    
+    def lock_workspace(self, workspace: str, quiet: bool = False):
+        """Escribe skill-lock.json con ruta, categoría y hash de cada skill habilitado"""
+        ws_path = self.workspaces_dir / workspace
+        cfg = ws_path / "skill-config.json"
+        if not cfg.exists():
+            self._print(f"{Colors.RED}❌ Workspace no encontrado: {workspace}{Colors.ENDC}")
+            return Result(False, 'workspace_not_found', workspace=workspace)
+        
+        config = self._load_config(cfg)
+        self._materialize(config.get('enabled_skills', []))
+        
+        skills = {}
+        missing = []
+        for skill in config.get('enabled_skills', []):
+            target = self._skill_link_target(skill, config)
+            if not target:
+                missing.append(skill)
+                continue
+            if target.parent.parent == self.store_dir:
+                # En el store el nombre del directorio ya es el hash (se resuelve `latest`)
+                target = target.parent / os.readlink(target) if target.is_symlink() else target
+                category, digest = 'store', target.name
+            else:
+                category, digest = self._load_catalog_index().get(skill, {}).get('category', 'skills'), hash_tree(str(target))
+            skills[skill] = {
+                'path': os.path.relpath(target, self.root_dir).replace(os.sep, '/'),
+                'category': category,
+                'hash': digest,
+            }
+        
+        lock = {
+            'version': LOCK_VERSION,
+            'workspace': workspace,
+            'config_hash': self._config_hash(config),
+            'skills': skills,
+        }
+        with open(ws_path / LOCK_FILE, 'w') as f:
+            json.dump(lock, f, indent=2)
+        
+        if not quiet:
+            self._print(f"{Colors.GREEN}🔒 {workspace}: {len(skills)} skills bloqueados en {LOCK_FILE}{Colors.ENDC}")
+            for s in missing:
+                self._print(f"    {Colors.RED}•{Colors.ENDC} {s} {Colors.YELLOW}(no está en el catálogo){Colors.ENDC}")
+        return Result(workspace=workspace, path=str(ws_path / LOCK_FILE), skills=skills, missing=missing)
+    
+    def lock_all_workspaces(self):
+        """Escribe el skill-lock.json de todos los workspaces"""
+        items = []
+        ok = True
+        for ws in sorted(w.name for w in self._get_workspaces()):
+            result = self.lock_workspace(ws)
+            ok = ok and result.ok
+            self._emit(items, {'type': 'workspace', **result.to_dict()})
+        return Result(ok, None if ok else 'lock_failed', items=items)
+    
+    def sync_all_workspaces(self, verify: bool = False):
+        """Reconstruye symlinks de todos los workspaces"""
+        workspaces = self._get_workspaces()
+        if not workspaces:
+            self._print(f"{Colors.YELLOW}📭 No hay workspaces{Colors.ENDC}")
+            return Result(items=[], count=0)
+        
+        items = []
+        ok = True
+        self._print(f"\n{Colors.BOLD}🔄 Sincronizando skills de {len(workspaces)} workspaces...{Colors.ENDC}\n")
+        # Modo lazy: una sola generación con todo lo que falte, no una por workspace
+        self._materialize(self._referenced_skills() if self._is_lazy() else ())
+        for ws in sorted(workspaces):
+            cfg = ws / "skill-config.json"
+            if cfg.exists():
+                result = self.sync_workspace_skills(ws.name, verify=verify)
+                ok = ok and result.ok
+                self._emit(items, {'type': 'workspace', **result.to_dict()})
+        self._print(f"{Colors.GREEN}✨ ¡Todos los workspaces sincronizados!{Colors.ENDC}\n")
+        return Result(ok, None if ok else 'lock_mismatch', items=items, count=len(workspaces))
+    
+    # ── Estado (drift entre config, symlinks y catálogo) ──
+    
+    def _workspace_drift(self, workspace: str) -> dict:
+        """Compara .agents/skills con skill-config.json y el catálogo sin modificar nada.
+        
+        Un único os.scandir del directorio de skills; los destinos esperados son los
+        mismos que usaría sync-skills (skill-lock.json al día, store o catálogo).
+        """
+        ws_path = self.workspaces_dir / workspace
+        config = self._load_config(ws_path / "skill-config.json")
+        enabled = config.get('enabled_skills', [])
+        ws_skills_dir = ws_path / ".agents" / "skills"
+        lock = self._read_fresh_lock(workspace, config)
+        drift = {'missing': [], 'dangling': [], 'wrong_target': [], 'unknown': [], 'extra': [],
+                 'legacy': ws_skills_dir.is_symlink()}
+        
+        links = {}
+        if not drift['legacy']:
+            try:
+                with os.scandir(ws_skills_dir) as it:
+                    for entry in it:
+                        links[entry.name] = entry
+            except FileNotFoundError:
+                pass
+        
+        wanted = set(enabled)
+        for skill in enabled:
+            entry = lock.get(skill)
+            if entry and (self.root_dir / entry['path'] / "SKILL.md").exists():
+                expected = self.root_dir / entry['path']
+            else:
+                expected = self._skill_link_target(skill, config)
+            if expected is None:
+                drift['unknown'].append(skill)
+                continue
+            if drift['legacy']:
+                continue
+            link = links.get(skill)
+            if link is None:
+                drift['missing'].append(skill)
+            elif not link.is_symlink():
+                drift['wrong_target'].append(skill)
+            elif not link.is_dir():
+                drift['dangling'].append(skill)
+            elif os.path.normpath(os.path.join(ws_skills_dir, os.readlink(link.path))) != os.path.normpath(expected):
+                drift['wrong_target'].append(skill)
+        # sync-skills elimina los symlinks y directorios sobrantes (no los ficheros sueltos)
+        drift['extra'] = sorted(name for name, entry in links.items()
+                                if name not in wanted and (entry.is_symlink() or entry.is_dir()))
+        drift['drift'] = bool(drift['legacy'] or any(drift[k] for k in ('missing', 'dangling', 'wrong_target',
+                                                                        'unknown', 'extra')))
+        return drift
+    
+    def workspace_status(self, workspace: Optional[str] = None, all_workspaces: bool = False,
+                         jobs: int = 8) -> Result:
+        """Informe de sólo lectura: qué corregiría 'wsm sync-skills' en cada workspace"""
+        from concurrent.futures import ThreadPoolExecutor
+        if all_workspaces:
+            names = sorted(w.name for w in self._get_workspaces() if (w / "skill-config.json").exists())
+        else:
+            if workspace is None:
+                # Dentro de workspaces/<nombre>/...: ese workspace
+                try:
+                    workspace = Path.cwd().resolve().relative_to(self.workspaces_dir.resolve()).parts[0]
+                except (ValueError, IndexError):
+                    self._print(f"{Colors.RED}❌ Indica un workspace o usa --all{Colors.ENDC}")
+                    return Result(False, 'workspace_required')
+            if not (self.workspaces_dir / workspace / "skill-config.json").exists():
+                self._print(f"{Colors.RED}❌ Workspace no encontrado: {workspace}{Colors.ENDC}")
+                return Result(False, 'workspace_not_found', workspace=workspace)
+            names = [workspace]
+        
+        start = time.perf_counter()
+        self._load_catalog_index()
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            reports = list(pool.map(PROFILER.bind(self._workspace_drift), names))
+        elapsed = time.perf_counter() - start
+        
+        labels = [('legacy', "symlink legacy del directorio completo"), ('missing', "sin symlink"),
+                  ('dangling', "symlink roto"), ('wrong_target', "destino incorrecto"),
+                  ('unknown', "no está en el catálogo"), ('extra', "no habilitado en skill-config.json")]
+        items = []
+        drifted = 0
+        self._print(f"\n{Colors.BOLD}🩺 Estado de {len(names)} workspaces:{Colors.ENDC}\n")
+        for name, report in zip(names, reports):
+            if report['drift']:
+                drifted += 1
+                self._print(f"  {Colors.RED}✗{Colors.ENDC} {name}")
+                for key, label in labels:
+                    if key == 'legacy':
+                        if report['legacy']:
+                            self._print(f"      {Colors.YELLOW}{label}{Colors.ENDC}")
+                    elif report[key]:
+                        self._print(f"      {Colors.YELLOW}{label}:{Colors.ENDC} {', '.join(report[key])}")
+            elif not all_workspaces:
+                self._print(f"  {Colors.GREEN}✓{Colors.ENDC} {name}")
+            self._emit(items, {'type': 'workspace', 'workspace': name, **report})
+        
+        if drifted:
+            self._print(f"\n{Colors.YELLOW}⚠️  {drifted}/{len(names)} workspaces con drift ({elapsed:.2f}s). "
+                  f"Corrige con 'wsm sync-skills [workspace]'{Colors.ENDC}\n")
+        else:
+            self._print(f"\n{Colors.GREEN}✅ Sin drift: {len(names)} workspaces ({elapsed:.2f}s){Colors.ENDC}\n")
+        return Result(not drifted, 'drift' if drifted else None, items=items,
+                      count=len(names), drifted=drifted)
+
+    # ── Store direccionado por contenido ──
+    
+    def store_ingest(self, skills: Optional[List[str]] = None, quiet: bool = False) -> Result:
+        """Guarda en el store la versión actual de los skills del catálogo.
+        
+        Cada versión vive una sola vez en .agent/store/<skill>/<hash>/ (inmutable,
+        ficheros de sólo lectura) y `latest` se publica con un cambio atómico de
+        symlink, así que los workspaces que no fijan versión se actualizan al instante.
+        """
+        index = self._load_catalog_index()
+        names = skills or sorted(n for n in index if not index[n].get('lazy'))
+        self._materialize(names)
+        added = 0
+        not_found = []
+        for skill in names:
+            src = self._find_skill_path(skill)
+            if not src:
+                if not quiet:
+                    self._print(f"  {Colors.RED}❌{Colors.ENDC} {skill}: no está en el catálogo")
+                not_found.append(skill)
+                continue
+            digest = hash_tree(str(src))
+            versions = self.store_dir / skill
+            dest = versions / digest
+            if not dest.exists():
+                versions.mkdir(parents=True, exist_ok=True)
+                tmp = temp_path(dest)
+                with span('copy.store', skill=skill):
+                    shutil.copytree(src, tmp, symlinks=True, copy_function=copy_file)
+                for root, _, files in os.walk(tmp):
+                    for name in files:
+                        f = os.path.join(root, name)
+                        if not os.path.islink(f):
+                            os.chmod(f, stat.S_IMODE(os.stat(f).st_mode) & ~0o222)
+                try:
+                    os.replace(tmp, dest)
+                    added += 1
+                except OSError:
+                    # Otro proceso publicó la misma versión mientras copiábamos
+                    if not dest.is_dir():
+                        raise
+                    shutil.rmtree(tmp, onerror=_force_remove)
+            self._swap_symlink(versions / STORE_LATEST, digest)
+        if not quiet:
+            self._print(f"{Colors.GREEN}✅ Store: {added} versiones nuevas ({len(names)} skills){Colors.ENDC}")
+        return Result(added=added, skills=len(names), not_found=not_found)
+    
+    @staticmethod
+    def _swap_symlink(link: Path, target: str):
+        """Apunta `link` a `target` de forma atómica (symlink temporal + rename)"""
+        if link.is_symlink() and os.readlink(link) == target:
+            return
+        tmp = temp_path(link)
+        if tmp.is_symlink():
+            tmp.unlink()
+        with span('symlink.swap', target=target):
+            tmp.symlink_to(target)
+            os.replace(tmp, link)
+        count('links_created')
+    
+    def _store_references(self) -> Dict[str, Set[str]]:
+        """Versiones del store referenciadas por algún workspace (o por `latest`)"""
+        refs = {}
+        if self.store_dir.is_dir():
+            for versions in self.store_dir.iterdir():
+                latest = versions / STORE_LATEST
+                if latest.is_symlink():
+                    refs.setdefault(versions.name, set()).add(os.readlink(latest))
+        for c in self._workspace_configs().values():
+            for skill, digest in c.get('skill_versions', {}).items():
+                refs.setdefault(skill, set()).add(digest)
+        return refs
+    
+    def store_list(self, skill: Optional[str] = None):
+        """Lista versiones del store con su tamaño y si están referenciadas"""
+        if not self.store_dir.is_dir():
+            self._print(f"{Colors.YELLOW}📭 Store vacío (usa 'wsm store ingest'){Colors.ENDC}")
+            return Result(items=[], count=0)
+        refs = self._store_references()
+        items = []
+        skills = [skill] if skill else sorted(d.name for d in self.store_dir.iterdir() if d.is_dir())
+        self._print(f"\n{Colors.BOLD}🗄️  Store ({len(skills)} skills):{Colors.ENDC}\n")
+        for name in skills:
+            versions = self.store_dir / name
+            if not versions.is_dir():
+                self._print(f"  {Colors.RED}❌{Colors.ENDC} {name}: sin versiones")
+                self._emit(items, {'type': 'skill', 'name': name, 'versions': []})
+                continue
+            latest = os.readlink(versions / STORE_LATEST) if (versions / STORE_LATEST).is_symlink() else None
+            self._print(f"  {Colors.CYAN}•{Colors.ENDC} {name}")
+            found = []
+            for v in sorted(d.name for d in versions.iterdir() if not d.name.startswith('.') and not d.is_symlink()):
+                size = self._measure_tree(str(versions / v))[0]
+                mark = f" {Colors.GREEN}← latest{Colors.ENDC}" if v == latest else ""
+                used = "" if v in refs.get(name, ()) else f" {Colors.YELLOW}(sin referencias){Colors.ENDC}"
+                self._print(f"      {v}  {format_bytes(size):>9}{mark}{used}")
+                found.append({'version': v, 'bytes': size, 'latest': v == latest,
+                              'referenced': v in refs.get(name, ())})
+            self._emit(items, {'type': 'skill', 'name': name, 'latest': latest, 'versions': found})
+        self._print()
+        return Result(items=items, count=len(skills))
+    
+    @state_transaction
+    def pin_skill(self, workspace: str, skill: str, version: Optional[str] = None, unpin: bool = False):
+        """Fija un skill de un workspace a una versión del store (o lo deja flotar en latest)"""
+        cfg = self.workspaces_dir / workspace / "skill-config.json"
+        if not cfg.exists():
+            self._print(f"{Colors.RED}❌ Workspace no encontrado{Colors.ENDC}")
+            return Result(False, 'workspace_not_found', workspace=workspace)
+        versions = self.store_dir / skill
+        if not unpin:
+            if version is None:
+                if not (versions / STORE_LATEST).is_symlink():
+                    self._print(f"{Colors.RED}❌ {skill} no está en el store (usa 'wsm store ingest {skill}'){Colors.ENDC}")
+                    return Result(False, 'not_in_store', skill=skill)
+                version = os.readlink(versions / STORE_LATEST)
+            if not (versions / version).is_dir():
+                self._print(f"{Colors.RED}❌ Versión no encontrada: {skill}@{version}{Colors.ENDC}")
+                return Result(False, 'version_not_found', skill=skill, version=version)
+        
+        c = self._load_config(cfg)
+        pins = c.setdefault('skill_versions', {})
+        if unpin:
+            pins.pop(skill, None)
+        else:
+            pins[skill] = version
+        self._save_config(cfg, c, 'unpin' if unpin else 'pin', skill if unpin else f"{skill}@{version}")
+        
+        if skill in c.get('enabled_skills', []):
+            self._remove_skill_symlink(workspace, skill)
+            self._create_skill_symlink(workspace, skill, c)
+        
+        if unpin:
+            self._print(f"{Colors.GREEN}✅ {skill} en {workspace} sigue a latest{Colors.ENDC}")
+        else:
+            self._print(f"{Colors.GREEN}✅ {skill} en {workspace} fijado a {version}{Colors.ENDC}")
+        return Result(workspace=workspace, skill=skill, version=None if unpin else version)
+    
+    def store_gc(self, dry_run: bool = False):
+        """Elimina del store las versiones que ningún workspace referencia"""
+        if not self.store_dir.is_dir():
+            self._print(f"{Colors.YELLOW}📭 Store vacío{Colors.ENDC}")
+            return Result(removed=[], freed=0, dry_run=dry_run)
+        refs = self._store_references()
+        removed = []
+        leftovers = []
+        freed = 0
+        for versions in sorted(self.store_dir.iterdir()):
+            if not versions.is_dir():
+                continue
+            for v in versions.iterdir():
+                if v.is_symlink() or v.name in refs.get(versions.name, ()):
+                    continue
+                if v.name.startswith('.'):
+                    # Copia a medias de un `store ingest` (.<hash>.<pid>-<hilo>.tmp), no una
+                    # versión: se respeta mientras su proceso siga vivo
+                    owner = v.name.rsplit('.', 2)[-2].split('-')[0] if v.name.endswith('.tmp') else ''
+                    if owner.isdigit() and pid_alive(int(owner)):
+                        continue
+                    size = self._measure_tree(str(v))[0]
+                    self._print(f"  {Colors.YELLOW}🧹{Colors.ENDC} {versions.name}/{v.name}  {format_bytes(size)}"
+                                f"  {Colors.YELLOW}(temporal de una ingesta interrumpida){Colors.ENDC}")
+                    leftovers.append(f"{versions.name}/{v.name}")
+                else:
+                    size = self._measure_tree(str(v))[0]
+                    self._print(f"  {Colors.RED}🗑{Colors.ENDC}  {versions.name}@{v.name}  {format_bytes(size)}")
+                    removed.append(f"{versions.name}@{v.name}")
+                if not dry_run:
+                    shutil.rmtree(v, onerror=_force_remove)
+                freed += size
+            if not dry_run and not any(versions.iterdir()):
+                versions.rmdir()
+        verb = "Se eliminarían" if dry_run else "Eliminadas"
+        extra = f" y {len(leftovers)} temporales" if leftovers else ""
+        self._print(f"{Colors.GREEN}✅ {verb} {len(removed)} versiones{extra} ({format_bytes(freed)}){Colors.ENDC}")
+        return Result(removed=removed, leftovers=leftovers, freed=freed, dry_run=dry_run)
+
+    # ── Verificación de integridad ──
+    
+    def _hash_many(self, paths: List[str], use_cache: bool = True,
+                   jobs: Optional[int] = None) -> Dict[str, Optional[str]]:
+        """Hashea ficheros en paralelo, reutilizando la caché por (inodo, mtime, tamaño)"""
+        from concurrent.futures import ThreadPoolExecutor
+        cache_path = self.root_dir / ".agent" / HASH_CACHE_FILE
+        cache = {}
+        if use_cache and cache_path.exists():
+            try:
+                with open(cache_path) as f:
+                    cache = json.load(f)
+            except Exception:
+                cache = {}
+        
+        results, todo = {}, []
+        for p in paths:
+            try:
+                st = os.stat(p)
+            except OSError:
+                results[p] = None
+                continue
+            key = os.path.relpath(p, self.root_dir)
+            sig = [st.st_ino, st.st_mtime_ns, st.st_size]
+            hit = cache.get(key)
+            if hit and hit[:3] == sig:
+                results[p] = hit[3]
+            else:
+                todo.append((p, key, sig))
+        
+        count('files_stat', len(paths))
+        if todo:
+            workers = jobs or min(32, (os.cpu_count() or 1) * 2)
+            with span('hash', files=len(todo), workers=workers), ThreadPoolExecutor(max_workers=workers) as pool:
+                for (p, key, sig), digest in zip(todo, pool.map(_hash_file_or_none, [t[0] for t in todo])):
+                    results[p] = digest
+                    if digest and use_cache:
+                        cache[key] = sig + [digest]
+            if use_cache and cache_path.parent.exists():
+                write_json_atomic(cache_path, cache, separators=(',', ':'))
+        return results
+    
+    def _build_manifest(self, dirs: Dict[str, Path], use_cache: bool = False) -> Dict[str, Dict[str, str]]:
+        """{skill: {ruta relativa: sha256}} para los árboles indicados"""
+        files = {name: tree_files(str(path)) for name, path in dirs.items()}
+        hashes = self._hash_many([p for fs in files.values() for p in fs.values()], use_cache)
+        return {name: {rel: hashes[p] for rel, p in fs.items() if hashes[p]}
+                for name, fs in files.items()}
+    
+    def _load_sync_manifest(self) -> Dict[str, Dict[str, str]]:
+        path = self.skills_dir / SYNC_MANIFEST_FILE
+        if not path.exists():
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f).get('skills', {})
+        except Exception:
+            return {}
+    
+    def _save_sync_manifest(self, skills: Dict[str, Dict[str, str]]):
+        path = self.skills_dir / SYNC_MANIFEST_FILE
+        write_json_atomic(path, {'version': 1, 'skills': skills}, separators=(',', ':'))
+    
+    def verify_catalog(self, repair: bool = False, record: bool = False,
+                       jobs: Optional[int] = None) -> Result:
+        """Compara skills/public con el manifiesto de la última sincronización"""
+        pub = self.skills_dir / "public"
+        start = time.perf_counter()
+        
+        if record:
+            dirs = {d.name: d for d in pub.iterdir() if d.is_dir() and not d.name.startswith('.')} if pub.is_dir() else {}
+            self._save_sync_manifest(self._build_manifest(dirs, use_cache=True))
+            self._print(f"{Colors.GREEN}✅ Manifiesto registrado: {len(dirs)} skills{Colors.ENDC}")
+            return Result(recorded=len(dirs))
+        
+        manifest = self._load_sync_manifest()
+        if not manifest:
+            self._print(f"{Colors.YELLOW}⚠️  No hay manifiesto de sincronización.{Colors.ENDC}")
+            self._print(f"{Colors.YELLOW}   Ejecuta 'wsm sync' o 'wsm verify --record' para crearlo.{Colors.ENDC}")
+            return Result(False, 'no_manifest')
+        
+        self._print(f"\n{Colors.BLUE}🔎 Verificando {len(manifest)} skills...{Colors.ENDC}\n")
+        actual = {name: tree_files(str(pub / name)) if (pub / name).is_dir() else None for name in manifest}
+        hashes = self._hash_many([p for fs in actual.values() if fs for p in fs.values()], jobs=jobs)
+        
+        damaged = {}
+        for name in sorted(manifest):
+            files = actual[name]
+            if files is None:
+                damaged[name] = ['(skill ausente)']
+                continue
+            problems = []
+            for rel, digest in manifest[name].items():
+                if rel not in files:
+                    problems.append(f"falta {rel}")
+                elif hashes.get(files[rel]) != digest:
+                    problems.append(f"corrupto {rel}")
+            if problems:
+                damaged[name] = problems
+        
+        files_checked = sum(len(fs) for fs in manifest.values())
+        elapsed = time.perf_counter() - start
+        if not damaged:
+            self._print(f"{Colors.GREEN}✅ Catálogo íntegro: {len(manifest)} skills, {files_checked} ficheros ({elapsed:.2f}s){Colors.ENDC}\n")
+            return Result(skills=len(manifest), files=files_checked, damaged={})
+        
+        self._print(f"{Colors.RED}❌ {len(damaged)} skills dañados ({elapsed:.2f}s):{Colors.ENDC}\n")
+        for name, problems in damaged.items():
+            self._print(f"  {Colors.RED}•{Colors.ENDC} {name}")
+            for problem in problems[:10]:
+                self._print(f"      {problem}")
+            if len(problems) > 10:
+                self._print(f"      ... y {len(problems) - 10} más")
+        self._print()
+        
+        if repair:
+            repaired = self._refetch_skills(sorted(damaged))
+            return Result(len(repaired) == len(damaged), None if len(repaired) == len(damaged) else 'repair_failed',
+                          skills=len(manifest), files=files_checked, damaged=damaged, repaired=repaired)
+        self._print(f"{Colors.YELLOW}   Usa 'wsm verify --repair' para volver a descargar sólo estos skills.{Colors.ENDC}\n")
+        return Result(False, 'damaged', skills=len(manifest), files=files_checked, damaged=damaged)
+    
+    @catalog_lock
+    def _refetch_skills(self, names: List[str]) -> List[str]:
+        """Vuelve a traer de las fuentes únicamente los skills indicados (devuelve los reparados).
+        
+        Los skills reparados se copian (sin hardlinks) a una generación nueva que se
+        publica como en un sync, así que nadie ve el catálogo a medio reparar.
+        """
+        try:
+            self._print(f"{Colors.YELLOW}📦 Descargando {len(names)} skills...{Colors.ENDC}")
+            self._recover_sync()
+            merged, _ = self._merge_sources(self._fetch_sources(
+                force=True, sparse=self._referenced_skills() if self._is_lazy() else None))
+            fixed = {}
+            for name in names:
+                src = merged.get(name)
+                if not src:
+                    self._print(f"  {Colors.RED}❌{Colors.ENDC} {name}: ya no existe en ninguna fuente")
+                    continue
+                fixed[name] = src
+            self._restore_mirrors(fixed)
+            with span('publish'):
+                self._publish_generation(fixed, copy=True)
+            manifest = self._load_sync_manifest()
+            manifest.update(self._build_manifest(fixed))
+            self._save_sync_manifest(manifest)
+            self._catalog_index = None
+            self._print(f"{Colors.GREEN}✅ Reparados: {len(fixed)}/{len(names)}{Colors.ENDC}\n")
+            return sorted(fixed)
+        except Exception as e:
+            self._print(f"{Colors.RED}❌ Error: {e}{Colors.ENDC}")
+            self._recover_sync()
+            return []
+    
+    def _restore_mirrors(self, skills: Dict[str, Path]):
+        """Rehace desde los objetos de git los ficheros de esos skills en sus mirrors.
+        
+        Las generaciones enlazan (hardlink) los ficheros del mirror, así que un
+        fichero dañado en el catálogo también lo está en el working tree; un
+        `reset --hard` no lo ve si el mtime no cambió. Borrarlos y hacer checkout
+        crea ficheros nuevos y deja el inodo dañado sólo en la generación vieja.
+        """
+        import subprocess
+        mirrors = self.root_dir / ".agent" / "sources"
+        by_mirror = {}
+        for path in skills.values():
+            path = Path(path)
+            if mirrors in path.parents:
+                mirror = mirrors / path.relative_to(mirrors).parts[0]
+                if (mirror / ".git").exists():
+                    by_mirror.setdefault(mirror, []).append(path)
+        for mirror, paths in by_mirror.items():
+            with span('git.restore', source=mirror.name, skills=len(paths)):
+                for path in paths:
+                    shutil.rmtree(path)
+                subprocess.run(["git", "-C", str(mirror), "checkout", "HEAD", "--"] +
+                               [os.path.relpath(path, mirror) for path in paths],
+                               check=True, capture_output=True)
+
+    # ── Snapshots offline (export-catalog / import-catalog) ──
+    
+    def export_catalog(self, output: Optional[str] = None, fmt: Optional[str] = None) -> Result:
+        """Empaqueta skills/public en un snapshot comprimido con manifiesto de hashes.
+        
+        MANIFEST.json va como primer miembro, así 'wsm import-catalog' decide qué skills
+        extraer antes de leer el resto del archivo.
+        """
+        pub = self.skills_dir / "public"
+        if not pub.is_dir():
+            self._print(f"{Colors.RED}❌ No hay catálogo que exportar (ejecuta 'wsm init'){Colors.ENDC}")
+            return Result(False, 'no_catalog')
+        if fmt is None:
+            fmt = next((f for f in SNAPSHOT_FORMATS if output and output.endswith('.' + f)), 'tar.gz')
+        out = Path(output) if output else Path.cwd() / f"skills-catalog-{time.strftime('%Y%m%d')}.{fmt}"
+        
+        self._print(f"\n{Colors.BLUE}📦 Exportando catálogo...{Colors.ENDC}\n")
+        start = time.perf_counter()
+        dirs = {d.name: d for d in pub.iterdir() if d.is_dir() and not d.name.startswith('.')}
+        skills = self._build_manifest(dirs, use_cache=True)
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'id': hashlib.sha256(json.dumps(skills, sort_keys=True).encode()).hexdigest()[:STORE_HASH_LEN],
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'skills': skills,
+        }
+        members = [(SNAPSHOT_MANIFEST, json.dumps(snapshot, separators=(',', ':')).encode(), None)]
+        members += [(f"skills/{name}/{rel}", None, str(dirs[name] / rel))
+                    for name in sorted(skills) for rel in sorted(skills[name])]
+        
+        tmp = temp_path(out)
+        try:
+            with span('snapshot.write', files=len(members)):
+                write_snapshot(tmp, fmt, iter(members))
+            os.replace(tmp, out)
+        except Exception as e:
+            tmp.unlink(missing_ok=True)
+            self._print(f"{Colors.RED}❌ Error: {e}{Colors.ENDC}")
+            return Result(False, 'export_failed', message=str(e))
+        
+        files = len(members) - 1
+        self._print(f"{Colors.GREEN}✅ {out}{Colors.ENDC}")
+        self._print(f"   {len(skills)} skills, {files} ficheros, {format_bytes(out.stat().st_size)} "
+              f"({time.perf_counter() - start:.2f}s) · id {snapshot['id']}\n")
+        return Result(path=str(out), id=snapshot['id'], format=fmt, skills=len(skills),
+                      files=files, bytes=out.stat().st_size)
+    
+    @catalog_lock
+    def import_catalog(self, archive: str, force: bool = False) -> Result:
+        """Importa un snapshot extrayendo sólo los skills cuyos hashes difieren del catálogo.
+        
+        Los miembros se leen en streaming hacia .agent/sources/import/<id>/ y cada fichero
+        se comprueba contra el manifiesto. Los skills completos se anotan en progress.json:
+        si la importación se interrumpe, repetir el comando retoma desde ahí. El resultado
+        se publica como una generación nueva, igual que 'wsm sync'.
+        """
+        path = Path(archive)
+        if not path.is_file():
+            self._print(f"{Colors.RED}❌ No existe: {archive}{Colors.ENDC}")
+            return Result(False, 'archive_not_found', archive=archive)
+        
+        self._print(f"\n{Colors.BLUE}📥 Importando {path.name}...{Colors.ENDC}\n")
+        self._recover_sync()
+        members = iter_snapshot(path)
+        try:
+            first, f = next(members, (None, None))
+            if first != SNAPSHOT_MANIFEST:
+                raise ValueError(f"no es un snapshot de wsm ({SNAPSHOT_MANIFEST} debe ser el primer miembro)")
+            snapshot = json.load(f)
+            if snapshot.get('version') != SNAPSHOT_VERSION:
+                raise ValueError(f"versión de snapshot no soportada: {snapshot.get('version')}")
+            skills = snapshot['skills']
+            # Los nombres y rutas del manifiesto acaban en rutas del disco: nada fuera de staging
+            bad = sorted(n for n, fs in skills.items()
+                         if '/' in n or n.startswith('.') or not snapshot_path_ok(n)
+                         or not all(snapshot_path_ok(rel) for rel in fs))
+            if bad:
+                raise ValueError(f"rutas no válidas en el manifiesto del snapshot: {', '.join(bad[:10])}")
+            
+            pub = self.skills_dir / "public"
+            local = {} if force else self._load_sync_manifest()
+            changed = sorted(n for n, fs in skills.items() if local.get(n) != fs or not (pub / n).is_dir())
+            self._print(f"  Snapshot {snapshot['id']} ({snapshot.get('created', '?')}): "
+                  f"{len(skills)} skills, {len(changed)} con cambios")
+            if not changed:
+                self._print(f"\n{Colors.GREEN}✅ El catálogo ya coincide con el snapshot{Colors.ENDC}\n")
+                return Result(id=snapshot['id'], skills=len(skills), changed=[], new=0, updated=0)
+            
+            staging = self.root_dir / ".agent" / "sources" / SNAPSHOT_IMPORT_DIR / snapshot['id']
+            progress = staging / "progress.json"
+            done = set()
+            if progress.exists():
+                with open(progress) as pf:
+                    done = {n for n in json.load(pf).get('done', []) if n in changed and (staging / n).is_dir()}
+                self._print(f"  {Colors.YELLOW}♻️  Reanudando: {len(done)} skills ya extraídos{Colors.ENDC}")
+            staging.mkdir(parents=True, exist_ok=True)
+            pending = set(changed) - done
+            # Un skill sin ficheros no tiene miembros en el archivo: está completo desde ya
+            empty = sorted(name for name in pending if not skills[name])
+            for name in empty:
+                (staging / name).mkdir(exist_ok=True)
+                done.add(name)
+            if empty:
+                write_json_atomic(progress, {'done': sorted(done)})
+            
+            current, extracted, corrupt = None, set(), set()
+            
+            def finish(name):
+                if name in pending and name not in corrupt and extracted == set(skills[name]):
+                    done.add(name)
+                    write_json_atomic(progress, {'done': sorted(done)})
+            
+            for arcname, f in members:
+                parts = arcname.split('/')
+                if len(parts) < 3 or parts[0] != 'skills' or not snapshot_path_ok(arcname):
+                    continue
+                name, rel = parts[1], '/'.join(parts[2:])
+                if name != current:
+                    if current:
+                        finish(current)
+                    current, extracted = name, set()
+                    if name in pending and (staging / name).exists():
+                        shutil.rmtree(staging / name)
+                if name not in pending or name in corrupt or rel not in skills[name]:
+                    continue
+                dest = staging / name / rel
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                h = hashlib.sha256()
+                with open(dest, 'wb') as out:
+                    for chunk in iter(lambda: f.read(1 << 20), b''):
+                        h.update(chunk)
+                        out.write(chunk)
+                if h.hexdigest() == skills[name][rel]:
+                    extracted.add(rel)
+                else:
+                    corrupt.add(name)
+            if current:
+                finish(current)
+            
+            missing = sorted(set(changed) - done)
+            if missing:
+                self._print(f"{Colors.RED}❌ {len(missing)} skills incompletos o corruptos en el snapshot:{Colors.ENDC}")
+                for name in missing[:10]:
+                    self._print(f"    {name}")
+                self._print(f"{Colors.YELLOW}   Lo ya extraído se conserva: repite el comando con un archivo íntegro.{Colors.ENDC}\n")
+                return Result(False, 'incomplete_snapshot', id=snapshot['id'], missing=missing)
+            
+            with span('publish'):
+                new, upd = self._publish_generation({name: staging / name for name in changed})
+            self._print(f"{Colors.GREEN}✅ Nuevos: {new}, Actualizados: {upd}{Colors.ENDC}")
+            self._catalog_index = None
+            self._save_sync_manifest({**self._load_sync_manifest(), **{n: skills[n] for n in changed}})
+            shutil.rmtree(staging)
+            
+            if self.store_dir.is_dir():
+                self.store_ingest(sorted(self._store_references()))
+            self._refresh_completion_names()
+            self._record_catalog('import-catalog')
+            self._print(f"\n{Colors.GREEN}✨ Importado!{Colors.ENDC}\n")
+            return Result(id=snapshot['id'], skills=len(skills), changed=changed, new=new, updated=upd)
+        except Exception as e:
+            self._print(f"{Colors.RED}❌ Error: {e}{Colors.ENDC}")
+            self._recover_sync()
+            return Result(False, 'import_failed', message=str(e))
+        finally:
+            members.close()
+
+    # ── Flota declarativa (wsm apply) ──
+    
+    def _load_fleet_manifest(self, manifest: Path) -> Dict[str, dict]:
+        """Lee un manifiesto de flota (.yaml/.yml con PyYAML, o .json) → {nombre: spec}"""
+        with open(manifest, encoding='utf-8') as f:
+            text = f.read()
+        if manifest.suffix.lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("PyYAML no está instalado: usa un manifiesto .json o 'pip install pyyaml'")
+            data = yaml.safe_load(text) or {}
+        else:
+            data = json.loads(text)
+        
+        workspaces = data.get('workspaces', {}) or {}
+        if isinstance(workspaces, list):
+            workspaces = {w['name']: w for w in workspaces}
+        for name in workspaces:
+            check_workspace_name(name)
+        return {'prune': bool(data.get('prune', False)),
+                'workspaces': {name: spec or {} for name, spec in workspaces.items()}}
+    
+    def _desired_workspace_config(self, name: str, spec: dict) -> dict:
+        """Config objetivo de un workspace de la flota (plantillas + skills explícitos)"""
+        templates = spec.get('templates', spec.get('template')) or []
+        if isinstance(templates, str):
+            templates = [templates]
+        enabled, priority, max_tokens = {}, {}, None
+        if templates:
+            resolved = self._resolve_templates(templates)
+            enabled = dict.fromkeys(resolved['enabled_skills'], True)
+            priority = dict(resolved['skill_priority'])
+            max_tokens = resolved['max_context_tokens']
+        for s in spec.get('skills', []):
+            enabled[s] = True
+        priority.update(spec.get('skill_priority', {}))
+        if 'max_context_tokens' in spec:
+            max_tokens = spec['max_context_tokens']
+        desired = {
+            'description': spec.get('description', ''),
+            'enabled_skills': list(enabled),
+            'skill_priority': priority,
+            'max_context_tokens': max_tokens,
+        }
+        if templates:
+            desired['templates'] = templates
+        return desired
+    
+    def plan_fleet(self, fleet: dict, prune: bool = False) -> List[tuple]:
+        """Diff entre la flota declarada y los workspaces existentes → [(op, nombre, config, detalle)].
+        
+        Los skills de cada workspace se completan con sus `requires`; si alguno no
+        pasa las comprobaciones de `enable` (dependencias, conflictos, presupuesto)
+        su acción es 'invalid' y el detalle explica por qué.
+        """
+        existing = {w.name: w for w in self._get_workspaces()}
+        actions = []
+        for name, spec in sorted(fleet['workspaces'].items()):
+            desired = self._desired_workspace_config(name, spec)
+            checked = self._resolve_skill_set(desired['enabled_skills'], desired['max_context_tokens'])
+            if not checked:
+                actions.append(('invalid', name, None, checked['message']))
+                continue
+            desired['enabled_skills'] = checked['skills']
+            cfg = self.workspaces_dir / name / "skill-config.json"
+            if name not in existing or not cfg.exists():
+                actions.append(('create', name, desired, f"{len(desired['enabled_skills'])} skills"))
+                continue
+            current = self._load_config(cfg)
+            have = set(current.get('enabled_skills', []))
+            want = set(desired['enabled_skills'])
+            changed = [k for k in ('description', 'skill_priority', 'max_context_tokens')
+                       if current.get(k) != desired[k]]
+            if current.get('templates', []) != desired.get('templates', []):
+                changed.append('templates')
+            if have != want or changed:
+                detail = f"+{len(want - have)} -{len(have - want)}"
+                if changed:
+                    detail += f" ({', '.join(changed)})"
+                actions.append(('update', name, desired, detail))
+            else:
+                actions.append(('noop', name, desired, ''))
+        if prune or fleet.get('prune'):
+            for name in sorted(set(existing) - set(fleet['workspaces'])):
+                actions.append(('delete', name, None, ''))
+        return actions
+    
+    def _apply_fleet_action(self, op: str, name: str, desired: Optional[dict]):
+        path = self.workspaces_dir / name
+        if op == 'delete':
+            shutil.rmtree(path)
+            if self._state():
+                self._state().delete_workspace(name, 'fleet-delete')
+            return
+        if op == 'create':
+            (path / ".agents" / "skills").mkdir(parents=True, exist_ok=True)
+            config = {"name": name, "disabled_skills": [], **desired}
+            self._write_workspace_readme(path, name, desired['description'])
+        else:
+            config = self._load_config(path / "skill-config.json")
+            config.update(desired)
+            if 'templates' not in desired:
+                config.pop('templates', None)
+        self._save_config(path / "skill-config.json", config, f"fleet-{op}")
+        self.sync_workspace_skills(name, quiet=True)
+    
+    def apply_fleet(self, manifest: str, plan_only: bool = False, prune: bool = False, jobs: int = 8):
+        """Aplica un manifiesto de flota: plan (diff) y después crear/actualizar/eliminar en paralelo"""
+        from concurrent.futures import ThreadPoolExecutor
+        start = time.perf_counter()
+        try:
+            fleet = self._load_fleet_manifest(Path(manifest))
+            # Snapshot compartido: índice del catálogo y plantillas se resuelven una sola vez
+            catalog = self._load_catalog_index()
+            actions = self.plan_fleet(fleet, prune)
+        except (OSError, ValueError) as e:
+            self._print(f"{Colors.RED}❌ Manifiesto: {e}{Colors.ENDC}")
+            return Result(False, 'invalid_manifest', message=str(e))
+        plan_time = time.perf_counter() - start
+        
+        symbols = {'create': (Colors.GREEN, '+'), 'update': (Colors.YELLOW, '~'), 'delete': (Colors.RED, '-'),
+                   'invalid': (Colors.RED, '!')}
+        self._print(f"\n{Colors.BOLD}📋 Plan de flota — {manifest}{Colors.ENDC}\n")
+        for op, name, _, detail in actions:
+            if op in symbols:
+                color, sym = symbols[op]
+                self._print(f"  {color}{sym}{Colors.ENDC} {name:30} {detail}")
+        
+        unknown = sorted({s for op, _, d, _ in actions if d and op != 'noop'
+                          for s in d['enabled_skills'] if s not in catalog})
+        if unknown:
+            self._print(f"\n  {Colors.YELLOW}⚠️  No están en el catálogo: {', '.join(unknown)}{Colors.ENDC}")
+        
+        counts = {op: sum(1 for a in actions if a[0] == op)
+                  for op in ('create', 'update', 'delete', 'noop', 'invalid')}
+        self._print(f"\n  Plan: {counts['create']} crear, {counts['update']} actualizar, "
+              f"{counts['delete']} eliminar, {counts['noop']} sin cambios ({plan_time:.2f}s)")
+        
+        items = [{'type': 'action', 'op': op, 'workspace': name, 'detail': detail}
+                 for op, name, _, detail in actions if op != 'noop']
+        if counts['invalid']:
+            # Un plan con workspaces inválidos no se aplica a medias
+            self._print(f"\n{Colors.RED}❌ {counts['invalid']} workspaces no pasan las comprobaciones; "
+                        f"no se aplica nada{Colors.ENDC}\n")
+            return Result(False, 'invalid_plan', items=items, counts=counts, unknown_skills=unknown, applied=False)
+        pending = [a for a in actions if a[0] != 'noop']
+        if plan_only or not pending:
+            self._print()
+            return Result(items=items, counts=counts, unknown_skills=unknown, applied=False)
+        
+        errors = []
+        apply_start = time.perf_counter()
+        self._materialize({s for _, _, desired, _ in pending if desired for s in desired['enabled_skills']})
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            futures = {pool.submit(PROFILER.bind(self._apply_fleet_action), op, name, desired): (op, name)
+                       for op, name, desired, _ in pending}
+            for future, (op, name) in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    errors.append((op, name, e))
+        
+        for op, name, e in errors:
+            self._print(f"  {Colors.RED}❌ {op} {name}: {e}{Colors.ENDC}")
+        self._refresh_completion_names()
+        done = len(pending) - len(errors)
+        self._print(f"\n{Colors.GREEN}✨ Aplicado: {done}/{len(pending)} cambios en "
+              f"{time.perf_counter() - apply_start:.2f}s (total {time.perf_counter() - start:.2f}s){Colors.ENDC}\n")
+        return Result(not errors, 'apply_failed' if errors else None, items=items, counts=counts,
+                      unknown_skills=unknown, applied=True,
+                      errors=[{'op': op, 'workspace': name, 'message': str(e)} for op, name, e in errors])